@@ -0,0 +1,286 @@
+"""
+Modul Aktuasi Mouse Asinkron
+Panggilan pynput (position, scroll, click) adalah round-trip ke display
+server; jika server lambat, main loop ikut tertahan. AsyncMouse hanya
+memasukkan perintah ke antrian, dan satu thread worker yang menjalankannya.
+Gerak kursor digabung (hanya posisi terbaru yang dipakai), tick scroll
+dijumlahkan, klik tetap dikirim berurutan. Gerak yang tidak mengubah posisi
+atau lebih kecil dari threshold piksel tidak dikirim sama sekali (juga di
+TimedMouse untuk --sync-mouse). Posisi kecil yang ditahan dikirim sebelum
+klik, saat flush() (tangan hilang), dan saat close().
+"""
+
+import threading
+import time
+from collections import deque
+
+from cursor_interpolator import CursorInterpolator
+from latency_histogram import LatencyHistogram, StageLatencyRecorder, TimedMouse
+from streaming_stats import RunningStats
+
+
+class MoveSuppressor:
+    """
+    Detektor perubahan posisi kursor. Gerak ke posisi yang sama dilewati;
+    gerak < min_distance px dari posisi terakhir yang DIKIRIM ditahan, sehingga
+    delta kecil berturut-turut terkumpul jadi satu gerak. Posisi yang ditahan
+    tetap dikirim setelah max_hold detik agar kursor tidak berhenti sebelum target.
+    """
+
+    def __init__(self, min_distance=2.0, max_hold=0.05):
+        self.min_distance = min_distance
+        self.max_hold = max_hold
+        self.sent = None        # Posisi terakhir yang dikirim ke sistem
+        self.held = None        # Posisi terbaru yang ditahan (belum dikirim)
+        self.held_since = None
+
+        # Statistik
+        self.requested = 0
+        self.skipped_noop = 0
+        self.skipped_small = 0
+        self.released_held = 0
+
+    def check(self, position, now):
+        """Return posisi yang perlu dikirim, atau None jika gerak dilewati"""
+        self.requested += 1
+        if position == self.sent:
+            self.skipped_noop += 1
+            self.held = None
+            return None
+        if self.sent is not None:
+            dx = position[0] - self.sent[0]
+            dy = position[1] - self.sent[1]
+            if dx * dx + dy * dy < self.min_distance * self.min_distance:
+                if self.held is None:
+                    self.held_since = now
+                self.held = position
+                if now - self.held_since < self.max_hold:
+                    self.skipped_small += 1
+                    return None
+                self.released_held += 1
+        self.held = None
+        self.sent = position
+        return position
+
+    def flush(self):
+        """Posisi yang masih ditahan, dikirim sebelum klik/saat idle agar kursor tidak berhenti sebelum target"""
+        position = self.held
+        if position is not None:
+            self.held = None
+            self.sent = position
+            self.released_held += 1
+        return position
+
+    def get_stats(self):
+        return {
+            'min_move_px': self.min_distance,
+            'moves_requested': self.requested,
+            'skipped_noop': self.skipped_noop,
+            'skipped_small': self.skipped_small,
+            'released_held': self.released_held
+        }
+
+
+class AsyncMouse:
+    """
+    Pengganti pynput Controller (position/scroll/click/press/release) yang
+    menjalankan aktuasi di thread sendiri. Latency setiap panggilan dicatat
+    ke histogram tahap 'actuation' milik recorder (jika ada).
+    """
+
+    def __init__(self, mouse, recorder=None, min_move=2.0):
+        # object.__setattr__ karena __setattr__ di-override untuk 'position'
+        object.__setattr__(self, 'mouse', mouse)
+        object.__setattr__(self, 'recorder', recorder)
+        object.__setattr__(self, 'suppressor', MoveSuppressor(min_move))
+        object.__setattr__(self, 'queue', deque())  # [jenis, argumen, waktu masuk]
+        object.__setattr__(self, 'cond', threading.Condition())
+        object.__setattr__(self, 'running', True)
+        object.__setattr__(self, 'last_position', None)
+        object.__setattr__(self, 'frame_ms', 0.0)
+
+        # Statistik
+        object.__setattr__(self, 'call_latency', LatencyHistogram())  # ms per panggilan pynput
+        object.__setattr__(self, 'queue_wait', LatencyHistogram())    # ms dari masuk antrian sampai dijalankan
+        object.__setattr__(self, 'queue_depth', RunningStats())       # panjang antrian saat perintah masuk
+        object.__setattr__(self, 'submitted', 0)
+        object.__setattr__(self, 'coalesced_moves', 0)
+        object.__setattr__(self, 'merged_scrolls', 0)
+        object.__setattr__(self, 'errors', 0)
+
+        thread = threading.Thread(target=self._worker, name="AsyncMouse", daemon=True)
+        object.__setattr__(self, 'thread', thread)
+        thread.start()
+
+    def _pending(self, kind):
+        """Entri 'move'/'scroll' di antrian setelah klik/press/release terakhir (bisa digabung)"""
+        for entry in reversed(self.queue):
+            if entry[0] == kind:
+                return entry
+            if entry[0] not in ('move', 'scroll'):
+                return None
+        return None
+
+    def _enqueue(self, kind, args, now):
+        """Masukkan satu perintah ke antrian (dipanggil dengan self.cond terkunci)"""
+        entry = self._pending(kind) if kind in ('move', 'scroll') else None
+        if entry is not None and kind == 'move':
+            # Posisi lama yang belum sempat dijalankan tidak berguna lagi
+            entry[1] = args
+            object.__setattr__(self, 'coalesced_moves', self.coalesced_moves + 1)
+        elif entry is not None:
+            entry[1] = (entry[1][0] + args[0], entry[1][1] + args[1])
+            object.__setattr__(self, 'merged_scrolls', self.merged_scrolls + 1)
+        else:
+            # Entri baru; klik/press/release tidak pernah digabung dan menjadi batas urutan
+            self.queue.append([kind, args, now])
+        self.queue_depth.add(len(self.queue))
+        object.__setattr__(self, 'submitted', self.submitted + 1)
+        self.cond.notify()
+
+    def _submit(self, kind, args):
+        t0 = time.perf_counter()
+        with self.cond:
+            if kind == 'move':
+                args = self.suppressor.check(args, t0)
+            elif kind != 'scroll':
+                held = self.suppressor.flush()
+                if held is not None:
+                    self._enqueue('move', held, t0)
+            if args is not None:
+                self._enqueue(kind, args, t0)
+        object.__setattr__(self, 'frame_ms', self.frame_ms + (time.perf_counter() - t0) * 1000)
+
+    def _worker(self):
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self.queue or not self.running)
+                if not self.queue:
+                    return
+                kind, args, queued_at = self.queue.popleft()
+
+            t0 = time.perf_counter()
+            try:
+                if kind == 'move':
+                    self.mouse.position = args
+                elif kind == 'scroll':
+                    self.mouse.scroll(*args)
+                elif kind == 'click':
+                    self.mouse.click(*args)
+                elif kind == 'press':
+                    self.mouse.press(*args)
+                elif kind == 'release':
+                    self.mouse.release(*args)
+            except Exception as e:
+                object.__setattr__(self, 'errors', self.errors + 1)
+                print(f"\n✗ Aktuasi mouse gagal ({kind}): {e}")
+            t1 = time.perf_counter()
+            elapsed_ms = (t1 - t0) * 1000
+            self.call_latency.record(elapsed_ms)
+            self.queue_wait.record((t0 - queued_at) * 1000)
+            if self.recorder is not None:
+                self.recorder.record('actuation', elapsed_ms)
+
+    def take_frame_ms(self):
+        """Total waktu memasukkan perintah sejak panggilan terakhir (lalu reset ke 0)"""
+        elapsed_ms = self.frame_ms
+        object.__setattr__(self, 'frame_ms', 0.0)
+        return elapsed_ms
+
+    @property
+    def position(self):
+        # Posisi yang terakhir diminta; tidak perlu round-trip ke display server
+        if self.last_position is not None:
+            return self.last_position
+        return self.mouse.position
+
+    def __setattr__(self, name, value):
+        if name == 'position':
+            object.__setattr__(self, 'last_position', tuple(value))
+            self._submit('move', tuple(value))
+        else:
+            object.__setattr__(self, name, value)
+
+    def flush(self):
+        """Kirim posisi yang masih ditahan suppressor (mis. saat tangan hilang)"""
+        with self.cond:
+            held = self.suppressor.flush()
+            if held is not None:
+                self._enqueue('move', held, time.perf_counter())
+
+    def scroll(self, dx, dy):
+        self._submit('scroll', (dx, dy))
+
+    def click(self, button, count=1):
+        self._submit('click', (button, count))
+
+    def press(self, button):
+        self._submit('press', (button,))
+
+    def release(self, button):
+        self._submit('release', (button,))
+
+    def close(self, timeout=1.0):
+        """Kirim posisi yang masih ditahan, jalankan sisa antrian, lalu hentikan worker"""
+        with self.cond:
+            held = self.suppressor.flush()
+            if held is not None:
+                self._enqueue('move', held, time.perf_counter())
+            object.__setattr__(self, 'running', False)
+            self.cond.notify_all()
+        self.thread.join(timeout)
+
+        stats = self.get_stats()
+        print(f"\nAktuasi mouse: {stats['submitted']} perintah, {stats['executed']} panggilan sistem, "
+              f"{stats['calls_avoided']} panggilan dihindari")
+        if hasattr(self.mouse, 'close'):
+            self.mouse.close()
+
+    def get_stats(self):
+        with self.cond:
+            pending = len(self.queue)
+            suppressor = self.suppressor.get_stats()
+        latency = self.call_latency.get_stats()
+        wait = self.queue_wait.get_stats()
+        stats = {
+            'mode': 'async',
+            'submitted': self.submitted,
+            'executed': latency['count'],
+            'pending': pending,
+            'coalesced_moves': self.coalesced_moves,
+            'merged_scrolls': self.merged_scrolls,
+            'errors': self.errors,
+            'avg_queue_depth': self.queue_depth.mean,
+            'max_queue_depth': self.queue_depth.max or 0,
+            'avg_call_ms': latency['avg'],
+            'p95_call_ms': latency['p95'],
+            'max_call_ms': latency['max'],
+            'avg_wait_ms': wait['avg'],
+            'p95_wait_ms': wait['p95']
+        }
+        stats['backend'] = getattr(self.mouse, 'name', type(self.mouse).__name__)
+        if hasattr(self.mouse, 'get_stats'):
+            stats['recorder'] = self.mouse.get_stats()
+        stats.update(suppressor)
+        # Panggilan pynput yang tidak jadi dilakukan: gerak dilewati + digabung di antrian
+        stats['calls_avoided'] = (suppressor['skipped_noop'] + suppressor['skipped_small'] +
+                                  self.coalesced_moves + self.merged_scrolls)
+        return stats
+
+
+def wrap_mouse(mouse, recorder=None, async_mode=True, min_move=2.0, interpolate_hz=0):
+    """
+    AsyncMouse (default) atau TimedMouse (aktuasi langsung di main loop),
+    keduanya dengan MoveSuppressor(min_move), opsional dibungkus
+    CursorInterpolator jika interpolate_hz > 0.
+    Semuanya punya take_frame_ms(), flush(), dan close().
+    """
+    if async_mode:
+        mouse = AsyncMouse(mouse, recorder, min_move=min_move)
+    else:
+        if recorder is None:
+            recorder = StageLatencyRecorder(stages=('actuation',))
+        mouse = TimedMouse(mouse, recorder, MoveSuppressor(min_move))
+    if interpolate_hz:
+        mouse = CursorInterpolator(mouse, interpolate_hz)
+    return mouse
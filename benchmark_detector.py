@@ -0,0 +1,118 @@
+"""
+Benchmark Detector Tangan: cvzone HandDetector vs LeanHandDetector
+Frame diambil sekali dari sumber (kamera atau file video) lalu diproses oleh
+kedua detector, sehingga keduanya mengerjakan frame yang sama persis.
+
+Contoh:
+  python benchmark_detector.py --source rekaman.mp4 --frames 300
+  python benchmark_detector.py --source 0 --frames 200 --save hasil_benchmark.json
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime
+
+import cv2
+
+from frame_source import open_frame_source
+from latency_histogram import LatencyHistogram
+from mediapipe_detector import create_hand_detector
+
+
+def collect_frames(source, count):
+    """Ambil frame dari sumber ke memori"""
+    cap = open_frame_source(source, pace='fast')
+    frames = []
+    while len(frames) < count:
+        success, img = cap.read()
+        if not success:
+            break
+        frames.append(cv2.flip(img, 1))
+    cap.release()
+    return frames
+
+
+def run_backend(backend, frames, max_hands, warmup):
+    """Jalankan satu detector di semua frame, return statistik per frame (ms)"""
+    detector = create_hand_detector(backend, maxHands=max_hands, detectionCon=0.3)
+    histogram = LatencyHistogram()
+    frames_with_hand = 0
+
+    for index, frame in enumerate(frames):
+        # Copy di luar pengukuran: cvzone menggambar langsung di frame
+        img = frame.copy()
+        t0 = time.perf_counter()
+        hands, img = detector.findHands(img)
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+
+        if index < warmup:
+            continue
+        histogram.record(elapsed_ms)
+        if hands:
+            frames_with_hand += 1
+
+    stats = histogram.get_stats()
+    stats['fps'] = 1000 / stats['avg'] if stats['avg'] > 0 else 0.0
+    stats['frames_with_hand'] = frames_with_hand
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cvzone vs MediaPipe langsung")
+    parser.add_argument('--source', default='0', help="Index kamera atau file video")
+    parser.add_argument('--frames', type=int, default=300, help="Jumlah frame yang diuji")
+    parser.add_argument('--warmup', type=int, default=10, help="Frame awal yang tidak diukur")
+    parser.add_argument('--max-hands', type=int, default=2)
+    parser.add_argument('--save', default=None, help="Simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    if args.source.lower().endswith('.jsonl'):
+        print("✗ Rekaman landmark tidak berisi gambar, gunakan kamera atau file video")
+        return
+
+    print(f"Mengambil {args.frames} frame dari sumber '{args.source}'...")
+    frames = collect_frames(args.source, args.frames)
+    if len(frames) <= args.warmup:
+        print("✗ Frame tidak cukup untuk benchmark")
+        return
+    h, w = frames[0].shape[:2]
+
+    results = {}
+    for backend in ('cvzone', 'lean'):
+        print(f"Menjalankan detector '{backend}'...")
+        results[backend] = run_backend(backend, frames, args.max_hands, args.warmup)
+
+    print("\n" + "="*80)
+    print("BENCHMARK DETECTOR TANGAN".center(80))
+    print("="*80)
+    print(f"Frame: {len(frames) - args.warmup} ({w}x{h}), warmup: {args.warmup}")
+    print("-"*80)
+    print(f"{'Detector':<10} | {'Avg':>7} | {'p50':>7} | {'p95':>7} | {'p99':>7} | "
+          f"{'Max':>7} | {'FPS':>7} | {'Tangan':>7}")
+    print("-"*80)
+    for backend, s in results.items():
+        print(f"{backend:<10} | {s['avg']:>7.2f} | {s['p50']:>7.2f} | {s['p95']:>7.2f} | "
+              f"{s['p99']:>7.2f} | {s['max']:>7.2f} | {s['fps']:>7.1f} | {s['frames_with_hand']:>7}")
+    print("(waktu dalam ms per frame)")
+
+    base, lean = results['cvzone']['avg'], results['lean']['avg']
+    if lean > 0:
+        print(f"\nSpeedup lean vs cvzone: {base / lean:.2f}x ({base - lean:+.2f} ms/frame)")
+    print("="*80 + "\n")
+
+    if args.save:
+        report = {
+            'waktu_pengujian': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'sumber': args.source,
+            'resolusi': [w, h],
+            'jumlah_frame': len(frames) - args.warmup,
+            'hasil_ms': results
+        }
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=4)
+        print(f"✓ Hasil benchmark disimpan: {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Modul Filter Kursor
+Menghaluskan posisi kursor (titik landmark di koordinat kamera) sebelum
+diskalakan ke layar. Tersedia One Euro, EMA, dan dead-zone. Setiap filter
+hanya menyimpan beberapa nilai skalar per sumbu, tanpa list/array per frame.
+"""
+
+import math
+
+
+class NoFilter:
+    """Tanpa filter (posisi mentah)"""
+
+    name = 'none'
+
+    def __init__(self, reset_gap=0.2):
+        self.reset_gap = reset_gap
+
+    def reset(self):
+        pass
+
+    def filter(self, x, y, timestamp):
+        return float(x), float(y)
+
+
+class EmaFilter:
+    """Exponential moving average: out = out + alpha * (in - out)"""
+
+    name = 'ema'
+
+    def __init__(self, alpha=0.4, reset_gap=0.2):
+        self.alpha = alpha
+        self.reset_gap = reset_gap  # Jeda (detik) setelah tangan hilang: mulai ulang dari posisi baru
+        self.reset()
+
+    def reset(self):
+        self.x = None
+        self.y = None
+        self.last_time = None
+
+    def filter(self, x, y, timestamp):
+        if self.x is None or timestamp - self.last_time > self.reset_gap:
+            self.x, self.y = float(x), float(y)
+        else:
+            self.x += self.alpha * (x - self.x)
+            self.y += self.alpha * (y - self.y)
+        self.last_time = timestamp
+        return self.x, self.y
+
+
+class DeadZoneFilter:
+    """
+    Kursor diam selama input bergerak kurang dari radius (px) dari posisi
+    kursor; di luar radius kursor mengikuti input di tepi dead-zone.
+    """
+
+    name = 'deadzone'
+
+    def __init__(self, radius=4.0, reset_gap=0.2):
+        self.radius = radius
+        self.reset_gap = reset_gap
+        self.reset()
+
+    def reset(self):
+        self.x = None
+        self.y = None
+        self.last_time = None
+
+    def filter(self, x, y, timestamp):
+        if self.x is None or timestamp - self.last_time > self.reset_gap:
+            self.x, self.y = float(x), float(y)
+        else:
+            dx = x - self.x
+            dy = y - self.y
+            distance = math.hypot(dx, dy)
+            if distance > self.radius:
+                scale = (distance - self.radius) / distance
+                self.x += dx * scale
+                self.y += dy * scale
+        self.last_time = timestamp
+        return self.x, self.y
+
+
+class OneEuroFilter:
+    """
+    One Euro filter (Casiez dkk., 2012): cutoff low-pass naik mengikuti
+    kecepatan, sehingga diam = halus (jitter kecil), cepat = responsif (lag kecil).
+    """
+
+    name = 'one-euro'
+
+    def __init__(self, min_cutoff=1.0, beta=0.05, d_cutoff=1.0, reset_gap=0.2):
+        self.min_cutoff = min_cutoff  # Hz, cutoff saat kursor diam
+        self.beta = beta              # Kenaikan cutoff per satuan kecepatan (px/s)
+        self.d_cutoff = d_cutoff      # Hz, cutoff untuk estimasi kecepatan
+        self.reset_gap = reset_gap
+        self.reset()
+
+    def reset(self):
+        self.x = None
+        self.y = None
+        self.dx = 0.0
+        self.dy = 0.0
+        self.last_time = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def filter(self, x, y, timestamp):
+        if self.x is None or timestamp - self.last_time > self.reset_gap:
+            self.x, self.y = float(x), float(y)
+            self.dx = self.dy = 0.0
+            self.last_time = timestamp
+            return self.x, self.y
+
+        dt = timestamp - self.last_time
+        if dt <= 0:
+            return self.x, self.y
+        self.last_time = timestamp
+
+        # Kecepatan yang dihaluskan
+        a_d = self._alpha(self.d_cutoff, dt)
+        self.dx += a_d * ((x - self.x) / dt - self.dx)
+        self.dy += a_d * ((y - self.y) / dt - self.dy)
+
+        # Cutoff posisi mengikuti kecepatan (per sumbu)
+        a_x = self._alpha(self.min_cutoff + self.beta * abs(self.dx), dt)
+        a_y = self._alpha(self.min_cutoff + self.beta * abs(self.dy), dt)
+        self.x += a_x * (x - self.x)
+        self.y += a_y * (y - self.y)
+        return self.x, self.y
+
+
+CURSOR_FILTERS = {
+    'none': NoFilter,
+    'ema': EmaFilter,
+    'deadzone': DeadZoneFilter,
+    'one-euro': OneEuroFilter,
+}
+
+FILTER_NAMES = tuple(CURSOR_FILTERS)
+
+
+def create_cursor_filter(name='none', **kwargs):
+    """Buat filter kursor dari nama: none, ema, deadzone, one-euro"""
+    if name not in CURSOR_FILTERS:
+        raise ValueError(f"Filter kursor tidak dikenal: {name} (pilihan: {', '.join(FILTER_NAMES)})")
+    return CURSOR_FILTERS[name](**kwargs)
+
+
+def next_filter_name(name):
+    """Nama filter berikutnya (untuk tombol ganti filter saat pengujian)"""
+    return FILTER_NAMES[(FILTER_NAMES.index(name) + 1) % len(FILTER_NAMES)]
@@ -0,0 +1,190 @@
+"""
+Modul Interpolasi Kursor Rate Tinggi
+Kamera hanya ~30 fps, sehingga kursor melompat dalam langkah 30 Hz padahal
+monitor 60-144 Hz. CursorInterpolator menerima posisi layar hasil filter dari
+main loop sebagai target, lalu thread worker mengirim posisi antara (linear)
+dengan rate tetap (mis. 120 Hz) selama satu interval frame. Saat target
+tercapai worker tidur sampai target berikutnya, sehingga CPU tidak terpakai
+ketika tangan diam atau tidak terdeteksi.
+Sebelum klik/press/release kursor dilompatkan ke target; posisi antara yang
+dihitung worker sebelum lompatan dibuang (jump_seq) agar klik tidak meleset.
+Scroll tidak melompat, sehingga interpolasi tetap jalan selama gesture scroll.
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class CursorInterpolator:
+    """
+    Bungkus mouse (AsyncMouse / TimedMouse / backend): position = target baru,
+    click/press/release diteruskan setelah kursor dilompatkan ke target terakhir,
+    scroll langsung diteruskan.
+    """
+
+    def __init__(self, mouse, rate_hz=120.0, max_rate_hz=500.0, max_duration=0.1):
+        # object.__setattr__ karena __setattr__ di-override untuk 'position' dan 'recorder'
+        object.__setattr__(self, 'mouse', mouse)
+        object.__setattr__(self, 'rate_hz', min(rate_hz, max_rate_hz))
+        object.__setattr__(self, 'period', 1.0 / min(rate_hz, max_rate_hz))
+        object.__setattr__(self, 'max_duration', max_duration)  # Batas durasi satu segmen (detik)
+        object.__setattr__(self, 'cond', threading.Condition())
+        object.__setattr__(self, 'actuate_lock', threading.Lock())  # Urutan penulisan ke mouse
+        object.__setattr__(self, 'jump_seq', 0)  # Bertambah setiap lompatan ke target
+        object.__setattr__(self, 'written', None)  # Posisi terakhir yang ditulis ke mouse
+        object.__setattr__(self, 'running', True)
+
+        # Segmen aktif: dari start ke target dalam duration detik mulai seg_time
+        object.__setattr__(self, 'current', None)
+        object.__setattr__(self, 'start', None)
+        object.__setattr__(self, 'target', None)
+        object.__setattr__(self, 'seg_time', 0.0)
+        object.__setattr__(self, 'duration', 1.0 / 30)
+        object.__setattr__(self, 'last_target_time', None)
+        object.__setattr__(self, 'emitted', deque(maxlen=256))  # (x, y, t) untuk metrik smoothness
+
+        # Statistik
+        object.__setattr__(self, 'targets', 0)
+        object.__setattr__(self, 'steps', 0)
+        object.__setattr__(self, 'worker_cpu', 0.0)
+        object.__setattr__(self, 'start_time', time.perf_counter())
+
+        thread = threading.Thread(target=self._worker, name="CursorInterpolator", daemon=True)
+        object.__setattr__(self, 'thread', thread)
+        thread.start()
+
+    def _set_target(self, position):
+        now = time.perf_counter()
+        with self.cond:
+            if self.last_target_time is not None:
+                # Durasi segmen = interval frame (EMA), dibatasi agar tidak terlalu tertinggal
+                interval = min(now - self.last_target_time, self.max_duration)
+                object.__setattr__(self, 'duration', 0.7 * self.duration + 0.3 * interval)
+            object.__setattr__(self, 'last_target_time', now)
+            start = self.current if self.current is not None else position
+            object.__setattr__(self, 'start', start)
+            object.__setattr__(self, 'target', (float(position[0]), float(position[1])))
+            object.__setattr__(self, 'seg_time', now)
+            object.__setattr__(self, 'targets', self.targets + 1)
+            self.cond.notify()
+
+    def _worker(self):
+        cpu_start = time.thread_time()
+        next_tick = time.perf_counter()
+        while True:
+            with self.cond:
+                # Tidur sampai ada segmen yang belum selesai
+                self.cond.wait_for(lambda: not self.running or
+                                   (self.target is not None and self.current != self.target))
+                if not self.running:
+                    break
+                now = time.perf_counter()
+                progress = min(1.0, (now - self.seg_time) / self.duration) if self.duration > 0 else 1.0
+                sx, sy = self.start
+                tx, ty = self.target
+                position = (sx + (tx - sx) * progress, sy + (ty - sy) * progress)
+                if progress >= 1.0:
+                    position = self.target
+                object.__setattr__(self, 'current', position)
+                seq = self.jump_seq
+
+            with self.actuate_lock:
+                # Lompatan ke target terjadi setelah posisi ini dihitung: posisi antara sudah basi
+                if seq != self.jump_seq:
+                    continue
+                self._write(position)
+            self.emitted.append((position[0], position[1], now))
+            object.__setattr__(self, 'steps', self.steps + 1)
+            object.__setattr__(self, 'worker_cpu', time.thread_time() - cpu_start)
+
+            # Rate tetap: tidur sampai tick berikutnya (tick yang terlewat tidak dikejar)
+            next_tick = max(next_tick + self.period, time.perf_counter())
+            time.sleep(max(0.0, next_tick - time.perf_counter()))
+
+    def _jump_to_target(self):
+        """Selesaikan segmen aktif sekarang (sebelum klik/press/release)"""
+        with self.cond:
+            target = self.target
+            if target is None:
+                return
+            # Worker mungkin sudah menghitung posisi (bahkan target itu sendiri) tapi belum menulisnya
+            object.__setattr__(self, 'current', target)
+            object.__setattr__(self, 'jump_seq', self.jump_seq + 1)
+        with self.actuate_lock:
+            if self.written != (int(target[0]), int(target[1])):
+                self._write(target)
+
+    def _write(self, position):
+        """Tulis posisi ke mouse (dipanggil dengan actuate_lock terkunci)"""
+        position = (int(position[0]), int(position[1]))
+        self.mouse.position = position
+        object.__setattr__(self, 'written', position)
+
+    def drain(self):
+        """Posisi (x, y, t) yang dikirim worker sejak panggilan terakhir"""
+        samples = []
+        while self.emitted:
+            samples.append(self.emitted.popleft())
+        return samples
+
+    @property
+    def position(self):
+        return self.mouse.position
+
+    def __setattr__(self, name, value):
+        if name == 'position':
+            self._set_target(value)
+        elif name == 'recorder':
+            setattr(self.mouse, name, value)
+        else:
+            object.__setattr__(self, name, value)
+
+    def scroll(self, dx, dy):
+        # Tanpa lompatan: scroll dipanggil setiap frame selama gesture scroll aktif
+        self.mouse.scroll(dx, dy)
+
+    def click(self, button, count=1):
+        self._jump_to_target()
+        self.mouse.click(button, count)
+
+    def press(self, button):
+        self._jump_to_target()
+        self.mouse.press(button)
+
+    def release(self, button):
+        self._jump_to_target()
+        self.mouse.release(button)
+
+    def take_frame_ms(self):
+        return self.mouse.take_frame_ms()
+
+    def flush(self):
+        """Posisi kecil yang masih ditahan mouse di bawahnya dikirim (mis. saat tangan hilang)"""
+        with self.actuate_lock:
+            self.mouse.flush()
+
+    def close(self):
+        with self.cond:
+            object.__setattr__(self, 'running', False)
+            self.cond.notify_all()
+        self.thread.join(1.0)
+        self._jump_to_target()
+        self.mouse.close()
+
+    def get_interpolation_stats(self):
+        elapsed = time.perf_counter() - self.start_time
+        return {
+            'rate_hz': self.rate_hz,
+            'targets': self.targets,
+            'steps': self.steps,
+            'steps_per_target': self.steps / self.targets if self.targets else 0.0,
+            'avg_segment_ms': self.duration * 1000,
+            'worker_cpu_ms': self.worker_cpu * 1000,
+            'worker_cpu_percent': (self.worker_cpu / elapsed * 100) if elapsed > 0 else 0.0
+        }
+
+    def get_stats(self):
+        stats = self.mouse.get_stats() if hasattr(self.mouse, 'get_stats') else {'mode': 'sync'}
+        stats['interpolation'] = self.get_interpolation_stats()
+        return stats
@@ -0,0 +1,336 @@
+"""
+Modul Metrik Kontrol Kursor
+CursorTestTracker: presisi (deviasi ke titik target), smoothness (jitter) dan
+kecepatan tracking kursor. Dipakai oleh virtual_mouse_cursor_testing.py dan
+evaluasi prediktor landmark pada rekaman (evaluate_predictor.py).
+FilterComparison: semua filter kursor dijalankan paralel pada input mentah
+yang sama, sehingga jitter dan lag antar filter bisa dibandingkan langsung.
+"""
+
+import math
+from datetime import datetime
+
+from cursor_filter import FILTER_NAMES, create_cursor_filter
+from streaming_stats import RunningStats
+
+
+class CursorTestTracker:
+    def __init__(self):
+        self.precision_hits = []  # List of (target_pos, cursor_pos, deviation_px)
+        self.smoothness_data = []  # List of cursor positions untuk smooth tracking
+        self.speed_data = []  # List of (speed_category, distance_px, time_ms)
+        self.last_cursor_pos = None
+        self.last_cursor_time = None
+        self.filter_comparison = FilterComparison()  # Semua filter pada input mentah yang sama
+        self.active_filter = 'none'
+        
+    def add_precision_test(self, target_pos, cursor_pos):
+        """Record precision test result"""
+        deviation = math.hypot(target_pos[0] - cursor_pos[0], 
+                              target_pos[1] - cursor_pos[1])
+        self.precision_hits.append({
+            'target': target_pos,
+            'cursor': cursor_pos,
+            'deviation_px': deviation
+        })
+        return deviation
+    
+    def add_smoothness_sample(self, cursor_pos, current_time):
+        """Record cursor position for smoothness analysis"""
+        self.smoothness_data.append({
+            'position': cursor_pos,
+            'time': current_time
+        })
+        
+        # Keep only last 100 samples
+        if len(self.smoothness_data) > 100:
+            self.smoothness_data.pop(0)
+    
+    def calculate_jitter(self):
+        """Calculate jitter (variation in cursor movement)"""
+        if len(self.smoothness_data) < 3:
+            return 0.0
+        
+        distances = []
+        for i in range(1, len(self.smoothness_data)):
+            prev = self.smoothness_data[i-1]['position']
+            curr = self.smoothness_data[i]['position']
+            dist = math.hypot(curr[0] - prev[0], curr[1] - prev[1])
+            distances.append(dist)
+        
+        if not distances:
+            return 0.0
+        
+        # Calculate standard deviation of distances
+        mean_dist = sum(distances) / len(distances)
+        variance = sum((d - mean_dist) ** 2 for d in distances) / len(distances)
+        jitter = math.sqrt(variance)
+        
+        return jitter
+    
+    def add_speed_test(self, speed_category, distance_px, time_ms):
+        """Record speed test result"""
+        self.speed_data.append({
+            'category': speed_category,
+            'distance_px': distance_px,
+            'time_ms': time_ms,
+            'speed_px_per_s': (distance_px / time_ms * 1000) if time_ms > 0 else 0
+        })
+    
+    def get_precision_stats(self):
+        """Get precision statistics"""
+        if not self.precision_hits:
+            return {
+                'avg_deviation': 0.0,
+                'min_deviation': 0.0,
+                'max_deviation': 0.0,
+                'success_rate': 0.0,
+                'count': 0
+            }
+        
+        deviations = [h['deviation_px'] for h in self.precision_hits]
+        # Success if deviation < 50px
+        success_count = sum(1 for d in deviations if d < 50)
+        
+        return {
+            'avg_deviation': sum(deviations) / len(deviations),
+            'min_deviation': min(deviations),
+            'max_deviation': max(deviations),
+            'success_rate': (success_count / len(deviations)) * 100,
+            'count': len(deviations)
+        }
+    
+    def get_smoothness_stats(self):
+        """Get smoothness statistics"""
+        jitter = self.calculate_jitter()
+        
+        # Smoothness score (inverse of jitter, normalized)
+        if jitter == 0:
+            smoothness_score = 100.0
+        else:
+            smoothness_score = max(0, 100 - jitter)
+        
+        return {
+            'jitter_px': jitter,
+            'smoothness_score': smoothness_score,
+            'sample_count': len(self.smoothness_data)
+        }
+    
+    def get_speed_stats(self):
+        """Get speed test statistics by category"""
+        stats = {}
+        categories = set(s['category'] for s in self.speed_data)
+        
+        for cat in categories:
+            cat_data = [s for s in self.speed_data if s['category'] == cat]
+            if cat_data:
+                avg_speed = sum(d['speed_px_per_s'] for d in cat_data) / len(cat_data)
+                avg_time = sum(d['time_ms'] for d in cat_data) / len(cat_data)
+                stats[cat] = {
+                    'avg_speed_px_per_s': avg_speed,
+                    'avg_time_ms': avg_time,
+                    'count': len(cat_data)
+                }
+        
+        return stats
+    
+    def save_cursor_test_report(self, filename='laporan_kontrol_kursor.txt'):
+        """Save detailed cursor control testing report"""
+        precision_stats = self.get_precision_stats()
+        smoothness_stats = self.get_smoothness_stats()
+        speed_stats = self.get_speed_stats()
+        
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write("="*80 + "\n")
+            f.write("LAPORAN PENGUJIAN KONTROL KURSOR\n")
+            f.write("Sistem Virtual Mouse - Hand Tracking\n")
+            f.write("="*80 + "\n\n")
+            
+            f.write(f"Waktu Pengujian: {datetime.now().strftime('%d %B %Y, %H:%M:%S')}\n\n")
+            
+            # PRECISION TEST
+            f.write("="*80 + "\n")
+            f.write("A. PENGUJIAN PRESISI (9 Titik Target)\n")
+            f.write("="*80 + "\n\n")
+            
+            f.write(f"Total Tes Presisi      : {precision_stats['count']} titik\n")
+            f.write(f"Success Rate           : {precision_stats['success_rate']:.2f}%\n")
+            f.write(f"Deviasi Rata-rata      : {precision_stats['avg_deviation']:.2f} px\n")
+            f.write(f"Deviasi Minimum        : {precision_stats['min_deviation']:.2f} px\n")
+            f.write(f"Deviasi Maximum        : {precision_stats['max_deviation']:.2f} px\n\n")
+            
+            # Kategori presisi
+            avg_dev = precision_stats['avg_deviation']
+            if avg_dev < 20:
+                kategori = "Excellent (Sangat Presisi)"
+            elif avg_dev < 40:
+                kategori = "Good (Presisi Baik)"
+            elif avg_dev < 60:
+                kategori = "Fair (Cukup)"
+            else:
+                kategori = "Poor (Perlu Perbaikan)"
+            
+            f.write(f"Kategori Presisi       : {kategori}\n\n")
+            
+            # Detail per target
+            if self.precision_hits:
+                f.write("Detail Per Target:\n")
+                f.write("-" * 80 + "\n")
+                for i, hit in enumerate(self.precision_hits, 1):
+                    f.write(f"  Target {i}: ({hit['target'][0]}, {hit['target'][1]}) → "
+                           f"Kursor: ({hit['cursor'][0]}, {hit['cursor'][1]}) → "
+                           f"Deviasi: {hit['deviation_px']:.2f}px\n")
+                f.write("\n")
+            
+            # SMOOTHNESS TEST
+            f.write("="*80 + "\n")
+            f.write("B. PENGUJIAN SMOOTHNESS (Kehalusan Tracking)\n")
+            f.write("="*80 + "\n\n")
+            
+            f.write(f"Jitter (Variasi Gerak) : {smoothness_stats['jitter_px']:.2f} px\n")
+            f.write(f"Smoothness Score       : {smoothness_stats['smoothness_score']:.2f}/100\n")
+            f.write(f"Jumlah Sample          : {smoothness_stats['sample_count']}\n\n")
+            
+            # Kategori smoothness
+            smooth_score = smoothness_stats['smoothness_score']
+            if smooth_score >= 90:
+                smooth_kategori = "Excellent (Sangat Halus)"
+            elif smooth_score >= 75:
+                smooth_kategori = "Good (Halus)"
+            elif smooth_score >= 60:
+                smooth_kategori = "Fair (Cukup)"
+            else:
+                smooth_kategori = "Poor (Patah-patah)"
+            
+            f.write(f"Kategori Smoothness    : {smooth_kategori}\n\n")
+            
+            if self.filter_comparison.lag[self.active_filter].count:
+                f.write(f"Filter Kursor Aktif    : {self.active_filter}\n")
+                f.write("Perbandingan Filter (input mentah yang sama):\n")
+                for line in self.filter_comparison.format_table(self.active_filter):
+                    f.write(f"  {line}\n")
+                f.write("\n")
+            
+            # SPEED TEST
+            f.write("="*80 + "\n")
+            f.write("C. PENGUJIAN KECEPATAN TRACKING\n")
+            f.write("="*80 + "\n\n")
+            
+            if speed_stats:
+                for cat, stats in speed_stats.items():
+                    f.write(f"{cat.upper()}:\n")
+                    f.write(f"  Kecepatan Rata-rata  : {stats['avg_speed_px_per_s']:.2f} px/s\n")
+                    f.write(f"  Waktu Rata-rata      : {stats['avg_time_ms']:.2f} ms\n")
+                    f.write(f"  Jumlah Tes           : {stats['count']}\n\n")
+            else:
+                f.write("Belum ada data pengujian kecepatan.\n\n")
+            
+            # RANGKUMAN
+            f.write("="*80 + "\n")
+            f.write("RANGKUMAN UNTUK TABEL SKRIPSI\n")
+            f.write("="*80 + "\n\n")
+            
+            f.write("TABEL 4.6: Hasil Pengujian Move Cursor (Jari Tengah)\n")
+            f.write("-" * 80 + "\n\n")
+            
+            f.write(f"Aspek Responsivitas:\n")
+            f.write(f"  Jumlah Tes     : Auto-tracking (setiap detik)\n")
+            f.write(f"  Success Rate   : -\n\n")
+            
+            f.write(f"Aspek Presisi (9 titik):\n")
+            f.write(f"  Jumlah Tes     : {precision_stats['count']}\n")
+            f.write(f"  Success Rate   : {precision_stats['success_rate']:.2f}%\n")
+            f.write(f"  Avg Deviation  : {precision_stats['avg_deviation']:.2f} px\n\n")
+            
+            f.write(f"Aspek Smoothness:\n")
+            f.write(f"  Jumlah Tes     : {smoothness_stats['sample_count']} samples\n")
+            f.write(f"  Score          : {smoothness_stats['smoothness_score']:.2f}/100\n")
+            f.write(f"  Jitter         : {smoothness_stats['jitter_px']:.2f} px\n\n")
+            
+            if speed_stats:
+                f.write(f"Aspek Kecepatan:\n")
+                for cat, stats in speed_stats.items():
+                    f.write(f"  {cat.title()}: {stats['avg_time_ms']:.2f} ms "
+                           f"({stats['avg_speed_px_per_s']:.2f} px/s)\n")
+            
+            f.write("\n" + "="*80 + "\n")
+            f.write("FORMAT UNTUK TABEL SKRIPSI:\n")
+            f.write("-" * 80 + "\n\n")
+            
+            f.write("+--------------------+----------+-------------+-----------+--------------+\n")
+            f.write("| Aspek Pengujian    | Jumlah   | Success     | Avg       | Keterangan   |\n")
+            f.write("|                    | Tes      | Rate (%)    | Deviation |              |\n")
+            f.write("+--------------------+----------+-------------+-----------+--------------+\n")
+            f.write(f"| Responsivitas      | Auto     | -           | -         | Auto-track   |\n")
+            f.write(f"|                    |          |             |           | per 1s       |\n")
+            f.write("+--------------------+----------+-------------+-----------+--------------+\n")
+            f.write(f"| Presisi (9 titik)  | {precision_stats['count']:<8} | {precision_stats['success_rate']:<11.2f} | {precision_stats['avg_deviation']:<9.2f} | {kategori.split('(')[0].strip():<12} |\n")
+            f.write("+--------------------+----------+-------------+-----------+--------------+\n")
+            f.write(f"| Smoothness         | {smoothness_stats['sample_count']:<8} | {smoothness_stats['smoothness_score']:<11.2f} | -         | {smooth_kategori.split('(')[0].strip():<12} |\n")
+            f.write("+--------------------+----------+-------------+-----------+--------------+\n")
+            
+            if 'lambat' in speed_stats:
+                f.write(f"| Kecepatan Lambat   | {speed_stats['lambat']['count']:<8} | -           | -         | Smooth       |\n")
+                f.write("+--------------------+----------+-------------+-----------+--------------+\n")
+            if 'normal' in speed_stats:
+                f.write(f"| Kecepatan Normal   | {speed_stats['normal']['count']:<8} | -           | -         | Good         |\n")
+                f.write("+--------------------+----------+-------------+-----------+--------------+\n")
+            if 'cepat' in speed_stats:
+                f.write(f"| Kecepatan Cepat    | {speed_stats['cepat']['count']:<8} | -           | -         | Slight lag   |\n")
+                f.write("+--------------------+----------+-------------+-----------+--------------+\n")
+        
+        print(f"✅ Laporan kontrol kursor disimpan ke: {filename}")
+
+
+class FilterComparison:
+    """
+    Jitter (std jarak antar posisi berurutan) dan lag (jarak ke posisi mentah)
+    untuk setiap filter kursor, dihitung dari input mentah yang sama.
+    """
+
+    def __init__(self, names=FILTER_NAMES):
+        self.filters = {name: create_cursor_filter(name) for name in names}
+        self.steps = {name: RunningStats() for name in names}
+        self.lag = {name: RunningStats() for name in names}
+        self.last_pos = {name: None for name in names}
+        self.last_time = None
+        self.reset_gap = 0.2  # Sama dengan reset_gap filter kursor
+
+    def reset(self):
+        """Tangan hilang: lompatan posisi berikutnya tidak dihitung sebagai jitter"""
+        for name, cursor_filter in self.filters.items():
+            cursor_filter.reset()
+            self.last_pos[name] = None
+
+    def add(self, x, y, timestamp):
+        if self.last_time is not None and timestamp - self.last_time > self.reset_gap:
+            self.reset()
+        self.last_time = timestamp
+        for name, cursor_filter in self.filters.items():
+            fx, fy = cursor_filter.filter(x, y, timestamp)
+            last = self.last_pos[name]
+            if last is not None:
+                self.steps[name].add(math.hypot(fx - last[0], fy - last[1]))
+            self.last_pos[name] = (fx, fy)
+            self.lag[name].add(math.hypot(fx - x, fy - y))
+
+    def get_stats(self):
+        return {
+            name: {
+                'jitter_px': self.steps[name].std() if self.steps[name].count >= 2 else 0.0,
+                'avg_step_px': self.steps[name].mean,
+                'avg_lag_px': self.lag[name].mean,
+                'samples': self.lag[name].count
+            } for name in self.filters
+        }
+
+    def format_table(self, active=None):
+        """Baris tabel perbandingan untuk terminal / laporan TXT"""
+        lines = [f"{'Filter':<10} | {'Jitter':>8} | {'Langkah':>8} | {'Lag':>8} | {'Sampel':>7}",
+                 "-" * 52]
+        for name, s in self.get_stats().items():
+            marker = ' *' if name == active else ''
+            lines.append(f"{name:<10} | {s['jitter_px']:>8.2f} | {s['avg_step_px']:>8.2f} | "
+                         f"{s['avg_lag_px']:>8.2f} | {s['samples']:>7}{marker}")
+        lines.append("(px kamera; * = filter aktif)")
+        return lines
@@ -0,0 +1,137 @@
+"""
+Evaluasi Prediktor Landmark pada Rekaman Sesi
+Rekaman landmark (--record-landmarks) diputar ulang secara offline. Untuk
+setiap frame, posisi kursor (landmark pilihan) diekstrapolasi sejauh latency
+yang disimulasikan, lalu dibandingkan dengan posisi asli tangan pada waktu
+tersebut (interpolasi dari rekaman). Metrik presisi dan jitter diambil dari
+CursorTestTracker yang sama dengan pengujian kontrol kursor.
+
+Contoh:
+  python evaluate_predictor.py sesi1.jsonl --latency-ms 80
+  python evaluate_predictor.py sesi1.jsonl --landmark 8 --save hasil_prediktor.json
+"""
+
+import argparse
+import json
+from datetime import datetime
+
+import numpy as np
+
+from cursor_metrics import CursorTestTracker
+from landmark_predictor import PREDICTORS, create_predictor
+
+
+JITTER_WINDOW = 100  # Sama dengan jendela smoothness CursorTestTracker
+
+
+def load_track(path):
+    """Return: list (t, landmarks (21, 2)) untuk tangan pertama; None jika tidak ada tangan"""
+    track = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            hands = record['hands']
+            points = np.array(hands[0]['lmList'], dtype=np.float64)[:, :2] if hands else None
+            track.append((record['t'], points))
+    return track
+
+
+def ground_truth(track, index, target_time, landmark):
+    """Posisi asli landmark pada target_time (interpolasi linear), None jika tangan hilang"""
+    for j in range(index, len(track) - 1):
+        t0, p0 = track[j]
+        t1, p1 = track[j + 1]
+        if p0 is None or p1 is None:
+            return None
+        if t0 <= target_time <= t1:
+            ratio = (target_time - t0) / (t1 - t0) if t1 > t0 else 0.0
+            return p0[landmark] + ratio * (p1[landmark] - p0[landmark])
+    return None
+
+
+def evaluate(track, variant, latency, landmark, reset_gap=0.15):
+    """Jalankan satu varian ('raw' atau nama prediktor) di seluruh rekaman"""
+    tracker = CursorTestTracker()
+    predictor = None if variant == 'raw' else create_predictor(variant)
+    jitters = []
+    last_time = None
+
+    for index, (t, points) in enumerate(track):
+        if points is None:
+            continue
+        if predictor is not None:
+            if last_time is not None and t - last_time > reset_gap:
+                predictor.reset()
+            predictor.update(points, t)
+            cursor = predictor.predict(t + latency)[landmark]
+        else:
+            cursor = points[landmark]
+        last_time = t
+
+        truth = ground_truth(track, index, t + latency, landmark)
+        if truth is None:
+            continue
+        tracker.add_precision_test((float(truth[0]), float(truth[1])), (float(cursor[0]), float(cursor[1])))
+        tracker.add_smoothness_sample((float(cursor[0]), float(cursor[1])), t)
+        if len(tracker.precision_hits) % JITTER_WINDOW == 0:
+            jitters.append(tracker.calculate_jitter())
+
+    if not jitters:
+        jitters.append(tracker.calculate_jitter())
+    stats = tracker.get_precision_stats()
+    stats['jitter_px'] = sum(jitters) / len(jitters)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluasi prediktor landmark pada rekaman sesi")
+    parser.add_argument('recording', help="File rekaman landmark (.jsonl)")
+    parser.add_argument('--latency-ms', type=float, default=80.0,
+                        help="Latency capture -> aktuasi yang dikompensasi")
+    parser.add_argument('--landmark', type=int, default=12, help="Index landmark kursor (12 = jari tengah)")
+    parser.add_argument('--save', default=None, help="Simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    track = load_track(args.recording)
+    frames_with_hand = sum(1 for _, points in track if points is not None)
+    if frames_with_hand < 2:
+        print("✗ Rekaman tidak berisi cukup frame dengan tangan")
+        return
+
+    latency = args.latency_ms / 1000
+    results = {}
+    for variant in ('raw',) + tuple(PREDICTORS):
+        results[variant] = evaluate(track, variant, latency, args.landmark)
+
+    print("\n" + "="*80)
+    print("EVALUASI PREDIKTOR LANDMARK".center(80))
+    print("="*80)
+    print(f"Rekaman: {args.recording} ({frames_with_hand} frame dengan tangan), "
+          f"latency: {args.latency_ms:.0f} ms, landmark: {args.landmark}")
+    print("-"*80)
+    print(f"{'Varian':<12} | {'Deviasi Avg':>11} | {'Deviasi Max':>11} | {'Success':>8} | {'Jitter':>8}")
+    print("-"*80)
+    for variant, s in results.items():
+        print(f"{variant:<12} | {s['avg_deviation']:>11.2f} | {s['max_deviation']:>11.2f} | "
+              f"{s['success_rate']:>7.1f}% | {s['jitter_px']:>8.2f}")
+    print("(deviasi dan jitter dalam px kamera; raw = posisi landmark tanpa prediksi)")
+    print("="*80 + "\n")
+
+    if args.save:
+        report = {
+            'waktu_pengujian': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'rekaman': args.recording,
+            'latency_ms': args.latency_ms,
+            'landmark': args.landmark,
+            'hasil': results
+        }
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=4)
+        print(f"✓ Hasil evaluasi disimpan: {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,460 @@
+"""
+Modul Sumber Frame (Frame Source)
+Lapisan sumber frame yang bisa diganti: kamera live, file video rekaman,
+atau file rekaman landmark (JSONL). Dipakai untuk benchmark yang bisa diulang
+di mesin tanpa webcam.
+"""
+
+import argparse
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+from hand_transform import find_hands
+from threaded_capture import ThreadedCapture
+
+
+# ============= MODE KAMERA =============
+# Kandidat untuk probe saat startup: (fourcc, (w, h), fps)
+CAMERA_MODES = [
+    ('MJPG', (1280, 720), 30),
+    ('MJPG', (640, 480), 30),
+    ('YUYV', (640, 480), 30),
+    ('YUYV', (320, 240), 30),
+]
+
+
+def probe_camera_modes(capture, modes=CAMERA_MODES, frames=20):
+    """
+    Coba setiap mode kamera dan ukur FPS nyata (sebelum thread capture jalan).
+    Mode tercepat dipilih; jika FPS sama, resolusi terbesar menang.
+    Return: (mode terbaik, hasil semua mode)
+    """
+    results = []
+    for fourcc, size, fps in modes:
+        mode = capture.configure(size=size, fps=fps, fourcc=fourcc)
+        mode['measured_fps'] = capture.measure_fps(frames=frames)
+        mode['requested'] = f"{fourcc} {size[0]}x{size[1]}@{fps}"
+        results.append(mode)
+        print(f"  Probe {mode['requested']:<20} -> {mode['fourcc'] or '?'} "
+              f"{mode['width']}x{mode['height']} {mode['measured_fps']:.1f} fps")
+
+    working = [mode for mode in results if mode['measured_fps'] > 0]
+    if not working:
+        return None, results
+    # FPS dibulatkan agar jitter pengukuran tidak mengalahkan resolusi
+    best = max(working, key=lambda m: (round(m['measured_fps']), m['width'] * m['height']))
+    capture.configure(size=(best['width'], best['height']), fps=best['fps'], fourcc=best['fourcc'])
+    return best, results
+
+
+def parse_size(text):
+    """'640x480' -> (640, 480)"""
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+# ============= PACING =============
+class _Pacer:
+    """Menahan laju frame agar sesuai waktu rekaman (mode realtime)"""
+
+    def __init__(self, realtime):
+        self.realtime = realtime
+        self.wall_start = None
+        self.media_start = None
+
+    def reset(self):
+        self.wall_start = None
+        self.media_start = None
+
+    def wait(self, media_time):
+        if not self.realtime:
+            return
+        now = time.time()
+        if self.wall_start is None:
+            self.wall_start = now
+            self.media_start = media_time
+            return
+        delay = (media_time - self.media_start) - (now - self.wall_start)
+        if delay > 0:
+            time.sleep(delay)
+
+
+# ============= SUMBER FRAME =============
+class FrameSource:
+    """
+    Antarmuka dasar: read() -> (success, img), kompatibel dengan cv2.VideoCapture.
+    Setiap sumber (CameraSource, VideoFileSource, LandmarkStreamSource)
+    mengimplementasikan read_frame() -> (success, img, timestamp).
+    """
+
+    name = 'base'
+    needs_detector = True  # False: hasil deteksi sudah ada di sumber (detector tidak perlu dibuat)
+    lossless = False  # True: setiap frame harus diproses (file dengan --pace fast), pipeline tidak membuang frame
+
+    def __init__(self):
+        self.frames_read = 0
+        self.start_time = None
+        self.last_timestamp = None
+        self.recorder = None
+        self.power_saver = None
+
+    def read(self):
+        if self.start_time is None:
+            self.start_time = time.time()
+        if self.power_saver is not None:
+            self.power_saver.wait()
+        success, img, timestamp = self.read_frame()
+        if success:
+            self.frames_read += 1
+            self.last_timestamp = timestamp
+        return success, img
+
+    def wrap_detector(self, detector, record_path=None):
+        """Bungkus detector agar cocok dengan sumber ini (dan rekam landmark jika diminta)"""
+        self._attach_wrappers(detector)
+        if record_path:
+            self.recorder = LandmarkRecorder(record_path)
+            return RecordingDetector(detector, self.recorder)
+        return detector
+
+    def _attach_wrappers(self, detector):
+        """Hubungkan wrapper detector yang butuh sumber frame (IdlePowerSaver)"""
+        while detector is not None:
+            if hasattr(detector, 'attach_source'):
+                detector.attach_source(self)
+            if hasattr(detector, 'wait'):
+                self.power_saver = detector
+            detector = getattr(detector, 'detector', None)
+
+    def set_idle(self, idle):
+        """Mode hemat daya: sumber boleh mengurangi kerja capture"""
+        pass
+
+    def set(self, prop_id, value):
+        return False
+
+    def get(self, prop_id):
+        return 0.0
+
+    def isOpened(self):
+        return True
+
+    def get_stats(self):
+        elapsed = time.time() - self.start_time if self.start_time else 0.0
+        return {
+            'source': self.name,
+            'frames_read': self.frames_read,
+            'elapsed_seconds': elapsed,
+            'fps': self.frames_read / elapsed if elapsed > 0 else 0.0
+        }
+
+    def release(self):
+        if self.recorder is not None:
+            self.recorder.close()
+
+
+class CameraSource(FrameSource):
+    """Kamera live (capture di thread terpisah)"""
+
+    name = 'camera'
+
+    def __init__(self, index=0, size=None, fps=None, fourcc=None, probe=False):
+        super().__init__()
+        self.capture = ThreadedCapture(index)
+        self.probe_results = []
+        if probe:
+            print("Probe mode kamera...")
+            best, self.probe_results = probe_camera_modes(self.capture)
+            self.camera_mode = best or self.capture.configure()
+        else:
+            self.camera_mode = self.capture.configure(size=size, fps=fps, fourcc=fourcc)
+        print(f"Mode kamera: {self.camera_mode['fourcc'] or '?'} "
+              f"{self.camera_mode['width']}x{self.camera_mode['height']} @ {self.camera_mode['fps']:.0f} fps")
+
+    def read_frame(self):
+        return self.capture.read_latest()
+
+    def set_idle(self, idle):
+        if not idle or self.power_saver is None:
+            self.capture.set_retrieve_interval(1)
+            return
+        camera_fps = self.capture.get(cv2.CAP_PROP_FPS) or 30.0
+        self.capture.set_retrieve_interval(round(camera_fps / self.power_saver.idle_fps))
+
+    def set(self, prop_id, value):
+        return self.capture.set(prop_id, value)
+
+    def get(self, prop_id):
+        return self.capture.get(prop_id)
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def get_stats(self):
+        stats = super().get_stats()
+        stats.update(self.capture.get_stats())
+        stats['camera_mode'] = self.camera_mode
+        if self.probe_results:
+            stats['probe_results'] = self.probe_results
+        return stats
+
+    def release(self):
+        self.capture.release()
+        super().release()
+
+
+class VideoFileSource(FrameSource):
+    """File video rekaman, diputar full speed atau sesuai FPS aslinya"""
+
+    name = 'video'
+
+    def __init__(self, path, realtime=True, loop=False):
+        super().__init__()
+        self.path = path
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.fps = fps if fps and fps > 0 else 30.0
+        self.frame_index = 0
+        self.pacer = _Pacer(realtime)
+        self.lossless = not realtime
+
+    def read_frame(self):
+        success, img = self.cap.read()
+        if not success and self.loop and self.frame_index > 0:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self.frame_index = 0
+            self.pacer.reset()
+            success, img = self.cap.read()
+        if not success:
+            return False, None, None
+
+        self.pacer.wait(self.frame_index / self.fps)
+        self.frame_index += 1
+        return True, img, time.time()
+
+    def get(self, prop_id):
+        return self.cap.get(prop_id)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+        super().release()
+
+
+class LandmarkStreamSource(FrameSource):
+    """
+    File rekaman landmark (JSONL, satu baris per frame).
+    Frame yang dikembalikan adalah kanvas kosong seukuran frame asli; hasil
+    deteksi tangan diambil dari rekaman lewat ReplayDetector.
+    """
+
+    name = 'landmarks'
+    needs_detector = False  # ReplayDetector, model deteksi tangan tidak dimuat/diunduh
+
+    def __init__(self, path, realtime=True, loop=False):
+        super().__init__()
+        self.path = path
+        self.loop = loop
+        self.records = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    self.records.append(json.loads(line))
+        self.index = 0
+        self.current_hands = []
+        self.canvas = {}
+        self.pacer = _Pacer(realtime)
+        self.lossless = not realtime
+
+    def read_frame(self):
+        if self.index >= len(self.records):
+            if not self.loop or not self.records:
+                return False, None, None
+            self.index = 0
+            self.pacer.reset()
+
+        record = self.records[self.index]
+        self.index += 1
+        self.pacer.wait(record['t'])
+
+        self.current_hands = record['hands']
+        shape = (record['h'], record['w'], 3)
+        if shape not in self.canvas:
+            self.canvas[shape] = np.zeros(shape, dtype=np.uint8)
+        # Copy agar gambar dari frame sebelumnya tidak menumpuk
+        return True, self.canvas[shape].copy(), time.time()
+
+    def wrap_detector(self, detector, record_path=None):
+        return ReplayDetector(self)
+
+    def get(self, prop_id):
+        if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.records))
+        return 0.0
+
+
+# ============= DETECTOR REPLAY & REKAM =============
+def _copy_hands(hands):
+    """Copy hasil deteksi agar consumer bebas mengubahnya"""
+    return [dict(hand, lmList=[list(lm) for lm in hand['lmList']]) for hand in hands]
+
+
+class ReplayDetector:
+    """Pengganti HandDetector yang mengembalikan hasil rekaman landmark"""
+
+    def __init__(self, source):
+        self.source = source
+
+    def findHands(self, img, draw=True, flipType=True):
+        return _copy_hands(self.source.current_hands), img
+
+
+class LandmarkRecorder:
+    """Menyimpan hasil deteksi tangan per frame ke file JSONL"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'w', encoding='utf-8')
+        self.start_time = None
+        self.frames_written = 0
+
+    def record(self, hands, img_shape, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        if self.start_time is None:
+            self.start_time = timestamp
+
+        record = {
+            't': timestamp - self.start_time,
+            'w': int(img_shape[1]),
+            'h': int(img_shape[0]),
+            'hands': [{
+                'lmList': [[int(v) for v in lm] for lm in hand['lmList']],
+                'bbox': [int(v) for v in hand.get('bbox', (0, 0, 0, 0))],
+                'center': [int(v) for v in hand.get('center', (0, 0))],
+                'type': hand.get('type', '')
+            } for hand in hands]
+        }
+        self.file.write(json.dumps(record) + '\n')
+        self.frames_written += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class RecordingDetector:
+    """Bungkus HandDetector: deteksi seperti biasa lalu rekam hasilnya (waktu = timestamp capture)"""
+
+    uses_timestamp = True
+
+    def __init__(self, detector, recorder):
+        self.detector = detector
+        self.recorder = recorder
+
+    def findHands(self, img, draw=True, flipType=True, timestamp=None):
+        hands, out = find_hands(self.detector, img, draw=draw, flipType=flipType, timestamp=timestamp)
+        self.recorder.record(hands, img.shape, timestamp)
+        return hands, out
+
+
+# ============= FACTORY =============
+def open_frame_source(spec='0', pace='realtime', loop=False, camera=None):
+    """
+    Buka sumber frame dari string:
+      '0', '1', ...        -> kamera live
+      'rekaman.jsonl'      -> rekaman landmark
+      'rekaman.mp4' (dll)  -> file video
+    camera: opsi mode kamera (size, fps, fourcc, probe), lihat camera_options()
+    """
+    spec = str(spec)
+    realtime = pace == 'realtime'
+
+    if spec.isdigit():
+        return CameraSource(int(spec), **(camera or {}))
+    if not os.path.exists(spec):
+        raise FileNotFoundError(f"Sumber frame tidak ditemukan: {spec}")
+    if spec.lower().endswith('.jsonl'):
+        return LandmarkStreamSource(spec, realtime=realtime, loop=loop)
+    return VideoFileSource(spec, realtime=realtime, loop=loop)
+
+
+def parse_source_args(argv=None):
+    """Argumen command line untuk memilih sumber frame dan detector"""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--source', default='0',
+                        help="Index kamera, file video, atau file rekaman landmark (.jsonl)")
+    parser.add_argument('--pace', choices=['realtime', 'fast'], default='realtime',
+                        help="realtime = sesuai waktu rekaman, fast = secepat mungkin")
+    parser.add_argument('--loop', action='store_true',
+                        help="Ulangi rekaman dari awal setelah habis")
+    parser.add_argument('--record-landmarks', default=None,
+                        help="Rekam hasil deteksi tangan ke file .jsonl")
+    parser.add_argument('--detector', choices=['cvzone', 'lean'], default='cvzone',
+                        help="cvzone = HandDetector cvzone, lean = MediaPipe langsung (lebih ringan)")
+    parser.add_argument('--roi', action='store_true',
+                        help="Deteksi di sekitar bbox tangan terakhir, frame penuh jika tangan hilang")
+    parser.add_argument('--motion-gate', action='store_true',
+                        help="Pakai ulang hasil deteksi sebelumnya jika frame hampir tidak berubah")
+    parser.add_argument('--idle-timeout', type=float, default=None,
+                        help="Mode hemat daya (fps rendah + deteksi diperkecil) jika tidak ada tangan selama N detik")
+    parser.add_argument('--capture-size', type=parse_size, default=None,
+                        help="Resolusi capture kamera, mis. 640x480")
+    parser.add_argument('--capture-fps', type=float, default=None,
+                        help="FPS capture kamera")
+    parser.add_argument('--fourcc', default=None,
+                        help="Format kamera, mis. MJPG atau YUYV")
+    parser.add_argument('--probe-camera', action='store_true',
+                        help="Coba beberapa mode kamera saat startup dan pakai yang tercepat")
+    parser.add_argument('--inference-size', type=parse_size, default=None,
+                        help="Resolusi frame untuk deteksi tangan, mis. 320x240 (landmark tetap di koordinat tampilan)")
+    parser.add_argument('--mirror-landmarks', action='store_true',
+                        help="Deteksi pada frame asli, cerminkan landmark saja (flip hanya untuk preview)")
+    parser.add_argument('--predict', choices=['alpha-beta', 'kalman'], default=None,
+                        help="Ekstrapolasi landmark ke waktu aktuasi untuk mengkompensasi latency")
+    parser.add_argument('--predict-horizon', type=float, default=0.0,
+                        help="Lead tambahan prediksi (ms) di atas latency capture -> deteksi")
+    parser.add_argument('--cursor-filter', choices=['none', 'ema', 'deadzone', 'one-euro'], default='none',
+                        help="Filter penghalus posisi kursor")
+    parser.add_argument('--sync-mouse', action='store_true',
+                        help="Aktuasi mouse langsung di main loop (default: thread aktuasi terpisah)")
+    parser.add_argument('--min-move-px', type=float, default=2.0,
+                        help="Gerak kursor lebih kecil dari ini (px layar) ditahan dan digabung")
+    parser.add_argument('--mouse', choices=['pynput', 'null', 'recorder'], default='pynput',
+                        help="Backend aktuasi: pynput (mouse asli), null (tanpa aktuasi), recorder (rekam event)")
+    parser.add_argument('--screen-size', type=parse_size, default=(1920, 1080),
+                        help="Resolusi layar jika tidak dibaca dari monitor (--mouse null/recorder), mis. 1920x1080")
+    parser.add_argument('--mouse-events', default=None,
+                        help="Simpan event backend recorder ke file .npz")
+    parser.add_argument('--interpolate-hz', type=float, default=0,
+                        help="Kirim posisi kursor antara frame kamera dengan rate ini, mis. 120 (0 = mati)")
+    parser.add_argument('--headless', action='store_true',
+                        help="Tanpa window preview dan tanpa menggambar; tombol kontrol dari stdin")
+    parser.add_argument('--control-port', type=int, default=None,
+                        help="Terima tombol kontrol dari socket TCP lokal di port ini")
+    parser.add_argument('--preview-fps', type=float, default=15,
+                        help="Rate maksimum window preview, overlay digambar di thread sendiri (0 = langsung di main loop)")
+    parser.add_argument('--key-hz', type=float, default=30,
+                        help="Rate pembacaan tombol window (cv2.waitKey) di main thread")
+    parser.add_argument('--profile-stages', action='store_true',
+                        help="Cetak latency per tahap (dan okupansi pipeline) saat program selesai")
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
+def camera_options(args):
+    """Opsi mode kamera untuk open_frame_source() dari hasil parse_source_args()"""
+    return {
+        'size': args.capture_size,
+        'fps': args.capture_fps,
+        'fourcc': args.fourcc,
+        'probe': args.probe_camera
+    }
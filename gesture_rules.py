@@ -0,0 +1,162 @@
+"""
+Modul Tabel Aturan Gesture (Deklaratif)
+Setiap gesture didefinisikan sebagai satu baris tabel: fitur, pembanding,
+threshold, hysteresis, cooldown, dan jenis trigger. Tabel dikompilasi sekali
+saat startup menjadi array NumPy, sehingga semua gesture dievaluasi dalam
+satu langkah vectorized. Menambah gesture tidak menambah percabangan Python
+per frame.
+"""
+
+import numpy as np
+
+from hand_features import (WRIST, THUMB_TIP, INDEX_TIP, MIDDLE_TIP,
+                           RING_TIP, PINKY_TIP, FINGERTIPS)
+
+
+# ============= FITUR =============
+# Fitur jarak antar dua landmark (piksel), diambil dari matriks jarak
+PAIR_FEATURES = {
+    'thumb_index': (THUMB_TIP, INDEX_TIP),
+    'thumb_middle': (THUMB_TIP, MIDDLE_TIP),
+    'thumb_ring': (THUMB_TIP, RING_TIP),
+    'thumb_pinky': (THUMB_TIP, PINKY_TIP),
+    'index_middle': (INDEX_TIP, MIDDLE_TIP),
+    'middle_wrist': (MIDDLE_TIP, WRIST),
+}
+
+# Fitur agregat (dihitung dari semua ujung jari sekaligus):
+#   fist_spread      = jarak ujung jari terjauh dari pergelangan (kepal jika kecil)
+#   tips_below_wrist = selisih y terbesar ujung jari - pergelangan (< 0 = semua di atas)
+AGGREGATE_FEATURES = ('fist_spread', 'tips_below_wrist')
+
+FEATURE_NAMES = tuple(PAIR_FEATURES) + AGGREGATE_FEATURES
+
+_PAIR_A = np.array([a for a, _ in PAIR_FEATURES.values()])
+_PAIR_B = np.array([b for _, b in PAIR_FEATURES.values()])
+
+
+def extract_feature_vector(features):
+    """Vektor semua fitur (urutan FEATURE_NAMES) dari HandFeatures"""
+    tips_y = features.points[FINGERTIPS, 1]
+    aggregates = (features.tip_wrist_distance.max(), (tips_y - features.points[WRIST, 1]).max())
+    return np.concatenate((features.distances[_PAIR_A, _PAIR_B], aggregates))
+
+
+# ============= TABEL GESTURE =============
+# comparator : '<' aktif jika fitur di bawah threshold, '>' jika di atas
+# hysteresis : jarak tambahan yang harus dilewati agar gesture lepas (anti kedip)
+# cooldown   : jeda minimal (detik) antar trigger gesture yang sama
+# trigger    : 'edge' = sekali saat mulai aktif, 'level' = setiap frame selama aktif
+GESTURE_RULES = [
+    {'name': 'scroll_up', 'feature': 'thumb_index', 'comparator': '<', 'threshold': 50,
+     'hysteresis': 5, 'cooldown': 0.0, 'trigger': 'level'},
+    {'name': 'scroll_down', 'feature': 'thumb_index', 'comparator': '>', 'threshold': 150,
+     'hysteresis': 5, 'cooldown': 0.0, 'trigger': 'level'},
+    {'name': 'click', 'feature': 'thumb_pinky', 'comparator': '<', 'threshold': 30,
+     'hysteresis': 5, 'cooldown': 0.5, 'trigger': 'edge'},
+    {'name': 'right_click', 'feature': 'thumb_ring', 'comparator': '<', 'threshold': 30,
+     'hysteresis': 5, 'cooldown': 0.5, 'trigger': 'edge'},
+    {'name': 'toggle_scroll', 'feature': 'fist_spread', 'comparator': '<', 'threshold': 40,
+     'hysteresis': 0, 'cooldown': 0.5, 'trigger': 'edge'},
+    {'name': 'hand_raised', 'feature': 'tips_below_wrist', 'comparator': '<', 'threshold': 0,
+     'hysteresis': 0, 'cooldown': 0.0, 'trigger': 'level'},
+]
+
+
+class GestureResult:
+    """Hasil evaluasi satu frame: active, started (baru mulai aktif), fired (lolos cooldown)"""
+
+    def __init__(self, index, values, active, started, fired):
+        self.index = index
+        self.values = values
+        self.active_flags = active
+        self.started_flags = started
+        self.fired_flags = fired
+
+    def active(self, name):
+        return bool(self.active_flags[self.index[name]])
+
+    def started(self, name):
+        return bool(self.started_flags[self.index[name]])
+
+    def fired(self, name):
+        return bool(self.fired_flags[self.index[name]])
+
+
+class GestureEvaluator:
+    """
+    Tabel gesture yang sudah dikompilasi.
+    Semua aturan dinyatakan dalam bentuk sign * fitur < sign * threshold,
+    sehingga '<' dan '>' dievaluasi dengan operasi array yang sama.
+    """
+
+    def __init__(self, rules=GESTURE_RULES):
+        self.rules = list(rules)
+        self.names = [rule['name'] for rule in self.rules]
+        self.index = {name: i for i, name in enumerate(self.names)}
+
+        for rule in self.rules:
+            if rule['feature'] not in FEATURE_NAMES:
+                raise ValueError(f"Fitur tidak dikenal untuk gesture '{rule['name']}': {rule['feature']}")
+            if rule['comparator'] not in ('<', '>'):
+                raise ValueError(f"Pembanding harus '<' atau '>' untuk gesture '{rule['name']}'")
+
+        feature_index = {name: i for i, name in enumerate(FEATURE_NAMES)}
+        self.feature_slots = np.array([feature_index[rule['feature']] for rule in self.rules])
+        self.signs = np.array([1.0 if rule['comparator'] == '<' else -1.0 for rule in self.rules])
+        thresholds = np.array([float(rule['threshold']) for rule in self.rules])
+        hysteresis = np.array([float(rule.get('hysteresis', 0)) for rule in self.rules])
+        # Batas masuk dan batas lepas, sudah dikalikan sign
+        self.enter_limits = self.signs * thresholds
+        self.exit_limits = self.enter_limits + hysteresis
+        self.cooldowns = np.array([float(rule.get('cooldown', 0)) for rule in self.rules])
+        self.edge_trigger = np.array([rule.get('trigger', 'edge') == 'edge' for rule in self.rules])
+
+        self.last_fired = np.full(len(self.rules), -np.inf)
+        self.reset()
+
+    def reset(self):
+        """
+        Lupakan status gesture sebelumnya (mis. saat tangan hilang atau ada dua
+        tangan). Waktu trigger terakhir tetap diingat agar cooldown tidak bisa
+        dilewati dengan tangan yang hilang sesaat.
+        """
+        self.state = np.zeros(len(self.rules), dtype=bool)
+        self.latched = np.zeros(len(self.rules), dtype=bool)  # Edge sudah trigger, tunggu lepas
+
+    def evaluate(self, features, now):
+        """Evaluasi semua gesture untuk satu frame (features: HandFeatures)"""
+        values = extract_feature_vector(features)[self.feature_slots]
+        limits = np.where(self.state, self.exit_limits, self.enter_limits)
+        active = self.signs * values < limits
+
+        started = active & ~self.state
+        # Edge yang mulai saat cooldown tetap menunggu (selama masih aktif) dan
+        # trigger begitu cooldown habis; edge baru terkunci setelah benar-benar trigger
+        candidates = np.where(self.edge_trigger, active & ~self.latched, active)
+        fired = candidates & (now - self.last_fired > self.cooldowns)
+
+        self.last_fired[fired] = now
+        self.latched = (self.latched | fired) & active
+        self.state = active
+        return GestureResult(self.index, values, active, started, fired)
+
+    def near_threshold(self, features, names, margin):
+        """
+        Salah satu gesture di names aktif atau kurang dari margin (satuan fitur,
+        px) dari threshold masuknya. Stateless, seperti matches().
+        """
+        idx = [self.index[name] for name in names]
+        values = extract_feature_vector(features)[self.feature_slots[idx]]
+        return bool(np.any(self.signs[idx] * values < self.enter_limits[idx] + margin))
+
+    def is_edge(self, name):
+        """True jika gesture bertrigger 'edge' (sekali saat mulai), False jika 'level'"""
+        return bool(self.edge_trigger[self.index[name]])
+
+    def matches(self, features, name):
+        """Cek satu gesture tanpa mengubah status (untuk tangan kedua, dll)"""
+        i = self.index[name]
+        value = extract_feature_vector(features)[self.feature_slots[i]]
+        return bool(self.signs[i] * value < self.enter_limits[i])
+
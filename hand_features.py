@@ -0,0 +1,78 @@
+"""
+Modul Fitur Landmark Tangan (Vectorized)
+Mengubah lmList (21 titik) menjadi array NumPy (21, 3) sekali per frame, lalu
+menghitung semua fitur yang dibutuhkan gesture dalam satu langkah: matriks
+jarak 21x21, vektor ujung jari ke pergelangan, dan status jari terbuka.
+Klasifikasi gesture cukup mengambil nilai dari fitur yang sudah dihitung.
+"""
+
+import numpy as np
+
+
+# Index landmark MediaPipe
+WRIST = 0
+THUMB_TIP = 4
+INDEX_TIP = 8
+MIDDLE_TIP = 12
+RING_TIP = 16
+PINKY_TIP = 20
+
+FINGERTIPS = np.array([THUMB_TIP, INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP])
+# Sendi di bawah ujung jari (IP untuk jempol, PIP untuk jari lain)
+FINGER_JOINTS = np.array([3, 6, 10, 14, 18])
+FINGER_NAMES = ('thumb', 'index', 'middle', 'ring', 'pinky')
+
+
+class HandFeatures:
+    """
+    Fitur satu tangan untuk satu frame.
+    Jarak dihitung pada bidang gambar (x, y) dalam piksel, sama seperti
+    math.hypot di script sebelumnya, sehingga threshold lama tetap berlaku.
+    """
+
+    def __init__(self, lmList):
+        points = np.asarray(lmList, dtype=np.float64)
+        if points.shape[1] < 3:
+            points = np.pad(points, ((0, 0), (0, 3 - points.shape[1])))
+        self.points = points[:, :3]
+
+        xy = self.points[:, :2]
+        x = self.points[:, 0]
+        y = self.points[:, 1]
+        self.distances = np.hypot(x[:, np.newaxis] - x, y[:, np.newaxis] - y)
+
+        self.tip_to_wrist = xy[FINGERTIPS] - xy[WRIST]
+        self.tip_wrist_distance = self.distances[FINGERTIPS, WRIST]
+        # Jari terbuka: ujung jari lebih jauh dari pergelangan dibanding sendinya
+        self.fingers_extended = self.tip_wrist_distance > self.distances[FINGER_JOINTS, WRIST]
+        # Koordinat y lebih kecil = lebih tinggi di gambar
+        self.tips_above_wrist = xy[FINGERTIPS, 1] < xy[WRIST, 1]
+
+    def distance(self, a, b):
+        """Jarak (piksel) antara landmark a dan b"""
+        return float(self.distances[a, b])
+
+    def point(self, index):
+        """Koordinat (x, y) landmark sebagai int, untuk menggambar dan kursor"""
+        return int(self.points[index, 0]), int(self.points[index, 1])
+
+    def is_fist(self, threshold=40):
+        """Semua ujung jari dekat pergelangan"""
+        return bool((self.tip_wrist_distance < threshold).all())
+
+    def is_raised(self):
+        """Semua ujung jari di atas pergelangan"""
+        return bool(self.tips_above_wrist.all())
+
+    def extended_fingers(self):
+        """Nama jari yang sedang terbuka"""
+        return [name for name, extended in zip(FINGER_NAMES, self.fingers_extended) if extended]
+
+
+def get_hand_features(hand):
+    """Fitur untuk dict tangan dari detector, dihitung sekali lalu disimpan di hand['features']"""
+    features = hand.get('features')
+    if features is None:
+        features = HandFeatures(hand['lmList'])
+        hand['features'] = features
+    return features
@@ -0,0 +1,148 @@
+"""
+Modul Transformasi Hasil Deteksi Tangan
+Memetakan koordinat landmark dari frame yang dipotong/diperkecil/tidak di-flip
+kembali ke koordinat frame tampilan, plus detector yang menjalankan inference
+pada resolusi terpisah dari resolusi capture atau tanpa cv2.flip.
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+
+def transform_hand(hand, scale_x=1.0, scale_y=1.0, dx=0, dy=0):
+    """Ubah koordinat satu tangan (in place): x' = x * scale_x + dx, y' = y * scale_y + dy"""
+    if 'lmPredicted' in hand:
+        # Posisi prediksi (PredictiveDetector) ikut koordinat landmark
+        hand['lmPredicted'] = hand['lmPredicted'] * (scale_x, scale_y) + (dx, dy)
+    lmList = hand['lmList']
+    if isinstance(lmList, np.ndarray):
+        # LeanHand: bbox/center dihitung dari lmList, cukup ubah array
+        if scale_x != 1.0 or scale_y != 1.0:
+            np.multiply(lmList[:, :2], (scale_x, scale_y), out=lmList[:, :2], casting='unsafe')
+        lmList[:, 0] += dx
+        lmList[:, 1] += dy
+        return
+
+    hand['lmList'] = [[int(lm[0] * scale_x) + dx, int(lm[1] * scale_y) + dy] + list(lm[2:])
+                      for lm in lmList]
+    if 'bbox' in hand:
+        bx, by, bw, bh = hand['bbox']
+        hand['bbox'] = (int(bx * scale_x) + dx, int(by * scale_y) + dy, int(bw * scale_x), int(bh * scale_y))
+    if 'center' in hand:
+        cx, cy = hand['center']
+        hand['center'] = (int(cx * scale_x) + dx, int(cy * scale_y) + dy)
+
+
+def mirror_hand(hand, width):
+    """
+    Cerminkan koordinat x satu tangan (in place) dan tukar label Left/Right.
+    Satu konvensi untuk semua koordinat, sama dengan cv2.flip(img, 1): piksel
+    x menjadi width - 1 - x. bbox (x, y, w, h) memakai w = xmax - xmin seperti
+    cvzone/LeanHand, jadi tepi kanan x + w juga piksel landmark dan tepi kiri
+    baru = width - 1 - (x + w), sama dengan bbox dari landmark yang dicerminkan.
+    """
+    if 'lmPredicted' in hand:
+        hand['lmPredicted'] = hand['lmPredicted'] * (-1, 1) + (width - 1, 0)
+    lmList = hand['lmList']
+    if isinstance(lmList, np.ndarray):
+        np.subtract(width - 1, lmList[:, 0], out=lmList[:, 0])
+    else:
+        hand['lmList'] = [[width - 1 - lm[0]] + list(lm[1:]) for lm in lmList]
+        if 'bbox' in hand:
+            bx, by, bw, bh = hand['bbox']
+            hand['bbox'] = (width - 1 - (bx + bw), by, bw, bh)
+        if 'center' in hand:
+            cx, cy = hand['center']
+            hand['center'] = (width - 1 - cx, cy)
+    hand_type = hand.get('type')
+    if hand_type in ('Left', 'Right'):
+        hand['type'] = 'Left' if hand_type == 'Right' else 'Right'
+
+
+def find_hands(detector, img, draw=True, flipType=True, timestamp=None):
+    """
+    findHands dengan timestamp capture frame ini. Timestamp hanya diteruskan ke
+    detector yang memakainya (uses_timestamp); detector lain (mis. cvzone)
+    dipanggil seperti biasa.
+    """
+    if timestamp is not None and getattr(detector, 'uses_timestamp', False):
+        return detector.findHands(img, draw=draw, flipType=flipType, timestamp=timestamp)
+    return detector.findHands(img, draw=draw, flipType=flipType)
+
+
+def draw_landmarks(img, hands, color=(255, 0, 255)):
+    """Titik landmark sederhana (pengganti gambar cvzone jika detector tidak menggambar)"""
+    for hand in hands:
+        for lm in hand['lmList']:
+            cv2.circle(img, (int(lm[0]), int(lm[1])), 3, color, cv2.FILLED)
+
+
+class ResizedInferenceDetector:
+    """
+    Bungkus detector: frame diperkecil sekali ke resolusi inference, hasil
+    landmark dikembalikan dalam koordinat frame tampilan.
+    """
+
+    def __init__(self, detector, size):
+        self.detector = detector
+        self.size = tuple(size)  # (w, h) untuk inference
+        self.small = None
+        self.frames = 0
+        self.resize_time = 0.0
+        self.detect_time = 0.0
+        self.display_size = None
+
+    def findHands(self, img, draw=True, flipType=True):
+        h, w = img.shape[:2]
+        self.display_size = (w, h)
+        if (w, h) == self.size:
+            return self.detector.findHands(img, draw=draw, flipType=flipType)
+
+        t0 = time.perf_counter()
+        self.small = cv2.resize(img, self.size, dst=self.small, interpolation=cv2.INTER_AREA)
+        t1 = time.perf_counter()
+        hands, _ = self.detector.findHands(self.small, draw=False, flipType=flipType)
+        self.detect_time += time.perf_counter() - t1
+        self.resize_time += t1 - t0
+        self.frames += 1
+
+        for hand in hands:
+            transform_hand(hand, w / self.size[0], h / self.size[1])
+        if draw:
+            draw_landmarks(img, hands)
+        return hands, img
+
+    def get_stats(self):
+        return {
+            'mode': 'resize',
+            'inference_size': list(self.size),
+            'display_size': list(self.display_size) if self.display_size else None,
+            'frames': self.frames,
+            'avg_resize_ms': (self.resize_time / self.frames * 1000) if self.frames else 0.0,
+            'avg_detect_ms': (self.detect_time / self.frames * 1000) if self.frames else 0.0
+        }
+
+
+class MirroredDetector:
+    """
+    Bungkus detector untuk frame yang TIDAK di-flip: hanya 21 koordinat x yang
+    dicerminkan, sehingga hasilnya sama dengan deteksi pada cv2.flip(img, 1).
+    Frame yang dikembalikan tetap tidak di-flip; flip cukup dilakukan untuk
+    preview (titik landmark sudah digambar di posisi frame asli).
+    """
+
+    def __init__(self, detector):
+        self.detector = detector
+
+    def findHands(self, img, draw=True, flipType=True):
+        # Gambar cvzone (teks label) akan terbalik setelah preview di-flip
+        hands, img = self.detector.findHands(img, draw=False, flipType=flipType)
+        if draw:
+            draw_landmarks(img, hands)
+        # Handedness MediaPipe bergantung pada arah gambar: label ikut ditukar
+        width = img.shape[1]
+        for hand in hands:
+            mirror_hand(hand, width)
+        return hands, img
@@ -0,0 +1,197 @@
+"""
+Modul Prediktor Landmark (Kompensasi Latency)
+Posisi landmark selalu tertinggal dari tangan sebesar latency capture +
+inference. Prediktor memperkirakan kecepatan tiap landmark (model kecepatan
+konstan) lalu mengekstrapolasi posisi ke waktu aktuasi. Tersedia dua varian:
+alpha-beta (gain tetap) dan Kalman (gain dihitung dari noise proses/ukur).
+Semua 21 landmark x 2 sumbu diproses sebagai satu array. Hasil prediksi hanya
+dipakai untuk kursor; fitur gesture (jarak pinch/klik/scroll) tetap dihitung
+dari landmark terukur, agar overshoot saat gerak cepat tidak memicu klik.
+"""
+
+import time
+
+import numpy as np
+
+from hand_transform import find_hands
+
+
+class AlphaBetaPredictor:
+    """Filter alpha-beta per landmark per sumbu (gain tetap)"""
+
+    name = 'alpha-beta'
+
+    def __init__(self, alpha=0.7, beta=0.2, max_horizon=0.15):
+        self.alpha = alpha
+        self.beta = beta
+        self.max_horizon = max_horizon  # Batas ekstrapolasi (detik) agar tidak overshoot
+        self.reset()
+
+    def reset(self):
+        self.position = None
+        self.velocity = None
+        self.last_time = None
+
+    def update(self, points, timestamp):
+        """Masukkan pengukuran (N, 2) pada waktu capture timestamp"""
+        points = np.asarray(points, dtype=np.float64)
+        if self.position is None or self.position.shape != points.shape:
+            self.position = points.copy()
+            self.velocity = np.zeros_like(points)
+            self.last_time = timestamp
+            return self.position
+
+        dt = timestamp - self.last_time
+        if dt <= 0:
+            return self.position
+        self.position += self.velocity * dt
+        residual = points - self.position
+        self.position += self.alpha * residual
+        self.velocity += (self.beta / dt) * residual
+        self.last_time = timestamp
+        return self.position
+
+    def predict(self, target_time):
+        """Posisi (N, 2) yang diekstrapolasi ke target_time"""
+        horizon = min(max(0.0, target_time - self.last_time), self.max_horizon)
+        return self.position + self.velocity * horizon
+
+
+class KalmanPredictor:
+    """
+    Filter Kalman kecepatan konstan per landmark per sumbu.
+    State [posisi, kecepatan]; kovarians 2x2 disimpan sebagai tiga array
+    (p00, p01, p11) agar semua landmark diperbarui sekaligus.
+    """
+
+    name = 'kalman'
+
+    def __init__(self, process_noise=10000.0, measurement_noise=4.0, max_horizon=0.15):
+        self.process_noise = process_noise          # Variansi akselerasi (px^2/s^3)
+        self.measurement_noise = measurement_noise  # Variansi noise landmark (px^2)
+        self.max_horizon = max_horizon
+        self.reset()
+
+    def reset(self):
+        self.position = None
+        self.velocity = None
+        self.last_time = None
+
+    def update(self, points, timestamp):
+        """Masukkan pengukuran (N, 2) pada waktu capture timestamp"""
+        points = np.asarray(points, dtype=np.float64)
+        if self.position is None or self.position.shape != points.shape:
+            self.position = points.copy()
+            self.velocity = np.zeros_like(points)
+            self.p00 = np.full_like(points, self.measurement_noise)
+            self.p01 = np.zeros_like(points)
+            self.p11 = np.full_like(points, 1e6)  # Kecepatan awal belum diketahui
+            self.last_time = timestamp
+            return self.position
+
+        dt = timestamp - self.last_time
+        if dt <= 0:
+            return self.position
+
+        # Prediksi: x = F x, P = F P F' + Q (white-noise acceleration)
+        q = self.process_noise
+        self.position += self.velocity * dt
+        p00 = self.p00 + dt * (2 * self.p01 + dt * self.p11) + q * dt ** 3 / 3
+        p01 = self.p01 + dt * self.p11 + q * dt ** 2 / 2
+        p11 = self.p11 + q * dt
+
+        # Koreksi dengan pengukuran posisi
+        s = p00 + self.measurement_noise
+        k0 = p00 / s
+        k1 = p01 / s
+        residual = points - self.position
+        self.position += k0 * residual
+        self.velocity += k1 * residual
+        self.p00 = (1 - k0) * p00
+        self.p01 = (1 - k0) * p01
+        self.p11 = p11 - k1 * p01
+        self.last_time = timestamp
+        return self.position
+
+    def predict(self, target_time):
+        """Posisi (N, 2) yang diekstrapolasi ke target_time"""
+        horizon = min(max(0.0, target_time - self.last_time), self.max_horizon)
+        return self.position + self.velocity * horizon
+
+
+PREDICTORS = {
+    'alpha-beta': AlphaBetaPredictor,
+    'kalman': KalmanPredictor,
+}
+
+
+def create_predictor(kind, **kwargs):
+    """Buat prediktor dari nama: 'alpha-beta' atau 'kalman'"""
+    if kind not in PREDICTORS:
+        raise ValueError(f"Prediktor tidak dikenal: {kind} (pilihan: {', '.join(PREDICTORS)})")
+    return PREDICTORS[kind](**kwargs)
+
+
+class PredictiveDetector:
+    """
+    Bungkus detector: posisi landmark hasil prediksi pada (waktu selesai
+    deteksi + horizon) disimpan di hand['lmPredicted'] (array (21, 2)) untuk
+    kursor; hand['lmList'] tetap hasil ukur. Waktu pengukuran adalah timestamp
+    capture frame yang sedang dideteksi (argumen timestamp, lihat find_hands),
+    bukan status sumber frame: di mode pipeline thread capture sudah membaca
+    frame berikutnya.
+    """
+
+    uses_timestamp = True
+
+    def __init__(self, detector, kind='kalman', horizon=0.0, reset_gap=0.15, **kwargs):
+        self.detector = detector
+        self.kind = kind
+        self.horizon = horizon      # Lead tambahan (detik) untuk tahap gesture + aktuasi
+        self.reset_gap = reset_gap  # Jeda tanpa tangan (detik) sebelum state prediktor dibuang
+        self.kwargs = kwargs
+        self.predictors = {}  # Satu prediktor per tangan (kunci: label Left/Right)
+        self.frame_shape = None
+
+        # Statistik
+        self.frames = 0
+        self.lead_total = 0.0
+
+    def findHands(self, img, draw=True, flipType=True, timestamp=None):
+        start = time.time()
+        hands, img = self.detector.findHands(img, draw=draw, flipType=flipType)
+        now = time.time()
+        capture_time = timestamp if timestamp is not None else start
+
+        # Ukuran frame berubah (mis. mode idle): koordinat lama tidak sebanding
+        if img.shape != self.frame_shape:
+            self.frame_shape = img.shape
+            self.predictors = {}
+
+        used = set()
+        for index, hand in enumerate(hands):
+            # Urutan tangan bisa berubah antar frame, label lebih stabil (kecuali label kembar)
+            key = hand.get('type') or index
+            if key in used:
+                key = index
+            used.add(key)
+            predictor = self.predictors.get(key)
+            if predictor is None:
+                predictor = self.predictors[key] = create_predictor(self.kind, **self.kwargs)
+            if predictor.last_time is not None and capture_time - predictor.last_time > self.reset_gap:
+                predictor.reset()
+            points = np.asarray(hand['lmList'])[:, :2]
+            predictor.update(points, capture_time)
+            hand['lmPredicted'] = predictor.predict(now + self.horizon)
+            self.frames += 1
+            self.lead_total += now + self.horizon - capture_time
+        return hands, img
+
+    def get_stats(self):
+        return {
+            'mode': 'predict',
+            'predictor': self.kind,
+            'horizon_ms': self.horizon * 1000,
+            'frames': self.frames,
+            'avg_lead_ms': (self.lead_total / self.frames * 1000) if self.frames else 0.0
+        }
@@ -0,0 +1,245 @@
+"""
+Modul Histogram Latency (Log-Bucketed, gaya HDR)
+Menyimpan distribusi latency dengan memori tetap, sehingga p50/p95/p99/p99.9
+bisa dilaporkan tanpa menyimpan semua sampel. Tail latency inilah yang
+terasa sebagai kursor "tersendat", dan tidak terlihat dari rata-rata.
+"""
+
+import math
+import time
+
+from streaming_stats import RunningStats
+
+
+# Tahap pipeline yang diukur latency-nya
+STAGES = ('capture', 'detect', 'gesture', 'actuation', 'render')
+
+PERCENTILES = (
+    ('p50', 50.0),
+    ('p95', 95.0),
+    ('p99', 99.0),
+    ('p99_9', 99.9),
+)
+
+
+class LatencyHistogram:
+    """
+    Histogram dengan bucket logaritmik: lebar bucket = precision (relatif),
+    mis. precision=0.01 -> error kuantil maksimal ~1%.
+    Memori tetap (jumlah bucket ditentukan di awal), update O(1).
+    Count/mean/std/min/max diambil dari RunningStats (Welford).
+    """
+
+    def __init__(self, min_value=0.01, max_value=60000.0, precision=0.01, reservoir_size=0):
+        self.reservoir_size = reservoir_size
+        self.min_value = min_value
+        self.max_value = max_value
+        self.log_base = math.log1p(precision)
+        self.bucket_count = int(math.ceil(math.log(max_value / min_value) / self.log_base)) + 1
+        self.buckets = [0] * self.bucket_count
+        self.reset()
+
+    def reset(self):
+        for i in range(self.bucket_count):
+            self.buckets[i] = 0
+        self.summary = RunningStats(reservoir_size=self.reservoir_size)
+
+    @property
+    def count(self):
+        return self.summary.count
+
+    @property
+    def total(self):
+        return self.summary.total
+
+    @property
+    def min(self):
+        return self.summary.min
+
+    @property
+    def max(self):
+        return self.summary.max
+
+    def _bucket_index(self, value):
+        if value <= self.min_value:
+            return 0
+        index = int(math.log(value / self.min_value) / self.log_base) + 1
+        return min(index, self.bucket_count - 1)
+
+    def _bucket_upper(self, index):
+        return self.min_value * math.exp(self.log_base * index)
+
+    def record(self, value):
+        """Catat satu sampel (satuan bebas, biasanya ms)"""
+        self.buckets[self._bucket_index(value)] += 1
+        self.summary.add(value)
+
+    def merge(self, other):
+        """Gabungkan histogram lain dengan konfigurasi bucket yang sama"""
+        for i, n in enumerate(other.buckets):
+            self.buckets[i] += n
+        self.summary.merge(other.summary)
+
+    def mean(self):
+        return self.summary.mean
+
+    def std(self):
+        return self.summary.std()
+
+    def sample(self):
+        """Reservoir sample untuk plotting (jika reservoir_size > 0)"""
+        return self.summary.sample()
+
+    def percentile(self, percent):
+        """Nilai kuantil (batas atas bucket, dibatasi min/max yang sebenarnya)"""
+        if self.count == 0:
+            return 0.0
+        target = max(1, int(math.ceil(self.count * percent / 100.0)))
+        cumulative = 0
+        for index, n in enumerate(self.buckets):
+            cumulative += n
+            if cumulative >= target:
+                return min(max(self._bucket_upper(index), self.min), self.max)
+        return self.max
+
+    def get_stats(self):
+        stats = {
+            'count': self.count,
+            'avg': self.mean(),
+            'std': self.std(),
+            'min': self.min if self.min is not None else 0.0,
+            'max': self.max if self.max is not None else 0.0
+        }
+        for name, percent in PERCENTILES:
+            stats[name] = self.percentile(percent)
+        return stats
+
+
+class StageLatencyRecorder:
+    """Satu histogram per tahap: capture, detect, gesture, actuation, render"""
+
+    def __init__(self, stages=STAGES):
+        self.histograms = {stage: LatencyHistogram() for stage in stages}
+
+    def record(self, stage, value_ms):
+        self.histograms[stage].record(value_ms)
+
+    def get_report(self):
+        return {stage: hist.get_stats() for stage, hist in self.histograms.items()}
+
+    def format_table(self):
+        """Baris-baris tabel latency per tahap (untuk terminal dan laporan TXT)"""
+        lines = [
+            f"{'Tahap':<10} | {'Count':>7} | {'Avg':>7} | {'p50':>7} | {'p95':>7} | "
+            f"{'p99':>7} | {'p99.9':>7} | {'Max':>7}",
+            "-" * 80
+        ]
+        for stage, s in self.get_report().items():
+            lines.append(
+                f"{stage:<10} | {s['count']:>7} | {s['avg']:>7.2f} | {s['p50']:>7.2f} | "
+                f"{s['p95']:>7.2f} | {s['p99']:>7.2f} | {s['p99_9']:>7.2f} | {s['max']:>7.2f}")
+        lines.append("(semua nilai dalam ms)")
+        return lines
+
+
+class TimedMouse:
+    """
+    Proxy pynput Controller yang mengukur latency setiap panggilan aktuasi
+    (position, scroll, click) ke histogram tahap 'actuation'. suppressor
+    (async_mouse.MoveSuppressor, opsional) melewati gerak kecil/sama seperti
+    di AsyncMouse; posisi yang ditahan dikirim sebelum klik, di flush(), dan
+    di close().
+    """
+
+    def __init__(self, mouse, recorder, suppressor=None):
+        # object.__setattr__ karena __setattr__ di-override untuk 'position'
+        object.__setattr__(self, 'mouse', mouse)
+        object.__setattr__(self, 'recorder', recorder)
+        object.__setattr__(self, 'suppressor', suppressor)
+        object.__setattr__(self, 'frame_ms', 0.0)
+        object.__setattr__(self, 'submitted', 0)
+        object.__setattr__(self, 'executed', 0)
+
+    def _timed(self, func, *args):
+        t0 = time.perf_counter()
+        result = func(*args)
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        self.recorder.record('actuation', elapsed_ms)
+        object.__setattr__(self, 'frame_ms', self.frame_ms + elapsed_ms)
+        object.__setattr__(self, 'executed', self.executed + 1)
+        return result
+
+    def _move(self, position):
+        self._timed(setattr, self.mouse, 'position', position)
+
+    def flush(self):
+        """Kirim posisi yang masih ditahan suppressor (mis. saat tangan hilang)"""
+        if self.suppressor is not None:
+            held = self.suppressor.flush()
+            if held is not None:
+                self._move(held)
+
+    def take_frame_ms(self):
+        """Total waktu aktuasi sejak panggilan terakhir (lalu reset ke 0)"""
+        elapsed_ms = self.frame_ms
+        object.__setattr__(self, 'frame_ms', 0.0)
+        return elapsed_ms
+
+    @property
+    def position(self):
+        return self.mouse.position
+
+    def __setattr__(self, name, value):
+        if name == 'position':
+            object.__setattr__(self, 'submitted', self.submitted + 1)
+            position = tuple(value)
+            if self.suppressor is not None:
+                position = self.suppressor.check(position, time.perf_counter())
+            if position is not None:
+                self._move(position)
+        else:
+            object.__setattr__(self, name, value)
+
+    def scroll(self, dx, dy):
+        object.__setattr__(self, 'submitted', self.submitted + 1)
+        return self._timed(self.mouse.scroll, dx, dy)
+
+    def click(self, button, count=1):
+        object.__setattr__(self, 'submitted', self.submitted + 1)
+        self.flush()
+        return self._timed(self.mouse.click, button, count)
+
+    def press(self, button):
+        object.__setattr__(self, 'submitted', self.submitted + 1)
+        self.flush()
+        return self._timed(self.mouse.press, button)
+
+    def release(self, button):
+        object.__setattr__(self, 'submitted', self.submitted + 1)
+        self.flush()
+        return self._timed(self.mouse.release, button)
+
+    def close(self):
+        """Kirim posisi yang masih ditahan lalu tutup backend"""
+        self.flush()
+        if self.suppressor is not None:
+            stats = self.get_stats()
+            print(f"\nAktuasi mouse (sinkron): {stats['submitted']} perintah, {stats['executed']} panggilan sistem, "
+                  f"{stats['calls_avoided']} panggilan dihindari")
+        if hasattr(self.mouse, 'close'):
+            self.mouse.close()
+
+    def get_stats(self):
+        stats = {
+            'mode': 'sync',
+            'submitted': self.submitted,
+            'executed': self.executed,
+            'backend': getattr(self.mouse, 'name', type(self.mouse).__name__)
+        }
+        if hasattr(self.mouse, 'get_stats'):
+            stats['recorder'] = self.mouse.get_stats()
+        if self.suppressor is not None:
+            suppressor = self.suppressor.get_stats()
+            stats.update(suppressor)
+            stats['calls_avoided'] = suppressor['skipped_noop'] + suppressor['skipped_small']
+        return stats
@@ -0,0 +1,212 @@
+"""
+Modul Detector MediaPipe Langsung (Lean Backend)
+Memanggil MediaPipe Hands langsung tanpa lapisan cvzone: landmark ditulis ke
+array NumPy yang sudah dialokasikan, tanpa menggambar dan tanpa membangun
+list per landmark. Hasilnya tetap bisa dipakai seperti hands[i]["lmList"].
+"""
+
+import os
+import urllib.request
+
+import cv2
+import numpy as np
+import mediapipe as mp
+
+
+# Jumlah buffer hasil yang dirotasi: hasil satu frame tetap valid walaupun
+# tahap pipeline berikutnya masih memakainya saat frame baru dideteksi
+RESULT_BUFFERS = 4
+
+TASK_MODEL_URL = ("https://storage.googleapis.com/mediapipe-models/hand_landmarker/"
+                  "hand_landmarker/float16/1/hand_landmarker.task")
+TASK_MODEL_NAME = "hand_landmarker.task"
+
+
+class LandmarkArray(np.ndarray):
+    """Array landmark (21, 3) int32 yang bernilai True seperti list tidak kosong"""
+
+    def __bool__(self):
+        return self.size > 0
+
+
+class LeanHand:
+    """
+    Pengganti dict tangan dari cvzone.
+    lmList langsung berupa view ke buffer NumPy; bbox/center dihitung hanya
+    jika diminta.
+    """
+
+    __slots__ = ('lmList', 'type', 'extra')
+
+    def __init__(self, lmList, hand_type):
+        self.lmList = lmList
+        self.type = hand_type
+        self.extra = {}
+
+    def _bbox(self):
+        xy = self.lmList[:, :2]
+        xmin, ymin = (int(v) for v in xy.min(axis=0))
+        xmax, ymax = (int(v) for v in xy.max(axis=0))
+        return xmin, ymin, xmax - xmin, ymax - ymin
+
+    def __getitem__(self, key):
+        if key == 'lmList':
+            return self.lmList
+        if key == 'type':
+            return self.type
+        if key == 'bbox':
+            return self._bbox()
+        if key == 'center':
+            x, y, w, h = self._bbox()
+            return x + w // 2, y + h // 2
+        return self.extra[key]
+
+    def __setitem__(self, key, value):
+        if key == 'lmList':
+            self.lmList = value
+        elif key == 'type':
+            self.type = value
+        else:
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        return key in ('lmList', 'type', 'bbox', 'center') or key in self.extra
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def keys(self):
+        return ['lmList', 'bbox', 'center', 'type'] + list(self.extra)
+
+
+class LeanHandDetector:
+    """
+    findHands(img) -> (hands, img), kompatibel dengan cvzone HandDetector.
+    Memakai mp.solutions.hands jika tersedia, selain itu MediaPipe Tasks
+    HandLandmarker (mode VIDEO). staticMode=True: setiap gambar dideteksi
+    ulang tanpa tracking antar frame (mode IMAGE), mis. untuk crop ROI.
+    """
+
+    def __init__(self, maxHands=2, detectionCon=0.5, minTrackCon=0.5, staticMode=False):
+        self.maxHands = maxHands
+        self.staticMode = staticMode
+        self.detectionCon = detectionCon
+        self.minTrackCon = minTrackCon
+
+        self.buffers = np.zeros((RESULT_BUFFERS, maxHands, 21, 3), dtype=np.int32)
+        self.buffer_index = 0
+        self.scaled = np.zeros((21, 3), dtype=np.float32)
+        self.rgb = None
+
+        if hasattr(mp, 'solutions'):
+            self.backend = 'solutions'
+            self.hands = mp.solutions.hands.Hands(
+                static_image_mode=staticMode,
+                max_num_hands=maxHands,
+                min_detection_confidence=detectionCon,
+                min_tracking_confidence=minTrackCon)
+        else:
+            from mediapipe.tasks import python as mp_tasks
+            from mediapipe.tasks.python import vision
+
+            if not os.path.exists(TASK_MODEL_NAME):
+                print("Downloading MediaPipe Hand model...")
+                urllib.request.urlretrieve(TASK_MODEL_URL, TASK_MODEL_NAME)
+
+            self.backend = 'tasks'
+            options = vision.HandLandmarkerOptions(
+                base_options=mp_tasks.BaseOptions(model_asset_path=TASK_MODEL_NAME),
+                num_hands=maxHands,
+                min_hand_detection_confidence=detectionCon,
+                min_tracking_confidence=minTrackCon,
+                running_mode=vision.RunningMode.IMAGE if staticMode else vision.RunningMode.VIDEO)
+            self.hands = vision.HandLandmarker.create_from_options(options)
+            self.timestamp_ms = 0
+
+    def _detect(self, rgb):
+        """Return: list (landmarks, label) per tangan"""
+        if self.backend == 'solutions':
+            result = self.hands.process(rgb)
+            if not result.multi_hand_landmarks:
+                return []
+            labels = [h.classification[0].label for h in result.multi_handedness]
+            return [(lm.landmark, label) for lm, label in zip(result.multi_hand_landmarks, labels)]
+
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+        if self.staticMode:
+            result = self.hands.detect(image)
+        else:
+            self.timestamp_ms += 1
+            result = self.hands.detect_for_video(image, self.timestamp_ms)
+        if not result.hand_landmarks:
+            return []
+        labels = [h[0].category_name for h in result.handedness]
+        return list(zip(result.hand_landmarks, labels))
+
+    def findHands(self, img, draw=False, flipType=True):
+        """Deteksi tangan. Tidak menggambar apa pun (draw diabaikan)."""
+        h, w = img.shape[:2]
+        if self.rgb is None or self.rgb.shape != img.shape:
+            self.rgb = np.empty_like(img)
+        cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=self.rgb)
+
+        detections = self._detect(self.rgb)
+        buffer = self.buffers[self.buffer_index]
+        self.buffer_index = (self.buffer_index + 1) % RESULT_BUFFERS
+
+        scale = np.array([w, h, w], dtype=np.float32)
+        hands = []
+        for i, (landmarks, label) in enumerate(detections[:self.maxHands]):
+            self.scaled[:] = [(lm.x, lm.y, lm.z) for lm in landmarks]
+            np.multiply(self.scaled, scale, out=self.scaled)
+            # Cast ke int32 memotong ke arah nol, sama seperti int() di cvzone
+            buffer[i] = self.scaled
+            if flipType:
+                label = 'Left' if label == 'Right' else 'Right'
+            hands.append(LeanHand(buffer[i].view(LandmarkArray), label))
+        return hands, img
+
+    def close(self):
+        self.hands.close()
+
+
+def create_hand_detector(backend='cvzone', maxHands=2, detectionCon=0.5, minTrackCon=0.5, roi=False,
+                         motion_gate=False, idle_timeout=None, inference_size=None, mirror=False,
+                         predict=None, predict_horizon_ms=0.0):
+    """
+    Buat detector: 'cvzone' (HandDetector bawaan) atau 'lean' (LeanHandDetector).
+    roi=True: deteksi hanya di sekitar tangan terakhir (RoiTrackingDetector, crop dalam mode static image).
+    inference_size=(w, h): deteksi pada frame yang diperkecil (ResizedInferenceDetector).
+    mirror=True: frame tidak di-flip, hanya landmark yang dicerminkan (MirroredDetector).
+    predict='kalman'/'alpha-beta': landmark diekstrapolasi ke waktu aktuasi (PredictiveDetector).
+    motion_gate=True: lewati deteksi jika frame hampir tidak berubah (MotionGatedDetector).
+    idle_timeout=N: mode hemat daya setelah N detik tanpa tangan (IdlePowerSaver).
+    """
+    if backend == 'lean':
+        detector_class = LeanHandDetector
+    else:
+        from cvzone.HandTrackingModule import HandDetector as detector_class
+    detector = detector_class(maxHands=maxHands, detectionCon=detectionCon, minTrackCon=minTrackCon)
+
+    if roi:
+        # Crop ROI dideteksi dalam mode static image: tracker mode video hanya melihat frame penuh
+        from roi_detector import RoiTrackingDetector
+        crop_detector = detector_class(staticMode=True, maxHands=maxHands, detectionCon=detectionCon,
+                                       minTrackCon=minTrackCon)
+        detector = RoiTrackingDetector(detector, crop_detector=crop_detector)
+    if inference_size:
+        from hand_transform import ResizedInferenceDetector
+        detector = ResizedInferenceDetector(detector, inference_size)
+    if mirror:
+        from hand_transform import MirroredDetector
+        detector = MirroredDetector(detector)
+    if predict:
+        from landmark_predictor import PredictiveDetector
+        detector = PredictiveDetector(detector, kind=predict, horizon=predict_horizon_ms / 1000)
+    if motion_gate:
+        from motion_gate import MotionGatedDetector
+        detector = MotionGatedDetector(detector)
+    if idle_timeout is not None:
+        from power_saver import IdlePowerSaver
+        detector = IdlePowerSaver(detector, idle_timeout=idle_timeout)
+    return detector
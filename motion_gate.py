@@ -0,0 +1,119 @@
+"""
+Modul Motion Gate (Lewati Deteksi pada Frame Statis)
+Sebelum detector dijalankan, frame diperkecil ke grayscale resolusi rendah lalu
+dibandingkan dengan frame saat deteksi terakhir. Jika bagian frame yang
+berubah di bawah threshold, hasil landmark sebelumnya dipakai ulang. Deteksi
+tetap dipaksa setiap N frame agar hasil tidak basi, dan setiap frame selama
+gesture kontrol (pinch/klik/scroll/kepal) aktif atau dekat threshold: pinch
+dengan gerak piksel kecil tidak boleh tertunda atau hilang.
+"""
+
+import time
+
+import cv2
+
+from gesture_rules import GestureEvaluator
+from hand_features import HandFeatures
+from hand_transform import draw_landmarks, find_hands
+
+
+# Gesture yang menggerakkan aktuasi; hand_raised (hampir selalu aktif) tidak ikut
+GATED_GESTURES = ('scroll_up', 'scroll_down', 'click', 'right_click', 'toggle_scroll')
+
+
+class MotionGatedDetector:
+    """
+    Bungkus detector (cvzone / lean / ROI).
+    findHands(img) -> (hands, img), sama seperti detector aslinya.
+    """
+
+    uses_timestamp = True  # Timestamp capture diteruskan ke detector di dalamnya
+
+    def __init__(self, detector, size=(64, 48), pixel_threshold=12, motion_threshold=0.01,
+                 refresh_interval=10, gesture_margin=15.0, gestures=GATED_GESTURES):
+        self.detector = detector
+        self.size = size                          # Resolusi frame pembanding (w, h)
+        self.pixel_threshold = pixel_threshold    # Selisih grayscale minimal agar piksel dianggap berubah
+        self.motion_threshold = motion_threshold  # Fraksi piksel berubah minimal agar deteksi dijalankan
+        self.refresh_interval = refresh_interval  # Deteksi paksa tiap N frame
+        self.gesture_margin = gesture_margin      # Jarak ke threshold gesture (px) yang memaksa deteksi
+        self.gestures = gestures
+        self.gesture_evaluator = GestureEvaluator()
+        self.gesture_pending = False  # Hasil terakhir: gesture aktif / dekat threshold
+        self.reference = None
+        self.small = None
+        self.diff = None
+        self.last_hands = []
+        self.frames_since_detect = 0
+        self.last_motion = 0.0
+
+        # Statistik
+        self.detected_frames = 0
+        self.skipped_frames = 0
+        self.forced_frames = 0
+        self.gesture_frames = 0
+        self.detect_time = 0.0
+        self.gate_time = 0.0
+
+    def _motion(self, img):
+        """Fraksi piksel yang berubah dibanding frame deteksi terakhir"""
+        small = cv2.resize(img, self.size, interpolation=cv2.INTER_AREA)
+        self.small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self.small)
+        if self.reference is None:
+            return 1.0
+        self.diff = cv2.absdiff(self.small, self.reference, dst=self.diff)
+        cv2.threshold(self.diff, self.pixel_threshold, 255, cv2.THRESH_BINARY, dst=self.diff)
+        return cv2.countNonZero(self.diff) / float(self.diff.size)
+
+    def findHands(self, img, draw=True, flipType=True, timestamp=None):
+        t0 = time.perf_counter()
+        self.last_motion = self._motion(img)
+        self.gate_time += time.perf_counter() - t0
+
+        forced = self.frames_since_detect >= self.refresh_interval
+        if self.reference is not None and not forced and not self.gesture_pending \
+                and self.last_motion < self.motion_threshold:
+            self.skipped_frames += 1
+            self.frames_since_detect += 1
+            if draw:
+                # Titik landmark hasil lama, agar tampilan tidak berkedip
+                draw_landmarks(img, self.last_hands)
+            return self.last_hands, img
+
+        if forced:
+            self.forced_frames += 1
+        elif self.gesture_pending and self.last_motion < self.motion_threshold:
+            self.gesture_frames += 1
+        t0 = time.perf_counter()
+        hands, img = find_hands(self.detector, img, draw=draw, flipType=flipType, timestamp=timestamp)
+        self.detect_time += time.perf_counter() - t0
+        self.detected_frames += 1
+        self.frames_since_detect = 0
+        self.last_hands = hands
+        # Fitur dihitung tanpa cache di hand: wrapper di luar (mis. IdlePowerSaver) masih bisa mengubah koordinat
+        self.gesture_pending = any(
+            self.gesture_evaluator.near_threshold(HandFeatures(hand['lmList']), self.gestures, self.gesture_margin)
+            for hand in hands if len(hand['lmList']))
+        # Pertukaran buffer: frame kecil ini jadi pembanding berikutnya
+        self.reference, self.small = self.small, self.reference
+        return hands, img
+
+    def get_stats(self):
+        total = self.detected_frames + self.skipped_frames
+        avg_detect_ms = (self.detect_time / self.detected_frames * 1000) if self.detected_frames else 0.0
+        # Perkiraan: frame yang dilewati seharusnya memakan waktu deteksi rata-rata
+        saved_ms = self.skipped_frames * avg_detect_ms - self.gate_time * 1000
+        would_spend_ms = total * avg_detect_ms
+        return {
+            'mode': 'motion',
+            'frames': total,
+            'detected_frames': self.detected_frames,
+            'skipped_frames': self.skipped_frames,
+            'forced_frames': self.forced_frames,
+            'gesture_frames': self.gesture_frames,
+            'skip_ratio': self.skipped_frames / total if total else 0.0,
+            'avg_detect_ms': avg_detect_ms,
+            'avg_gate_ms': (self.gate_time / total * 1000) if total else 0.0,
+            'detect_ms_saved': saved_ms,
+            'detect_cpu_saved_percent': (saved_ms / would_spend_ms * 100) if would_spend_ms > 0 else 0.0
+        }
@@ -0,0 +1,207 @@
+"""
+Modul Backend Aktuasi Mouse
+pynput butuh display server dan pointer sungguhan, sehingga skrip tidak bisa
+dijalankan headless. Semua backend punya antarmuka yang sama dengan pynput
+Controller (position, scroll, click, press, release):
+  - pynput   : kontrol mouse sungguhan
+  - null     : tidak melakukan apa-apa (benchmark murni pipeline)
+  - recorder : mencatat setiap event + timestamp di array ringkas, untuk
+               mengukur laju aktuasi dan timing event tanpa X server
+"""
+
+import time
+from array import array
+from enum import Enum
+
+import numpy as np
+
+from latency_histogram import LatencyHistogram
+
+try:
+    from pynput.mouse import Button
+    PYNPUT_ERROR = None
+except Exception as e:  # ImportError tanpa display server
+    PYNPUT_ERROR = e
+
+    class Button(Enum):
+        """Pengganti pynput.mouse.Button jika pynput tidak bisa dimuat"""
+        unknown = 0
+        left = 1
+        middle = 2
+        right = 3
+
+
+# Kode jenis event untuk RecordingMouse
+EVENT_MOVE = 0
+EVENT_SCROLL = 1
+EVENT_CLICK = 2
+EVENT_PRESS = 3
+EVENT_RELEASE = 4
+EVENT_NAMES = ('move', 'scroll', 'click', 'press', 'release')
+
+BUTTON_CODES = {'left': 1, 'middle': 2, 'right': 3}
+
+
+def button_code(button):
+    return BUTTON_CODES.get(getattr(button, 'name', str(button)), 0)
+
+
+class NullMouse:
+    """Backend tanpa aktuasi: posisi hanya disimpan di memori"""
+
+    name = 'null'
+
+    def __init__(self):
+        self.position = (0, 0)
+
+    def scroll(self, dx, dy):
+        pass
+
+    def click(self, button, count=1):
+        pass
+
+    def press(self, button):
+        pass
+
+    def release(self, button):
+        pass
+
+    def close(self):
+        pass
+
+
+class RecordingMouse:
+    """
+    Backend perekam: setiap event disimpan sebagai (t, jenis, a, b) di
+    array.array (bukan list of dict), sekitar 17 byte per event.
+      move   : a, b = x, y
+      scroll : a, b = dx, dy
+      click  : a, b = kode tombol, jumlah klik
+      press/release : a = kode tombol
+    """
+
+    name = 'recorder'
+
+    def __init__(self, path=None):
+        self.path = path  # Simpan event ke .npz saat close() (opsional)
+        self.times = array('d')
+        self.kinds = array('B')
+        self.a = array('i')
+        self.b = array('i')
+        self._position = (0, 0)
+
+    def _record(self, kind, a=0, b=0):
+        self.times.append(time.perf_counter())
+        self.kinds.append(kind)
+        self.a.append(int(a))
+        self.b.append(int(b))
+
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, value):
+        self._position = (int(value[0]), int(value[1]))
+        self._record(EVENT_MOVE, *self._position)
+
+    def scroll(self, dx, dy):
+        self._record(EVENT_SCROLL, dx, dy)
+
+    def click(self, button, count=1):
+        self._record(EVENT_CLICK, button_code(button), count)
+
+    def press(self, button):
+        self._record(EVENT_PRESS, button_code(button))
+
+    def release(self, button):
+        self._record(EVENT_RELEASE, button_code(button))
+
+    def __len__(self):
+        return len(self.times)
+
+    def get_events(self):
+        """Semua event sebagai array numpy (t relatif ke event pertama, detik)"""
+        times = np.frombuffer(self.times, dtype=np.float64) if self.times else np.zeros(0)
+        return {
+            't': times - times[0] if len(times) else times,
+            'kind': np.frombuffer(self.kinds, dtype=np.uint8) if self.kinds else np.zeros(0, np.uint8),
+            'a': np.frombuffer(self.a, dtype=np.int32) if self.a else np.zeros(0, np.int32),
+            'b': np.frombuffer(self.b, dtype=np.int32) if self.b else np.zeros(0, np.int32)
+        }
+
+    def get_stats(self):
+        """Jumlah event per jenis, laju aktuasi (event/s) dan jarak antar gerak kursor (ms)"""
+        events = self.get_events()
+        duration = float(events['t'][-1]) if len(events['t']) else 0.0
+        stats = {
+            'mode': 'recorder',
+            'events': len(self),
+            'duration_seconds': duration,
+            'rate_per_second': len(self) / duration if duration > 0 else 0.0
+        }
+        for code, name in enumerate(EVENT_NAMES):
+            stats[f'{name}_count'] = int(np.count_nonzero(events['kind'] == code))
+
+        interval = LatencyHistogram()
+        move_times = events['t'][events['kind'] == EVENT_MOVE]
+        for dt in np.diff(move_times) * 1000:
+            interval.record(float(dt))
+        interval_stats = interval.get_stats()
+        stats['move_rate_hz'] = stats['move_count'] / duration if duration > 0 else 0.0
+        stats['move_interval_ms'] = {key: interval_stats[key] for key in ('avg', 'p50', 'p95', 'p99', 'max')}
+        return stats
+
+    def save(self, path):
+        np.savez_compressed(path, **self.get_events())
+
+    def close(self):
+        stats = self.get_stats()
+        print(f"Rekaman mouse: {stats['events']} event, {stats['rate_per_second']:.1f} event/s, "
+              f"gerak {stats['move_rate_hz']:.1f} Hz (p95 jarak {stats['move_interval_ms']['p95']:.1f} ms)")
+        if self.path and len(self):
+            self.save(self.path)
+            print(f"✓ Event mouse disimpan: {self.path} ({len(self)} event)")
+
+
+def load_events(path):
+    """Baca file event hasil RecordingMouse.save()"""
+    with np.load(path) as data:
+        return {key: data[key] for key in ('t', 'kind', 'a', 'b')}
+
+
+MOUSE_BACKENDS = ('pynput', 'null', 'recorder')
+
+DEFAULT_SCREEN_SIZE = (1920, 1080)
+
+
+def get_screen_size(backend='pynput', default=DEFAULT_SCREEN_SIZE):
+    """
+    Resolusi layar untuk memetakan kursor. Monitor hanya ditanyakan ke display
+    server untuk backend pynput; backend null/recorder (tanpa X server) memakai
+    default (--screen-size). Jika screeninfo gagal, default juga dipakai.
+    """
+    if backend != 'pynput':
+        return default
+    try:
+        import screeninfo
+        screen = screeninfo.get_monitors()[0]
+        return screen.width, screen.height
+    except Exception as e:  # ScreenInfoError tanpa display server
+        print(f"⚠️  Resolusi layar tidak terbaca ({e}); memakai {default[0]}x{default[1]}")
+        return default
+
+
+def create_mouse(backend='pynput', events_path=None):
+    """Buat backend mouse dari nama: pynput, null, recorder"""
+    if backend == 'pynput':
+        if PYNPUT_ERROR is not None:
+            raise RuntimeError(f"pynput tidak bisa dimuat ({PYNPUT_ERROR}); "
+                               f"gunakan --mouse null atau --mouse recorder")
+        from pynput.mouse import Controller
+        return Controller()
+    if backend == 'null':
+        return NullMouse()
+    if backend == 'recorder':
+        return RecordingMouse(events_path)
+    raise ValueError(f"Backend mouse tidak dikenal: {backend} (pilihan: {', '.join(MOUSE_BACKENDS)})")
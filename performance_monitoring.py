@@ -3,43 +3,78 @@ Script Monitoring Performa Sistem Virtual Mouse
 Mengukur FPS, CPU Usage, Memory Usage, dan Response Time
 """
 
-from cvzone.HandTrackingModule import HandDetector
 import cv2
-import math
-from pynput.mouse import Button, Controller
-import screeninfo
+from frame_source import parse_source_args
+from hand_features import INDEX_TIP
 import time
-import psutil
+from system_sampler import SystemMetricsSampler
+from latency_histogram import LatencyHistogram, StageLatencyRecorder
+from streaming_stats import RunningStats
+from tracking_engine import TrackingEngine
 import json
 from datetime import datetime
 
-# Inisialisasi mouse controller
-mouse = Controller()
+# Source, detector, filter kursor, mouse, dan window preview dari tracking engine
+# --source 0 (kamera) | video.mp4 | rekaman.jsonl, --pace realtime|fast
+# (--headless: tanpa window dan tanpa gambar, throughput pipeline murni)
+source_args = parse_source_args()
+engine = TrackingEngine(source_args, "Performance Monitoring", max_hands=1, cursor_landmark=INDEX_TIP,
+                        exit_gesture=False, gesture_cooldown=0.5, topmost=False)
 
-# Mendapatkan informasi resolusi layar
-screen = screeninfo.get_monitors()[0]
-screen_width, screen_height = screen.width, screen.height
-
-# Inisialisasi kamera
-cap = cv2.VideoCapture(0)
-
-# Inisialisasi hand detector
-detector = HandDetector(detectionCon=0.3, maxHands=1)
-
-# Variabel untuk menyimpan status scroll aktif/nonaktif
-scroll_active = True
+# Periode sampling CPU/Memory di background (detik)
+SAMPLE_PERIOD = 1.0
 
 # ============= PERFORMANCE MONITORING =============
 class PerformanceMonitor:
-    def __init__(self):
+    def __init__(self, sample_period=1.0):
         self.start_time = time.time()
         self.frame_count = 0
-        self.fps_list = []
-        self.cpu_list = []
-        self.memory_list = []
-        self.response_times = []
+        # Statistik streaming (memori tetap), reservoir untuk plotting
+        self.fps_stats = RunningStats(quantiles=(5, 50), reservoir_size=300)
+        self.cpu_stats = RunningStats(quantiles=(50, 95), reservoir_size=300)
+        self.memory_stats = RunningStats(reservoir_size=300)
+        self.response_times = LatencyHistogram()  # dalam ms
+        self.stage_latency = StageLatencyRecorder()  # capture/detect/gesture/actuation/render
         self.last_fps_time = time.time()
         self.current_fps = 0
+        self.capture = None  # Sumber frame (opsional) untuk counter drop/overrun
+        self.detector = None  # Detector (opsional) untuk statistik ROI / motion gate / idle
+        self.mouse = None  # Mouse asinkron (opsional) untuk statistik antrian aktuasi
+        self.preview = None  # Preview (opsional) untuk statistik thread renderer
+        
+        # CPU/Memory diambil di thread background, main loop hanya membaca sampel terakhir
+        self.sampler = SystemMetricsSampler(period=sample_period).start()
+        self.last_sample_count = 0
+        self.latest_sample = None
+        self.core_sums = []
+        self.core_sample_count = 0
+        
+    def attach_capture(self, capture):
+        """Hubungkan capture agar counter drop/overrun ikut dilaporkan"""
+        self.capture = capture
+        
+    def attach_detector(self, detector):
+        """Hubungkan detector agar statistik deteksi (ROI, motion gate, idle) ikut dilaporkan"""
+        self.detector = detector
+        
+    def attach_mouse(self, mouse):
+        """Hubungkan mouse agar kedalaman antrian dan latency aktuasi ikut dilaporkan"""
+        self.mouse = mouse
+        
+    def attach_preview(self, preview):
+        """Hubungkan preview agar frame yang ditampilkan/dilewati renderer ikut dilaporkan"""
+        self.preview = preview
+        
+    def get_detector_stats(self):
+        """Statistik semua wrapper detector yang punya get_stats(), per mode"""
+        result = {}
+        detector = self.detector
+        while detector is not None:
+            if hasattr(detector, 'get_stats'):
+                detector_stats = detector.get_stats()
+                result[detector_stats['mode']] = detector_stats
+            detector = getattr(detector, 'detector', None)
+        return result or None
         
     def update_frame(self):
         """Update hitungan frame"""
@@ -49,27 +84,47 @@ class PerformanceMonitor:
         # Hitung FPS setiap detik
         if current_time - self.last_fps_time >= 1.0:
             self.current_fps = self.frame_count / (current_time - self.last_fps_time)
-            self.fps_list.append(self.current_fps)
-            
-            # Catat CPU dan Memory
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            memory_percent = psutil.virtual_memory().percent
-            memory_mb = psutil.Process().memory_info().rss / 1024 / 1024
-            
-            self.cpu_list.append(cpu_percent)
-            self.memory_list.append(memory_mb)
+            self.fps_stats.add(self.current_fps)
             
             # Reset counter
             self.frame_count = 0
             self.last_fps_time = current_time
             
+            # Catat CPU dan Memory dari sampel terakhir (tanpa blocking)
+            self.collect_system_sample()
+            
             # Tampilkan di terminal
-            print(f"\rFPS: {self.current_fps:.1f} | CPU: {cpu_percent:.1f}% | "
-                  f"Memory: {memory_mb:.1f}MB ({memory_percent:.1f}%)", end='')
+            if self.latest_sample:
+                print(f"\rFPS: {self.current_fps:.1f} | CPU: {self.latest_sample['cpu_percent']:.1f}% | "
+                      f"Memory: {self.latest_sample['memory_mb']:.1f}MB "
+                      f"({self.latest_sample['memory_percent']:.1f}%)", end='')
+    
+    def collect_system_sample(self):
+        """Ambil sampel baru dari sampler background jika ada"""
+        sample = self.sampler.latest()
+        if sample is None or self.sampler.samples_taken == self.last_sample_count:
+            return
+        self.last_sample_count = self.sampler.samples_taken
+        self.latest_sample = sample
+        
+        self.cpu_stats.add(sample['cpu_percent'])
+        self.memory_stats.add(sample['memory_mb'])
+        
+        # Akumulasi CPU per core
+        if len(self.core_sums) != len(sample['cpu_per_core']):
+            self.core_sums = [0.0] * len(sample['cpu_per_core'])
+            self.core_sample_count = 0
+        for i, value in enumerate(sample['cpu_per_core']):
+            self.core_sums[i] += value
+        self.core_sample_count += 1
+    
+    def stop(self):
+        """Hentikan sampler background"""
+        self.sampler.stop()
     
     def add_response_time(self, response_time):
-        """Tambah waktu response"""
-        self.response_times.append(response_time)
+        """Tambah waktu response (detik)"""
+        self.response_times.record(response_time * 1000)
     
     def get_statistics(self):
         """Dapatkan statistik performa"""
@@ -78,29 +133,43 @@ class PerformanceMonitor:
         stats = {
             'duration_seconds': duration,
             'duration_minutes': duration / 60,
-            'fps': {
-                'average': sum(self.fps_list) / len(self.fps_list) if self.fps_list else 0,
-                'min': min(self.fps_list) if self.fps_list else 0,
-                'max': max(self.fps_list) if self.fps_list else 0
-            },
-            'cpu': {
-                'average': sum(self.cpu_list) / len(self.cpu_list) if self.cpu_list else 0,
-                'min': min(self.cpu_list) if self.cpu_list else 0,
-                'max': max(self.cpu_list) if self.cpu_list else 0
-            },
-            'memory_mb': {
-                'average': sum(self.memory_list) / len(self.memory_list) if self.memory_list else 0,
-                'min': min(self.memory_list) if self.memory_list else 0,
-                'max': max(self.memory_list) if self.memory_list else 0
-            },
-            'response_time_ms': {
-                'average': (sum(self.response_times) / len(self.response_times) * 1000) 
-                          if self.response_times else 0,
-                'min': min(self.response_times) * 1000 if self.response_times else 0,
-                'max': max(self.response_times) * 1000 if self.response_times else 0
-            }
+            'fps': self.fps_stats.get_stats(),
+            'cpu': self.cpu_stats.get_stats(),
+            'memory_mb': self.memory_stats.get_stats(),
+            'response_time_ms': self.get_response_time_stats(),
+            'latency_per_tahap_ms': self.stage_latency.get_report()
         }
         
+        stats['cpu_per_core'] = [total / self.core_sample_count for total in self.core_sums] \
+            if self.core_sample_count else []
+        stats['cpu_per_thread'] = self.sampler.get_thread_breakdown()
+        
+        if self.capture is not None:
+            stats['capture'] = self.capture.get_stats()
+        
+        detector_stats = self.get_detector_stats()
+        if detector_stats is not None:
+            stats['detector'] = detector_stats
+        
+        if self.mouse is not None and hasattr(self.mouse, 'get_stats'):
+            stats['actuation'] = self.mouse.get_stats()
+        
+        if self.preview is not None:
+            stats['preview'] = self.preview.get_stats()
+        
+        return stats
+    
+    def get_response_time_stats(self):
+        """Statistik response time dalam ms (average, min, max, p50-p99.9)"""
+        hist_stats = self.response_times.get_stats()
+        stats = {
+            'average': hist_stats['avg'],
+            'min': hist_stats['min'],
+            'max': hist_stats['max'],
+            'count': hist_stats['count']
+        }
+        for name in ('p50', 'p95', 'p99', 'p99_9'):
+            stats[name] = hist_stats[name]
         return stats
     
     def display_statistics(self):
@@ -119,6 +188,7 @@ class PerformanceMonitor:
         print(f"  Rata-rata : {stats['fps']['average']:.2f} fps")
         print(f"  Minimum   : {stats['fps']['min']:.2f} fps")
         print(f"  Maximum   : {stats['fps']['max']:.2f} fps")
+        print(f"  Std / p5  : {stats['fps']['std']:.2f} / {stats['fps']['p5']:.2f} fps")
         print(f"  Status    : {'✓ BAIK (>20fps)' if stats['fps']['average'] > 20 else '✗ KURANG'}")
         
         print("\n" + "-"*80)
@@ -127,7 +197,14 @@ class PerformanceMonitor:
         print(f"  Rata-rata : {stats['cpu']['average']:.2f}%")
         print(f"  Minimum   : {stats['cpu']['min']:.2f}%")
         print(f"  Maximum   : {stats['cpu']['max']:.2f}%")
+        print(f"  p50 / p95 : {stats['cpu']['p50']:.2f} / {stats['cpu']['p95']:.2f}%")
         print(f"  Status    : {'✓ BAIK (<50%)' if stats['cpu']['average'] < 50 else '✗ TINGGI'}")
+        if stats['cpu_per_core']:
+            print("  Per Core  : " + " | ".join(f"C{i}: {v:.1f}%" for i, v in enumerate(stats['cpu_per_core'])))
+        if stats['cpu_per_thread']:
+            print("  Per Thread:")
+            for name, value in stats['cpu_per_thread'].items():
+                print(f"    - {name:<24}: {value:.2f}%")
         
         print("\n" + "-"*80)
         print("MEMORY USAGE")
@@ -143,8 +220,118 @@ class PerformanceMonitor:
         print(f"  Rata-rata : {stats['response_time_ms']['average']:.2f} ms")
         print(f"  Minimum   : {stats['response_time_ms']['min']:.2f} ms")
         print(f"  Maximum   : {stats['response_time_ms']['max']:.2f} ms")
+        print(f"  p95 / p99 : {stats['response_time_ms']['p95']:.2f} / {stats['response_time_ms']['p99']:.2f} ms")
         print(f"  Status    : {'✓ BAIK (<100ms)' if stats['response_time_ms']['average'] < 100 else '✗ LAMBAT'}")
         
+        print("\n" + "-"*80)
+        print("LATENCY PER TAHAP")
+        print("-"*80)
+        for line in self.stage_latency.format_table():
+            print("  " + line)
+        
+        if 'capture' in stats:
+            capture = stats['capture']
+            print("\n" + "-"*80)
+            print(f"SUMBER FRAME ({capture['source'].upper()})")
+            print("-"*80)
+            print(f"  Frame Dibaca    : {capture['frames_read']} ({capture['fps']:.2f} fps)")
+            if 'camera_mode' in capture:
+                mode = capture['camera_mode']
+                print(f"  Mode Kamera     : {mode['fourcc'] or '?'} {mode['width']}x{mode['height']} @ {mode['fps']:.0f} fps")
+            if 'resize' in stats.get('detector', {}):
+                resize = stats['detector']['resize']
+                print(f"  Res. Inference  : {resize['inference_size'][0]}x{resize['inference_size'][1]} "
+                      f"(resize {resize['avg_resize_ms']:.2f} ms, deteksi {resize['avg_detect_ms']:.2f} ms)")
+            if 'frames_captured' in capture:
+                print(f"  Frame Ditangkap : {capture['frames_captured']}")
+                print(f"  Frame Dibuang   : {capture['frames_dropped']}")
+                print(f"  Buffer Overrun  : {capture['overruns']}")
+        
+        if 'roi' in stats.get('detector', {}):
+            roi = stats['detector']['roi']
+            print("\n" + "-"*80)
+            print("DETEKSI TANGAN (ROI)")
+            print("-"*80)
+            print(f"  Frame ROI       : {roi['roi_frames']} ({roi['roi_ratio']*100:.1f}% frame)")
+            print(f"  Frame Penuh     : {roi['full_frames']} (fallback: {roi['fallbacks']})")
+            print(f"  Luas ROI        : {roi['avg_roi_area_percent']:.1f}% frame")
+            print(f"  Waktu Deteksi   : ROI {roi['avg_roi_ms']:.2f} ms | Penuh {roi['avg_full_ms']:.2f} ms")
+        
+        if 'motion' in stats.get('detector', {}):
+            motion = stats['detector']['motion']
+            print("\n" + "-"*80)
+            print("MOTION GATE")
+            print("-"*80)
+            print(f"  Frame Dilewati  : {motion['skipped_frames']} dari {motion['frames']} ({motion['skip_ratio']*100:.1f}%)")
+            print(f"  Deteksi Paksa   : {motion['forced_frames']} berkala, {motion.get('gesture_frames', 0)} karena gesture")
+            print(f"  Waktu           : deteksi {motion['avg_detect_ms']:.2f} ms | gate {motion['avg_gate_ms']:.3f} ms")
+            print(f"  CPU Dihemat     : ~{motion['detect_ms_saved']/1000:.1f} s ({motion['detect_cpu_saved_percent']:.1f}% waktu deteksi)")
+        
+        if 'power' in stats.get('detector', {}):
+            power = stats['detector']['power']
+            print("\n" + "-"*80)
+            print(f"MODE HEMAT DAYA (idle setelah {power['idle_timeout']:.0f} s: {power['idle_fps']:.0f} fps, "
+                  f"deteksi diperkecil {power['idle_scale'] * 100:.0f}%, resolusi kamera tetap)")
+            print("-"*80)
+            print(f"  Mode Sekarang   : {power['state']}")
+            print(f"  Waktu Aktif     : {power['time_active_seconds']:.1f} s ({power['frames_active']} frame)")
+            print(f"  Waktu Idle      : {power['time_idle_seconds']:.1f} s ({power['frames_idle']} frame, {power['idle_percent']:.1f}%)")
+            print(f"  Transisi        : {power['transitions']}")
+        
+        if stats.get('actuation', {}).get('mode') == 'async':
+            act = stats['actuation']
+            print("\n" + "-"*80)
+            print("AKTUASI MOUSE (THREAD TERPISAH)")
+            print("-"*80)
+            print(f"  Perintah        : {act['submitted']} masuk, {act['executed']} dijalankan "
+                  f"(gerak digabung {act['coalesced_moves']}, scroll digabung {act['merged_scrolls']})")
+            print(f"  Antrian         : rata-rata {act['avg_queue_depth']:.2f} | maks {act['max_queue_depth']}")
+            print(f"  Gerak Dilewati  : {act['skipped_noop']} sama, {act['skipped_small']} < {act['min_move_px']:.1f} px "
+                  f"({act['calls_avoided']} panggilan sistem dihindari)")
+            print(f"  Latency Panggil : avg {act['avg_call_ms']:.2f} ms | p95 {act['p95_call_ms']:.2f} ms | maks {act['max_call_ms']:.2f} ms")
+            print(f"  Waktu Tunggu    : avg {act['avg_wait_ms']:.2f} ms | p95 {act['p95_wait_ms']:.2f} ms")
+            if 'recorder' in act:
+                rec = act['recorder']
+                print(f"  Backend Recorder: {rec['events']} event ({rec['rate_per_second']:.1f}/s), "
+                      f"gerak {rec['move_rate_hz']:.1f} Hz, p95 jarak {rec['move_interval_ms']['p95']:.1f} ms")
+        
+        elif stats.get('actuation', {}).get('mode') == 'sync' and 'calls_avoided' in stats['actuation']:
+            act = stats['actuation']
+            print("\n" + "-"*80)
+            print("AKTUASI MOUSE (SINKRON, --sync-mouse)")
+            print("-"*80)
+            print(f"  Perintah        : {act['submitted']} masuk, {act['executed']} panggilan sistem")
+            print(f"  Gerak Dilewati  : {act['skipped_noop']} sama, {act['skipped_small']} < {act['min_move_px']:.1f} px "
+                  f"({act['calls_avoided']} panggilan sistem dihindari)")
+        
+        if 'interpolation' in stats.get('actuation', {}):
+            interp = stats['actuation']['interpolation']
+            print("\n" + "-"*80)
+            print(f"INTERPOLASI KURSOR ({interp['rate_hz']:.0f} Hz)")
+            print("-"*80)
+            print(f"  Target / Langkah: {interp['targets']} / {interp['steps']} ({interp['steps_per_target']:.1f} langkah per frame)")
+            print(f"  Durasi Segmen   : {interp['avg_segment_ms']:.1f} ms")
+            print(f"  CPU Worker      : {interp['worker_cpu_ms']/1000:.2f} s ({interp['worker_cpu_percent']:.2f}%)")
+        
+        if stats.get('preview', {}).get('mode') == 'thread':
+            prev = stats['preview']
+            print("\n" + "-"*80)
+            print(f"PREVIEW (THREAD COMPOSITOR, MAKS {prev['target_fps']:.0f} FPS)")
+            print("-"*80)
+            print(f"  Frame           : {prev['frames_submitted']} dikirim, {prev['frames_rendered']} ditampilkan, "
+                  f"{prev['frames_skipped']} dilewati")
+            print(f"  FPS Preview     : {prev['render_fps']:.1f} | gambar overlay avg {prev['avg_render_ms']:.2f} ms")
+            print(f"  UI Main Loop    : avg {prev['ui_main_avg_ms']:.3f} ms | p95 {prev['ui_main_p95_ms']:.3f} ms per frame "
+                  f"({prev.get('ui_thread_ms_per_frame', 0.0):.2f} ms/frame dipindah ke thread compositor)")
+            print(f"  Event Window    : {prev['key_polls']} baca tombol ({prev['key_hz']:.0f} Hz), "
+                  f"{prev['property_calls']} set properti")
+        elif stats.get('preview', {}).get('mode') == 'inline':
+            prev = stats['preview']
+            print("\n" + "-"*80)
+            print("PREVIEW (DI MAIN LOOP)")
+            print("-"*80)
+            print(f"  UI Main Loop    : avg {prev['ui_main_avg_ms']:.3f} ms | p95 {prev['ui_main_p95_ms']:.3f} ms per frame")
+        
         print("\n" + "="*80 + "\n")
     
     def save_report(self, filename='laporan_performa.json'):
@@ -158,9 +345,26 @@ class PerformanceMonitor:
             'fps': stats['fps'],
             'cpu_usage': stats['cpu'],
             'memory_usage_mb': stats['memory_mb'],
-            'response_time_ms': stats['response_time_ms']
+            'response_time_ms': stats['response_time_ms'],
+            'latency_per_tahap_ms': stats['latency_per_tahap_ms'],
+            'cpu_per_core': stats['cpu_per_core'],
+            'cpu_per_thread': stats['cpu_per_thread'],
+            'sampel_plot': {
+                'fps': self.fps_stats.sample(),
+                'cpu': self.cpu_stats.sample(),
+                'memory_mb': self.memory_stats.sample()
+            }
         }
         
+        if 'capture' in stats:
+            report['capture'] = stats['capture']
+        if 'detector' in stats:
+            report['detector'] = stats['detector']
+        if 'actuation' in stats:
+            report['aktuasi'] = stats['actuation']
+        if 'preview' in stats:
+            report['preview'] = stats['preview']
+        
         with open(filename, 'w') as f:
             json.dump(report, f, indent=4)
         
@@ -186,6 +390,7 @@ class PerformanceMonitor:
             f.write(f"   Rata-rata: {stats['fps']['average']:.2f} fps\n")
             f.write(f"   Minimum  : {stats['fps']['min']:.2f} fps\n")
             f.write(f"   Maximum  : {stats['fps']['max']:.2f} fps\n")
+            f.write(f"   Std / p5 : {stats['fps']['std']:.2f} / {stats['fps']['p5']:.2f} fps\n")
             f.write(f"   Target   : >20 fps\n")
             f.write(f"   Status   : {'✓ Tercapai' if stats['fps']['average'] > 20 else '✗ Tidak Tercapai'}\n\n")
             
@@ -194,8 +399,16 @@ class PerformanceMonitor:
             f.write(f"   Rata-rata: {stats['cpu']['average']:.2f}%\n")
             f.write(f"   Minimum  : {stats['cpu']['min']:.2f}%\n")
             f.write(f"   Maximum  : {stats['cpu']['max']:.2f}%\n")
+            f.write(f"   p50/p95  : {stats['cpu']['p50']:.2f} / {stats['cpu']['p95']:.2f}%\n")
             f.write(f"   Target   : <50%\n")
-            f.write(f"   Status   : {'✓ Tercapai' if stats['cpu']['average'] < 50 else '✗ Tidak Tercapai'}\n\n")
+            f.write(f"   Status   : {'✓ Tercapai' if stats['cpu']['average'] < 50 else '✗ Tidak Tercapai'}\n")
+            for i, value in enumerate(stats['cpu_per_core']):
+                f.write(f"   Core {i:<6}: {value:.2f}%\n")
+            if stats['cpu_per_thread']:
+                f.write("   Per Thread:\n")
+                for name, value in stats['cpu_per_thread'].items():
+                    f.write(f"     - {name:<24}: {value:.2f}%\n")
+            f.write("\n")
             
             # Memory
             f.write("3. MEMORY USAGE\n")
@@ -210,9 +423,122 @@ class PerformanceMonitor:
             f.write(f"   Rata-rata: {stats['response_time_ms']['average']:.2f} ms\n")
             f.write(f"   Minimum  : {stats['response_time_ms']['min']:.2f} ms\n")
             f.write(f"   Maximum  : {stats['response_time_ms']['max']:.2f} ms\n")
+            f.write(f"   p50/p95  : {stats['response_time_ms']['p50']:.2f} / {stats['response_time_ms']['p95']:.2f} ms\n")
+            f.write(f"   p99/p99.9: {stats['response_time_ms']['p99']:.2f} / {stats['response_time_ms']['p99_9']:.2f} ms\n")
             f.write(f"   Target   : <100 ms\n")
             f.write(f"   Status   : {'✓ Tercapai' if stats['response_time_ms']['average'] < 100 else '✗ Tidak Tercapai'}\n\n")
             
+            # Capture
+            if 'capture' in stats:
+                capture = stats['capture']
+                f.write(f"5. SUMBER FRAME ({capture['source'].upper()})\n")
+                f.write(f"   Frame Dibaca   : {capture['frames_read']} ({capture['fps']:.2f} fps)\n")
+                if 'camera_mode' in capture:
+                    mode = capture['camera_mode']
+                    f.write(f"   Mode Kamera    : {mode['fourcc'] or '?'} {mode['width']}x{mode['height']} @ {mode['fps']:.0f} fps\n")
+                if 'resize' in stats.get('detector', {}):
+                    resize = stats['detector']['resize']
+                    f.write(f"   Res. Inference : {resize['inference_size'][0]}x{resize['inference_size'][1]} "
+                            f"(resize {resize['avg_resize_ms']:.2f} ms, deteksi {resize['avg_detect_ms']:.2f} ms)\n")
+                if 'frames_captured' in capture:
+                    f.write(f"   Frame Ditangkap: {capture['frames_captured']}\n")
+                    f.write(f"   Frame Dibuang  : {capture['frames_dropped']}\n")
+                    f.write(f"   Buffer Overrun : {capture['overruns']}\n")
+                f.write("\n")
+            
+            # Deteksi ROI
+            if 'roi' in stats.get('detector', {}):
+                roi = stats['detector']['roi']
+                f.write("6. DETEKSI TANGAN (ROI)\n")
+                f.write(f"   Frame ROI      : {roi['roi_frames']} ({roi['roi_ratio']*100:.1f}% frame)\n")
+                f.write(f"   Frame Penuh    : {roi['full_frames']} (fallback: {roi['fallbacks']})\n")
+                f.write(f"   Luas ROI       : {roi['avg_roi_area_percent']:.1f}% frame\n")
+                f.write(f"   Waktu ROI      : {roi['avg_roi_ms']:.2f} ms\n")
+                f.write(f"   Waktu Penuh    : {roi['avg_full_ms']:.2f} ms\n\n")
+            
+            # Motion gate
+            if 'motion' in stats.get('detector', {}):
+                motion = stats['detector']['motion']
+                f.write("7. MOTION GATE\n")
+                f.write(f"   Frame Dilewati : {motion['skipped_frames']} dari {motion['frames']} ({motion['skip_ratio']*100:.1f}%)\n")
+                f.write(f"   Deteksi Paksa  : {motion['forced_frames']} berkala, {motion.get('gesture_frames', 0)} karena gesture\n")
+                f.write(f"   Waktu Deteksi  : {motion['avg_detect_ms']:.2f} ms\n")
+                f.write(f"   Waktu Gate     : {motion['avg_gate_ms']:.3f} ms\n")
+                f.write(f"   CPU Dihemat    : ~{motion['detect_ms_saved']/1000:.1f} s ({motion['detect_cpu_saved_percent']:.1f}% waktu deteksi)\n\n")
+            
+            # Mode hemat daya
+            if 'power' in stats.get('detector', {}):
+                power = stats['detector']['power']
+                f.write(f"8. MODE HEMAT DAYA (idle setelah {power['idle_timeout']:.0f} s: {power['idle_fps']:.0f} fps, "
+                        f"deteksi diperkecil {power['idle_scale'] * 100:.0f}%, resolusi kamera tetap)\n")
+                f.write(f"   Waktu Aktif    : {power['time_active_seconds']:.1f} s ({power['frames_active']} frame)\n")
+                f.write(f"   Waktu Idle     : {power['time_idle_seconds']:.1f} s ({power['frames_idle']} frame, {power['idle_percent']:.1f}%)\n")
+                f.write(f"   Transisi       : {power['transitions']}\n")
+                for entry in power['transition_log']:
+                    f.write(f"     {entry['detik']:>8.2f} s -> {entry['mode']}\n")
+                f.write("\n")
+            
+            # Aktuasi asinkron
+            if stats.get('actuation', {}).get('mode') == 'async':
+                act = stats['actuation']
+                f.write("9. AKTUASI MOUSE (THREAD TERPISAH)\n")
+                f.write(f"   Perintah Masuk : {act['submitted']}\n")
+                f.write(f"   Dijalankan     : {act['executed']} (gagal: {act['errors']})\n")
+                f.write(f"   Gerak Digabung : {act['coalesced_moves']}\n")
+                f.write(f"   Scroll Digabung: {act['merged_scrolls']}\n")
+                f.write(f"   Gerak Dilewati : {act['skipped_noop']} posisi sama, {act['skipped_small']} < {act['min_move_px']:.1f} px\n")
+                f.write(f"   Dihindari      : {act['calls_avoided']} panggilan sistem\n")
+                f.write(f"   Antrian        : rata-rata {act['avg_queue_depth']:.2f}, maks {act['max_queue_depth']}\n")
+                f.write(f"   Latency Panggil: avg {act['avg_call_ms']:.2f} ms, p95 {act['p95_call_ms']:.2f} ms, maks {act['max_call_ms']:.2f} ms\n")
+                f.write(f"   Waktu Tunggu   : avg {act['avg_wait_ms']:.2f} ms, p95 {act['p95_wait_ms']:.2f} ms\n")
+                f.write(f"   Backend        : {act['backend']}\n")
+                if 'recorder' in act:
+                    rec = act['recorder']
+                    f.write(f"   Event Direkam  : {rec['events']} ({rec['rate_per_second']:.1f}/s; gerak {rec['move_count']}, "
+                            f"scroll {rec['scroll_count']}, klik {rec['click_count']})\n")
+                    f.write(f"   Jarak Gerak    : avg {rec['move_interval_ms']['avg']:.2f} ms, p95 {rec['move_interval_ms']['p95']:.2f} ms "
+                            f"({rec['move_rate_hz']:.1f} Hz)\n")
+                f.write("\n")
+            elif stats.get('actuation', {}).get('mode') == 'sync' and 'calls_avoided' in stats['actuation']:
+                act = stats['actuation']
+                f.write("9. AKTUASI MOUSE (SINKRON, --sync-mouse)\n")
+                f.write(f"   Perintah Masuk : {act['submitted']}\n")
+                f.write(f"   Dijalankan     : {act['executed']}\n")
+                f.write(f"   Gerak Dilewati : {act['skipped_noop']} posisi sama, {act['skipped_small']} < {act['min_move_px']:.1f} px\n")
+                f.write(f"   Dihindari      : {act['calls_avoided']} panggilan sistem\n")
+                f.write(f"   Backend        : {act['backend']}\n\n")
+            
+            # Interpolasi kursor
+            if 'interpolation' in stats.get('actuation', {}):
+                interp = stats['actuation']['interpolation']
+                f.write(f"10. INTERPOLASI KURSOR ({interp['rate_hz']:.0f} Hz)\n")
+                f.write(f"   Target (frame) : {interp['targets']}\n")
+                f.write(f"   Langkah Dikirim: {interp['steps']} ({interp['steps_per_target']:.1f} per frame)\n")
+                f.write(f"   Durasi Segmen  : {interp['avg_segment_ms']:.1f} ms\n")
+                f.write(f"   CPU Worker     : {interp['worker_cpu_ms']/1000:.2f} s ({interp['worker_cpu_percent']:.2f}%)\n\n")
+            
+            # Preview
+            if stats.get('preview', {}).get('mode') == 'thread':
+                prev = stats['preview']
+                f.write(f"11. PREVIEW (THREAD COMPOSITOR, MAKS {prev['target_fps']:.0f} FPS)\n")
+                f.write(f"   Frame Dikirim  : {prev['frames_submitted']}\n")
+                f.write(f"   Ditampilkan    : {prev['frames_rendered']} ({prev['render_fps']:.1f} FPS)\n")
+                f.write(f"   Dilewati       : {prev['frames_skipped']}\n")
+                f.write(f"   Gambar overlay : avg {prev['avg_render_ms']:.2f} ms\n")
+                f.write(f"   UI Main Loop   : avg {prev['ui_main_avg_ms']:.3f} ms, p95 {prev['ui_main_p95_ms']:.3f} ms per frame\n")
+                f.write(f"   Dipindah       : {prev.get('ui_thread_ms_per_frame', 0.0):.2f} ms/frame ke thread compositor\n")
+                f.write(f"   Event Window   : {prev['key_polls']} baca tombol ({prev['key_hz']:.0f} Hz), "
+                        f"{prev['property_calls']} set properti\n\n")
+            elif stats.get('preview', {}).get('mode') == 'inline':
+                prev = stats['preview']
+                f.write("11. PREVIEW (DI MAIN LOOP)\n")
+                f.write(f"   UI Main Loop   : avg {prev['ui_main_avg_ms']:.3f} ms, p95 {prev['ui_main_p95_ms']:.3f} ms per frame\n\n")
+            
+            # Latency per tahap
+            f.write("LATENCY PER TAHAP:\n")
+            for line in self.stage_latency.format_table():
+                f.write("   " + line + "\n")
+            
             # Tabel untuk skripsi
             f.write("\n" + "="*80 + "\n")
             f.write("TABEL UNTUK SKRIPSI:\n")
@@ -237,14 +563,14 @@ class PerformanceMonitor:
         print(f"✓ Laporan text disimpan: {filename}")
 
 # Inisialisasi performance monitor
-perf_monitor = PerformanceMonitor()
+perf_monitor = PerformanceMonitor(sample_period=SAMPLE_PERIOD)
+perf_monitor.attach_capture(engine.cap)
+perf_monitor.attach_detector(engine.detector)
 
-# Variabel untuk tracking gesture
-last_gesture_time = time.time()
-gesture_cooldown = 0.5
-previous_scroll_state = None
-previous_click_state = False
-previous_fist_state = False
+# Latency setiap tahap (termasuk setiap panggilan mouse -> 'actuation') dicatat ke monitor
+engine.set_stage_latency(perf_monitor.stage_latency)
+perf_monitor.attach_mouse(engine.mouse)
+perf_monitor.attach_preview(engine.preview)
 
 print("\n" + "="*80)
 print("MONITORING PERFORMA SISTEM VIRTUAL MOUSE".center(80))
@@ -255,109 +581,27 @@ print("  • Monitor akan berjalan otomatis")
 print("  • Tekan [Q] untuk berhenti dan lihat hasil")
 print("="*80 + "\n")
 
-while True:
-    success, img = cap.read()
-    if not success:
-        break
-
-    # Flip gambar
-    img = cv2.flip(img, 1)
-
-    # Deteksi tangan
-    gesture_start_time = time.time()
-    hands, img = detector.findHands(img)
-    
-    current_time = time.time()
-    
-    if hands:
-        hand = hands[0]
-        lmList = hand["lmList"]
-        if lmList:
-            # Koordinat jari
-            x1, y1 = lmList[4][0], lmList[4][1]  # Jempol
-            x2, y2 = lmList[8][0], lmList[8][1]  # Telunjuk
-            x5, y5 = lmList[20][0], lmList[20][1]  # Kelingking
-
-            # Hitung jarak
-            length = math.hypot(x2 - x1, y2 - y1)
-            distance_thumb_pinky = math.hypot(x5 - x1, y5 - y1)
-
-            # Gambar
-            cv2.circle(img, (x1, y1), 5, (255, 0, 255), cv2.FILLED)
-            cv2.circle(img, (x2, y2), 5, (255, 0, 255), cv2.FILLED)
-            cv2.circle(img, (x5, y5), 5, (255, 0, 255), cv2.FILLED)
-            cv2.line(img, (x1, y1), (x2, y2), (255, 0, 255), 3)
-            cv2.line(img, (x1, y1), (x5, y5), (255, 0, 255), 3)
-
-            # Gerakkan mouse
-            screen_x = int(x2 * screen_width / img.shape[1])
-            screen_y = int(y2 * screen_height / img.shape[0])
-            mouse.position = (screen_x, screen_y)
-
-            # Deteksi kepal
-            is_fist = all(math.hypot(lmList[i][0] - lmList[0][0], 
-                                    lmList[i][1] - lmList[0][1]) < 40 
-                         for i in [4, 8, 12, 16, 20])
-
-            if is_fist and not previous_fist_state:
-                if current_time - last_gesture_time > gesture_cooldown:
-                    scroll_active = not scroll_active
-                    response_time = time.time() - gesture_start_time
-                    perf_monitor.add_response_time(response_time)
-                    last_gesture_time = current_time
-            
-            previous_fist_state = is_fist
-
-            # Scroll
-            current_scroll_state = None
-            if scroll_active:
-                if length < 50:
-                    mouse.scroll(0, 1)
-                    current_scroll_state = 'up'
-                    
-                    if previous_scroll_state != 'up':
-                        if current_time - last_gesture_time > gesture_cooldown:
-                            response_time = time.time() - gesture_start_time
-                            perf_monitor.add_response_time(response_time)
-                            last_gesture_time = current_time
-                            
-                elif length > 150:
-                    mouse.scroll(0, -1)
-                    current_scroll_state = 'down'
-                    
-                    if previous_scroll_state != 'down':
-                        if current_time - last_gesture_time > gesture_cooldown:
-                            response_time = time.time() - gesture_start_time
-                            perf_monitor.add_response_time(response_time)
-                            last_gesture_time = current_time
-                    
-            previous_scroll_state = current_scroll_state
-
-            # Klik
-            current_click_state = distance_thumb_pinky < 30
-            if current_click_state and not previous_click_state:
-                if current_time - last_gesture_time > gesture_cooldown:
-                    mouse.click(Button.left)
-                    response_time = time.time() - gesture_start_time
-                    perf_monitor.add_response_time(response_time)
-                    last_gesture_time = current_time
-                    
-            previous_click_state = current_click_state
-
+# ============= SINK METRIK =============
+def on_frame(frame):
     # Update frame count untuk FPS
     perf_monitor.update_frame()
 
-    # Tampilkan info di frame
-    cv2.putText(img, f"FPS: {perf_monitor.current_fps:.1f}", 
-                (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+def on_gesture(name, frame):
+    # Response time: dari frame selesai di-capture sampai aksi gesture dijalankan
+    perf_monitor.add_response_time(time.time() - frame['t_captured'])
 
-    # Tampilkan frame
-    cv2.imshow("Performance Monitoring", img)
-    
-    if cv2.waitKey(1) & 0xFF == ord('q'):
-        break
+def draw_fps(frame, overlay):
+    overlay.putText(f"FPS: {perf_monitor.current_fps:.1f}",
+                    (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+
+engine.frame_sinks.append(on_frame)
+engine.gesture_sinks.append(on_gesture)
+engine.draw_sinks.append(draw_fps)
+engine.run()
 
-# Tampilkan statistik
+# Selesaikan antrian aktuasi, hentikan sampler, lalu tampilkan statistik
+engine.close_mouse()
+perf_monitor.stop()
 perf_monitor.display_statistics()
 
 # Simpan laporan
@@ -367,5 +611,4 @@ perf_monitor.save_report_text('laporan_performa.txt')
 print("\n✓ Monitoring selesai! File laporan tersimpan.")
 
 # Cleanup
-cap.release()
-cv2.destroyAllWindows()
+engine.close()
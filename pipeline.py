@@ -0,0 +1,284 @@
+"""
+Modul Pipeline Eksekusi (Capture -> Inference -> Aktuasi -> Tampilan)
+Setiap tahap berjalan di thread sendiri dan saling terhubung lewat slot
+berkapasitas 1 dengan aturan "nilai terbaru menang" (kamera live), atau lewat
+antrian terbatas yang menunggu jika penuh (file dengan --pace fast, agar tidak
+ada frame yang dibuang). Throughput dibatasi oleh tahap paling lambat, bukan
+jumlah waktu semua tahap.
+"""
+
+import collections
+import threading
+import time
+
+
+# ============= SLOT HANDOFF "LATEST VALUE WINS" =============
+class LatestSlot:
+    """Antrian berkapasitas 1: put() menimpa item lama yang belum diambil"""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.item = None
+        self.has_item = False
+        self.closed = False
+        self.items_put = 0
+        self.items_overwritten = 0
+
+    def put(self, item):
+        with self.cond:
+            if self.has_item:
+                self.items_overwritten += 1
+            self.item = item
+            self.has_item = True
+            self.items_put += 1
+            self.cond.notify_all()
+
+    def get(self, timeout=None):
+        """
+        Ambil item terbaru (menunggu jika kosong).
+        Return: (ok, item) - ok False jika slot ditutup atau timeout.
+        """
+        with self.cond:
+            self.cond.wait_for(lambda: self.has_item or self.closed, timeout)
+            if not self.has_item:
+                return False, None
+            item = self.item
+            self.item = None
+            self.has_item = False
+            return True, item
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+
+# ============= ANTRIAN TERBATAS (TANPA FRAME HILANG) =============
+class BoundedQueue:
+    """
+    Antrian FIFO berkapasitas maxsize: put() menunggu jika penuh, sehingga
+    tahap cepat ikut melambat dan tidak ada item yang dibuang. Antarmuka sama
+    dengan LatestSlot. Setelah close(), put() tidak menunggu lagi (item
+    dibuang) dan get() masih mengembalikan sisa item di antrian.
+    """
+
+    def __init__(self, maxsize=4):
+        self.cond = threading.Condition()
+        self.items = collections.deque()
+        self.maxsize = maxsize
+        self.closed = False
+        self.items_put = 0
+        self.items_overwritten = 0  # Selalu 0, untuk statistik yang sama dengan LatestSlot
+        self.wait_time = 0.0  # Total waktu put() menunggu antrian penuh
+
+    def put(self, item):
+        with self.cond:
+            t0 = time.perf_counter()
+            self.cond.wait_for(lambda: len(self.items) < self.maxsize or self.closed)
+            self.wait_time += time.perf_counter() - t0
+            if self.closed:
+                return
+            self.items.append(item)
+            self.items_put += 1
+            self.cond.notify_all()
+
+    def get(self, timeout=None):
+        """
+        Ambil item terlama (menunggu jika kosong).
+        Return: (ok, item) - ok False jika antrian kosong dan ditutup, atau timeout.
+        """
+        with self.cond:
+            self.cond.wait_for(lambda: self.items or self.closed, timeout)
+            if not self.items:
+                return False, None
+            item = self.items.popleft()
+            self.cond.notify_all()
+            return True, item
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+
+# ============= TAHAP PIPELINE =============
+class PipelineStage:
+    """
+    Satu tahap pipeline di thread sendiri.
+    func(item) -> item baru (None = buang item). Tahap pertama (tanpa input)
+    dipanggil func() dan berhenti saat mengembalikan None.
+    """
+
+    def __init__(self, name, func, input_slot=None, output_slot=None):
+        self.name = name
+        self.func = func
+        self.input_slot = input_slot
+        self.output_slot = output_slot if output_slot is not None else LatestSlot()
+        self.thread = None
+        self.running = False
+        self.error = None
+
+        # Statistik okupansi
+        self.busy_time = 0.0
+        self.items_processed = 0
+        self.start_time = None
+
+    def start(self):
+        self.running = True
+        self.start_time = time.perf_counter()
+        self.thread = threading.Thread(target=self._run, name=f"Stage-{self.name}", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        try:
+            while self.running:
+                if self.input_slot is None:
+                    t0 = time.perf_counter()
+                    result = self.func()
+                    if result is None:
+                        break
+                else:
+                    ok, item = self.input_slot.get(timeout=0.5)
+                    if not ok:
+                        if self.input_slot.closed:
+                            break
+                        continue
+                    t0 = time.perf_counter()
+                    result = self.func(item)
+
+                self.busy_time += time.perf_counter() - t0
+                self.items_processed += 1
+                if result is not None:
+                    self.output_slot.put(result)
+        except Exception as e:
+            self.error = e
+            print(f"\n✗ Error di tahap pipeline '{self.name}': {e}")
+        finally:
+            self.running = False
+            self.output_slot.close()
+
+    def stop(self):
+        self.running = False
+
+    def join(self, timeout=None):
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def get_occupancy(self):
+        """Persentase waktu tahap ini sibuk (bukan menunggu input)"""
+        elapsed = time.perf_counter() - self.start_time if self.start_time else 0.0
+        return {
+            'busy_percent': (self.busy_time / elapsed * 100) if elapsed > 0 else 0.0,
+            'items': self.items_processed,
+            'avg_ms': (self.busy_time / self.items_processed * 1000) if self.items_processed else 0.0,
+            'dropped': self.output_slot.items_overwritten
+        }
+
+
+# ============= PIPELINE =============
+class Pipeline:
+    """
+    Rangkaian tahap: source -> stage -> stage -> ... -> consumer (main thread).
+
+    Tahap terakhir (consumer) dijalankan oleh pemanggil lewat get(), karena
+    cv2.imshow/cv2.waitKey harus tetap di main thread.
+
+    lossless=False : LatestSlot antar tahap, frame lama ditimpa (kamera live)
+    lossless=True  : BoundedQueue(queue_size), tahap cepat menunggu tahap lambat
+                     dan setiap frame diproses (file dengan --pace fast)
+    """
+
+    def __init__(self, profile=False, profile_interval=5.0, lossless=False, queue_size=4):
+        self.stages = []
+        self.profile = profile
+        self.profile_interval = profile_interval
+        self.lossless = lossless
+        self.queue_size = queue_size
+        self.last_profile_time = None
+
+        # Okupansi consumer (main thread) diukur di antara pemanggilan get()
+        self.consumer_name = 'consumer'
+        self.consumer_busy = 0.0
+        self.consumer_items = 0
+        self.consumer_start = None
+        self.consumer_item_time = None
+
+    def _new_slot(self):
+        return BoundedQueue(self.queue_size) if self.lossless else LatestSlot()
+
+    def add_source(self, name, func):
+        self.stages.append(PipelineStage(name, func, output_slot=self._new_slot()))
+        return self
+
+    def add_stage(self, name, func):
+        if not self.stages:
+            raise ValueError("Tambahkan source terlebih dahulu")
+        self.stages.append(PipelineStage(name, func, self.stages[-1].output_slot, self._new_slot()))
+        return self
+
+    def set_consumer_name(self, name):
+        self.consumer_name = name
+        return self
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+        self.consumer_start = time.perf_counter()
+        self.last_profile_time = time.time()
+        return self
+
+    def get(self, timeout=None):
+        """Ambil hasil terbaru dari tahap terakhir. Return: (ok, item)"""
+        now = time.perf_counter()
+        if self.consumer_item_time is not None:
+            self.consumer_busy += now - self.consumer_item_time
+            self.consumer_items += 1
+            self.consumer_item_time = None
+
+        if self.profile and time.time() - self.last_profile_time >= self.profile_interval:
+            self.print_occupancy()
+            self.last_profile_time = time.time()
+
+        ok, item = self.stages[-1].output_slot.get(timeout)
+        if ok:
+            self.consumer_item_time = time.perf_counter()
+        return ok, item
+
+    def stop(self):
+        for stage in self.stages:
+            stage.stop()
+        # Tutup juga slot keluaran tahap terakhir: put() yang menunggu antrian penuh ikut berhenti
+        for stage in self.stages:
+            stage.output_slot.close()
+        for stage in self.stages:
+            stage.join(timeout=1.0)
+
+    def get_occupancy(self):
+        """Okupansi per tahap, termasuk consumer di main thread"""
+        occupancy = {stage.name: stage.get_occupancy() for stage in self.stages}
+        elapsed = time.perf_counter() - self.consumer_start if self.consumer_start else 0.0
+        occupancy[self.consumer_name] = {
+            'busy_percent': (self.consumer_busy / elapsed * 100) if elapsed > 0 else 0.0,
+            'items': self.consumer_items,
+            'avg_ms': (self.consumer_busy / self.consumer_items * 1000) if self.consumer_items else 0.0,
+            'dropped': 0
+        }
+        return occupancy
+
+    def get_bottleneck(self):
+        """Nama tahap dengan okupansi tertinggi"""
+        occupancy = self.get_occupancy()
+        return max(occupancy, key=lambda name: occupancy[name]['busy_percent'])
+
+    def print_occupancy(self):
+        occupancy = self.get_occupancy()
+        bottleneck = max(occupancy, key=lambda name: occupancy[name]['busy_percent'])
+        print("\n" + "-"*80)
+        print("OKUPANSI TAHAP PIPELINE")
+        print("-"*80)
+        for name, occ in occupancy.items():
+            marker = "  ← bottleneck" if name == bottleneck else ""
+            print(f"  {name:<12}: {occ['busy_percent']:5.1f}% sibuk | "
+                  f"{occ['avg_ms']:6.2f} ms/item | {occ['items']} item | "
+                  f"{occ['dropped']} dibuang{marker}")
+        print("-"*80)
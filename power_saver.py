@@ -0,0 +1,117 @@
+"""
+Modul Mode Hemat Daya (Idle)
+Jika tidak ada tangan selama idle_timeout detik, sistem masuk mode idle:
+frame diproses dengan laju rendah (idle_fps, kamera hanya men-decode 1 dari N
+frame) dan deteksi dijalankan pada frame yang diperkecil (idle_scale).
+Resolusi capture kamera TIDAK diganti: mengganti mode driver bisa menahan
+capture ratusan ms, sehingga kembali ke mode aktif tidak lagi dalam satu
+frame. Begitu tangan terlihat lagi, sistem langsung kembali ke mode aktif
+pada frame berikutnya.
+"""
+
+import time
+from collections import deque
+
+import cv2
+
+from hand_transform import find_hands, transform_hand
+
+
+ACTIVE = 'active'
+IDLE = 'idle-downscale'  # Laju rendah + deteksi diperkecil (resolusi kamera tetap)
+
+
+class IdlePowerSaver:
+    """
+    Bungkus detector. findHands(img) -> (hands, img) dengan koordinat frame penuh.
+    Sumber frame memanggil wait() sebelum membaca frame (lihat FrameSource).
+    """
+
+    uses_timestamp = True  # Timestamp capture diteruskan ke detector di dalamnya
+
+    def __init__(self, detector, idle_timeout=5.0, idle_fps=5.0, idle_scale=0.5, log_size=100):
+        self.detector = detector
+        self.idle_timeout = idle_timeout  # Detik tanpa tangan sebelum masuk idle
+        self.idle_fps = idle_fps          # Laju frame di mode idle
+        self.idle_scale = idle_scale      # Skala frame untuk deteksi di mode idle (bukan resolusi capture)
+        self.source = None
+
+        now = time.time()
+        self.state = ACTIVE
+        self.state_since = now
+        self.last_hand_time = now
+        self.next_idle_frame = 0.0
+        self.small = None
+
+        # Statistik
+        self.time_in_mode = {ACTIVE: 0.0, IDLE: 0.0}
+        self.frames_in_mode = {ACTIVE: 0, IDLE: 0}
+        self.transitions = 0
+        self.transition_log = deque(maxlen=log_size)  # (waktu, mode baru)
+        self.start_time = now
+
+    def attach_source(self, source):
+        """Sumber frame yang ikut diperlambat saat idle"""
+        self.source = source
+
+    def _set_state(self, state, now):
+        if state == self.state:
+            return
+        self.time_in_mode[self.state] += now - self.state_since
+        self.state = state
+        self.state_since = now
+        self.transitions += 1
+        self.transition_log.append((now - self.start_time, state))
+        if self.source is not None:
+            self.source.set_idle(state == IDLE)
+
+    def wait(self):
+        """Tahan pembacaan frame sesuai idle_fps (hanya di mode idle)"""
+        if self.state != IDLE:
+            return
+        delay = self.next_idle_frame - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        self.next_idle_frame = max(self.next_idle_frame + 1.0 / self.idle_fps, time.time())
+
+    def findHands(self, img, draw=True, flipType=True, timestamp=None):
+        now = time.time()
+        self.frames_in_mode[self.state] += 1
+
+        if self.state == IDLE:
+            h, w = img.shape[:2]
+            size = (int(w * self.idle_scale), int(h * self.idle_scale))
+            self.small = cv2.resize(img, size, dst=self.small, interpolation=cv2.INTER_AREA)
+            hands, _ = find_hands(self.detector, self.small, draw=False, flipType=flipType, timestamp=timestamp)
+            # Kembalikan koordinat hasil deteksi frame kecil ke frame penuh
+            for hand in hands:
+                transform_hand(hand, w / size[0], h / size[1])
+        else:
+            hands, img = find_hands(self.detector, img, draw=draw, flipType=flipType, timestamp=timestamp)
+
+        if hands:
+            self.last_hand_time = now
+            self._set_state(ACTIVE, now)
+        elif now - self.last_hand_time > self.idle_timeout:
+            self._set_state(IDLE, now)
+        return hands, img
+
+    def get_stats(self):
+        now = time.time()
+        time_in_mode = dict(self.time_in_mode)
+        time_in_mode[self.state] += now - self.state_since
+        total = sum(time_in_mode.values())
+        return {
+            'mode': 'power',
+            'state': self.state,
+            'idle_timeout': self.idle_timeout,
+            'idle_fps': self.idle_fps,
+            'idle_scale': self.idle_scale,
+            'transitions': self.transitions,
+            'time_active_seconds': time_in_mode[ACTIVE],
+            'time_idle_seconds': time_in_mode[IDLE],
+            'idle_percent': time_in_mode[IDLE] / total * 100 if total > 0 else 0.0,
+            'frames_active': self.frames_in_mode[ACTIVE],
+            'frames_idle': self.frames_in_mode[IDLE],
+            'transition_log': [{'detik': round(t, 2), 'mode': state} for t, state in self.transition_log]
+        }
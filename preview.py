@@ -0,0 +1,464 @@
+"""
+Modul Preview dan Input Kontrol
+Preview: window OpenCV, gambar overlay, dan polling tombol. Main loop hanya
+mencatat deskripsi overlay (titik, garis, teks, target); thread compositor
+mengambil frame terbaru dan menggambarnya dengan rate terbatas (--preview-fps),
+sehingga menggambar tidak pernah menahan loop tracking. Semua panggilan HighGUI
+(namedWindow, imshow, waitKey, properti window) tetap di main thread, karena
+HighGUI di luar main thread rusak di macOS (Cocoa) dan sebagian build Qt: main
+loop hanya menampilkan gambar yang sudah jadi, dan UIEventService menerapkan
+properti window sekali serta membaca tombol dengan cadence sendiri
+(--key-hz). Bagian yang jarang berubah (target pengujian, teks mode) disimpan
+sebagai StaticLayer dan hanya ditempel per frame. Dengan --headless
+tidak ada window, tidak ada gambar, dan tidak ada cv2.waitKey; tombol kontrol
+(Y/N/F/S/R/T/W/Q, dst.) dibaca dari stdin atau socket lokal (--control-port),
+satu perintah per baris. Argumen setelah huruf pertama dipakai sebagai jawaban
+pertanyaan lanjutan, mis. "f3" = tombol F lalu pilihan 3, "ry" = reset + konfirmasi.
+"""
+
+import queue
+import socketserver
+import sys
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from latency_histogram import LatencyHistogram
+from pipeline import LatestSlot
+
+
+NO_KEY = 255  # Sama dengan cv2.waitKey(1) & 0xFF tanpa tombol
+
+
+class Overlay:
+    """
+    Deskripsi gambar di atas frame preview, dengan argumen yang sama seperti
+    fungsi cv2 (tanpa argumen img). Panggilan hanya dicatat; draw() menggambar
+    semuanya sekaligus (di thread renderer). Jika preview mati, tidak dicatat.
+    """
+
+    def __init__(self, img, enabled=True):
+        self.img = img
+        self.enabled = enabled
+        self.ops = []  # (fungsi cv2, args, kwargs)
+
+    def circle(self, *args, **kwargs):
+        if self.enabled:
+            self.ops.append((cv2.circle, args, kwargs))
+
+    def line(self, *args, **kwargs):
+        if self.enabled:
+            self.ops.append((cv2.line, args, kwargs))
+
+    def rectangle(self, *args, **kwargs):
+        if self.enabled:
+            self.ops.append((cv2.rectangle, args, kwargs))
+
+    def putText(self, *args, **kwargs):
+        if self.enabled:
+            self.ops.append((cv2.putText, args, kwargs))
+
+    def blend(self, layer):
+        """Tempel StaticLayer (versi saat ini) di urutan gambar ini"""
+        if self.enabled and layer.pixels is not None:
+            self.ops.append((_blend_layer, (layer.pixels,), {}))
+
+    def draw(self, img=None):
+        img = self.img if img is None else img
+        for func, args, kwargs in self.ops:
+            func(img, *args, **kwargs)
+        return img
+
+
+def _blend_layer(img, pixels):
+    """Satu blend vektor untuk semua piksel layer: img = img * (1 - alpha) + warna"""
+    index, color, inv_alpha = pixels
+    flat = img.reshape(-1, 3)
+    flat[index] = (flat[index] * inv_alpha + color + 127) // 255
+    if not img.flags.c_contiguous:  # reshape menghasilkan salinan
+        img[...] = flat.reshape(img.shape)
+
+
+class StaticLayer:
+    """
+    Layer overlay yang jarang berubah (target pengujian, teks mode/petunjuk).
+    Digambar sekali, lalu tiap frame cukup Overlay.blend(layer). Digambar ulang
+    hanya jika key (state) atau ukuran frame berubah. Alpha mask diperoleh dari
+    menggambar di latar hitam dan putih, sehingga tepi teks anti-alias tetap halus.
+    """
+
+    _UNSET = object()
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.key = self._UNSET
+        self.pixels = None  # (indeks piksel, warna x alpha, 255 - alpha); diganti utuh, aman dibaca renderer
+
+        # Statistik
+        self.frames = 0
+        self.renders = 0
+
+    def update(self, key, shape, draw):
+        """draw(overlay) dipanggil hanya jika key atau ukuran frame berubah"""
+        self.frames += 1
+        if not self.enabled:
+            return self
+        key = (key, shape)
+        if key == self.key:
+            return self
+
+        black = np.zeros(shape, np.uint8)
+        white = np.full(shape, 255, np.uint8)
+        for canvas in (black, white):
+            overlay = Overlay(canvas)
+            draw(overlay)
+            overlay.draw()
+
+        # hitam = alpha * warna, putih = alpha * warna + (1 - alpha) * 255
+        inv_alpha = (white.astype(np.int16) - black).reshape(-1, 3)
+        index = np.flatnonzero((inv_alpha < 255).any(axis=1))
+        if len(index):
+            color = black.reshape(-1, 3)[index].astype(np.uint32) * 255
+            self.pixels = (index, color, inv_alpha[index].astype(np.uint32))
+        else:
+            self.pixels = None
+        self.key = key
+        self.renders += 1
+        return self
+
+    def invalidate(self):
+        self.key = self._UNSET
+
+
+class UIEventService:
+    """
+    Event HighGUI satu window. Properti window (mis. topmost) diterapkan sekali,
+    hanya saat nilainya berubah. Tombol dari cv2.waitKey dibaca dengan cadence
+    sendiri (key_hz), bukan setiap frame, lalu diantrikan di deque.
+    pump() harus dipanggil dari main thread (pemilik window).
+    """
+
+    def __init__(self, window_name, key_hz=30.0):
+        self.window_name = window_name
+        self.key_period = 1.0 / key_hz if key_hz else 0.0  # 0 = setiap pump()
+        self.keys = deque(maxlen=64)
+        self.properties = {}  # Properti yang diminta {prop: nilai}
+        self.applied = {}     # Properti yang sudah diterapkan
+        self.next_poll = 0.0
+
+        # Statistik
+        self.polls = 0
+        self.property_calls = 0
+        self.pump_time = 0.0
+
+    def create_window(self):
+        cv2.namedWindow(self.window_name, cv2.WINDOW_NORMAL)
+
+    def set_property(self, prop, value):
+        """Minta properti window; diterapkan di pump() berikutnya jika berubah"""
+        self.properties[prop] = value
+
+    def due(self, now):
+        return now >= self.next_poll
+
+    def pump(self):
+        """Terapkan properti yang berubah, lalu baca satu tombol (cv2.waitKey)"""
+        t0 = time.perf_counter()
+        for prop, value in list(self.properties.items()):
+            if self.applied.get(prop) != value:
+                cv2.setWindowProperty(self.window_name, prop, value)
+                self.applied[prop] = value
+                self.property_calls += 1
+        key = cv2.waitKey(1) & 0xFF
+        if key != NO_KEY:
+            self.keys.append(key)
+        self.polls += 1
+        self.next_poll = max(self.next_poll + self.key_period, t0)
+        self.pump_time += time.perf_counter() - t0
+
+    def poll_key(self):
+        """Tombol berikutnya untuk main loop (non-blocking), NO_KEY jika tidak ada"""
+        try:
+            return self.keys.popleft()
+        except IndexError:
+            return NO_KEY
+
+    def get_stats(self):
+        return {
+            'key_hz': 1.0 / self.key_period if self.key_period else 0.0,
+            'key_polls': self.polls,
+            'property_calls': self.property_calls,
+            'pump_ms': self.pump_time * 1000
+        }
+
+
+class PreviewRenderer:
+    """
+    Thread compositor: frame + overlay terbaru diambil dari LatestSlot (frame
+    lama yang belum sempat tampil ditimpa) dan digambar paling banyak fps kali
+    per detik. Gambar jadi diserahkan kembali lewat LatestSlot 'ready'; main
+    thread yang memanggil cv2.imshow (take_ready). Tidak ada HighGUI di sini.
+    """
+
+    def __init__(self, fps=15.0):
+        self.period = 1.0 / fps
+        self.fps = fps
+        self.slot = LatestSlot()
+        self.ready = LatestSlot()  # Gambar jadi untuk imshow di main thread
+        self.running = True
+
+        # Statistik
+        self.frames_rendered = 0
+        self.render_time = 0.0
+        self.start_time = time.perf_counter()
+
+        self.thread = threading.Thread(target=self._run, name="PreviewRenderer", daemon=True)
+        self.thread.start()
+
+    def submit(self, img, overlay):
+        """Serahkan frame ke renderer (tidak pernah menunggu)"""
+        self.slot.put((img, overlay))
+
+    def _run(self):
+        next_frame = time.perf_counter()
+        while self.running:
+            # Tunggu frame berikutnya, lalu batasi rate (tick yang terlewat tidak dikejar)
+            ok, item = self.slot.get(timeout=0.1)
+            if not ok:
+                continue
+            now = time.perf_counter()
+            img, overlay = item
+            if overlay is not None:
+                overlay.draw(img)
+            self.ready.put(img)
+            self.render_time += time.perf_counter() - now
+            self.frames_rendered += 1
+            next_frame = max(next_frame + self.period, now)
+            time.sleep(max(0.0, next_frame - time.perf_counter()))
+
+    def take_ready(self):
+        """Gambar jadi terbaru (untuk imshow di main thread), None jika belum ada yang baru"""
+        ok, img = self.ready.get(timeout=0)
+        return img if ok else None
+
+    def close(self):
+        self.running = False
+        self.slot.close()
+        self.ready.close()
+        self.thread.join(1.0)
+
+    def get_stats(self):
+        elapsed = time.perf_counter() - self.start_time
+        return {
+            'mode': 'thread',
+            'target_fps': self.fps,
+            'frames_submitted': self.slot.items_put,
+            'frames_rendered': self.frames_rendered,
+            'frames_skipped': self.slot.items_overwritten,
+            'render_fps': self.frames_rendered / elapsed if elapsed > 0 else 0.0,
+            'avg_render_ms': (self.render_time / self.frames_rendered * 1000) if self.frames_rendered else 0.0,
+            'render_ms': self.render_time * 1000
+        }
+
+
+# Tanda di antrian: stdin habis (EOF) atau klien socket terputus
+CONTROL_EOF = None
+
+
+class ControlInput:
+    """
+    Baris perintah dari stdin dan/atau socket TCP lokal (127.0.0.1).
+    Saat stdin ditutup atau klien socket terputus, CONTROL_EOF masuk antrian
+    sehingga input() yang sedang menunggu jawaban kembali dengan "" (tracker
+    tidak tertahan selamanya di handler tombol). input() juga dibatasi timeout.
+    """
+
+    def __init__(self, stdin=True, port=None, input_timeout=60.0):
+        self.lines = queue.Queue()
+        self.pending_arg = None
+        self.server = None
+        self.input_timeout = input_timeout
+        self.stdin_open = stdin
+
+        if stdin:
+            threading.Thread(target=self._read_stdin, name="ControlStdin", daemon=True).start()
+        if port:
+            lines = self.lines
+
+            class Handler(socketserver.StreamRequestHandler):
+                def handle(self):
+                    for raw in self.rfile:
+                        lines.put(raw.decode('utf-8', 'ignore'))
+                    lines.put(CONTROL_EOF)
+
+            socketserver.ThreadingTCPServer.allow_reuse_address = True
+            self.server = socketserver.ThreadingTCPServer(('127.0.0.1', port), Handler)
+            self.server.daemon_threads = True
+            threading.Thread(target=self.server.serve_forever, name="ControlSocket", daemon=True).start()
+            print(f"✓ Kontrol socket: 127.0.0.1:{port} (satu perintah per baris)")
+
+    def _read_stdin(self):
+        for line in sys.stdin:
+            self.lines.put(line)
+        self.stdin_open = False
+        self.lines.put(CONTROL_EOF)
+
+    def poll_key(self):
+        """Kode tombol perintah berikutnya (non-blocking), NO_KEY jika tidak ada"""
+        while True:
+            try:
+                line = self.lines.get_nowait()
+            except queue.Empty:
+                return NO_KEY
+            if line is CONTROL_EOF:
+                continue
+            line = line.strip()
+            if line:
+                self.pending_arg = line[1:].strip() or None
+                return ord(line[0])
+
+    def input(self, prompt=""):
+        """Jawaban pertanyaan lanjutan: argumen perintah terakhir, atau baris berikutnya"""
+        if self.pending_arg is not None:
+            answer, self.pending_arg = self.pending_arg, None
+            print(f"{prompt}{answer}")
+            return answer
+        print(prompt, end='', flush=True)
+        if not self.stdin_open and self.server is None:
+            # Tidak ada sumber yang masih bisa menjawab
+            print()
+            return ""
+        try:
+            line = self.lines.get(timeout=self.input_timeout)
+        except queue.Empty:
+            line = CONTROL_EOF
+        if line is CONTROL_EOF:
+            print()
+            return ""
+        return line.strip()
+
+    def close(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+class Preview:
+    """
+    Window preview satu skrip.
+      render_fps > 0 : gambar di thread compositor (default); imshow gambar jadi
+                       dan waitKey (cadence key_hz) di main thread
+      render_fps = 0 : gambar + imshow + waitKey langsung di main loop
+      headless       : tanpa window/gambar/waitKey, tombol dari stdin
+    Tombol juga dari socket jika control_port diberikan. Waktu yang dipakai
+    main loop untuk UI (show + wait_key) dicatat per frame.
+    """
+
+    def __init__(self, window_name, headless=False, control_port=None, topmost=False,
+                 render_fps=15.0, key_hz=30.0):
+        self.window_name = window_name
+        self.headless = headless
+        self.enabled = not headless
+        self.controls = None
+        self.events = None
+        self.renderer = None
+        self.ui_time = LatencyHistogram()  # ms per frame di main loop (show + wait_key)
+        self.frame_ui_ms = 0.0
+        self.frames = 0
+        if headless or control_port:
+            self.controls = ControlInput(stdin=headless, port=control_port)
+        if not self.enabled:
+            print("✓ Mode headless: tanpa preview, ketik perintah tombol lalu Enter (q = keluar)")
+        elif render_fps:
+            self.events = UIEventService(window_name, key_hz)
+            self.events.create_window()
+            self.renderer = PreviewRenderer(render_fps)
+        else:
+            self.events = UIEventService(window_name, key_hz=0)
+            self.events.create_window()
+        if topmost:
+            self.set_topmost()
+
+    def overlay(self, img):
+        """Overlay untuk frame ini (tidak mencatat apa pun jika headless)"""
+        return Overlay(img, self.enabled)
+
+    def static_layer(self):
+        """StaticLayer untuk window ini (tidak menggambar apa pun jika headless)"""
+        return StaticLayer(self.enabled)
+
+    def set_topmost(self):
+        """Window selalu di depan (diterapkan sekali oleh UIEventService)"""
+        if self.events is not None:
+            self.events.set_property(cv2.WND_PROP_TOPMOST, 1)
+
+    def show(self, img, overlay=None):
+        """Tampilkan frame beserta overlay-nya (thread compositor: tidak pernah menunggu)"""
+        t0 = time.perf_counter()
+        if self.renderer is not None:
+            self.renderer.submit(img, overlay)
+        elif self.enabled:
+            if overlay is not None:
+                overlay.draw(img)
+            cv2.imshow(self.window_name, img)
+        self.frame_ui_ms += (time.perf_counter() - t0) * 1000
+
+    def wait_key(self):
+        """Seperti cv2.waitKey(1) & 0xFF, ditambah perintah dari stdin/socket"""
+        t0 = time.perf_counter()
+        key = NO_KEY
+        if self.renderer is not None:
+            # Gambar jadi dari compositor (maks render_fps); waitKey setelah imshow
+            # agar window diperbarui, selain itu hanya sesuai cadence key_hz
+            img = self.renderer.take_ready()
+            if img is not None:
+                cv2.imshow(self.window_name, img)
+            if img is not None or self.events.due(time.perf_counter()):
+                self.events.pump()
+            key = self.events.poll_key()
+        elif self.events is not None:
+            self.events.pump()
+            key = self.events.poll_key()
+        if key == NO_KEY and self.controls is not None:
+            key = self.controls.poll_key()
+        self.ui_time.record(self.frame_ui_ms + (time.perf_counter() - t0) * 1000)
+        self.frame_ui_ms = 0.0
+        self.frames += 1
+        return key
+
+    def get_stats(self):
+        ui = self.ui_time.get_stats()
+        stats = self.renderer.get_stats() if self.renderer is not None else {
+            'mode': 'headless' if self.headless else 'inline'}
+        stats['ui_main_avg_ms'] = ui['avg']
+        stats['ui_main_p95_ms'] = ui['p95']
+        if self.events is not None:
+            stats.update(self.events.get_stats())
+        if self.renderer is not None and self.frames:
+            # Waktu menggambar overlay yang dipindah dari main loop ke compositor
+            stats['ui_thread_ms_per_frame'] = stats['render_ms'] / self.frames
+        return stats
+
+    def input(self, prompt=""):
+        """Pengganti input() yang juga bekerja saat tombol datang dari stdin/socket"""
+        if self.controls is not None and (self.headless or self.controls.pending_arg is not None):
+            return self.controls.input(prompt)
+        return input(prompt)
+
+    def close(self):
+        if self.controls is not None:
+            self.controls.close()
+        if self.renderer is not None:
+            self.renderer.close()
+        if self.enabled:
+            cv2.destroyAllWindows()
+        if self.frames:
+            stats = self.get_stats()
+            line = (f"Preview ({stats['mode']}): UI di main loop avg {stats['ui_main_avg_ms']:.3f} ms/frame "
+                    f"(p95 {stats['ui_main_p95_ms']:.3f} ms)")
+            if 'ui_thread_ms_per_frame' in stats:
+                line += f", {stats['ui_thread_ms_per_frame']:.2f} ms/frame dipindah ke thread compositor"
+            print(line)
@@ -0,0 +1,133 @@
+"""
+Modul Deteksi ROI (Region of Interest)
+Setelah tangan ditemukan, frame berikutnya cukup diproses di sekitar bbox
+tangan terakhir (dengan padding). Hasil landmark dipetakan kembali ke
+koordinat frame penuh. Jika tidak ada tangan di ROI, deteksi diulang di
+frame penuh pada frame yang sama; tangan baru di luar ROI ditemukan oleh
+frame penuh berkala (refresh_interval). ROI juga dibuang saat ukuran frame
+berubah.
+
+Crop ROI dan frame penuh berbeda ukuran, sedangkan tracker MediaPipe mode
+video mengandalkan geometri yang sama antar frame. Karena itu crop diproses
+oleh crop_detector terpisah dalam mode static image (deteksi ulang setiap
+crop), dan tracker mode video hanya menerima frame penuh.
+"""
+
+import math
+import time
+
+from hand_transform import transform_hand
+
+
+class RoiTrackingDetector:
+    """
+    Bungkus detector (cvzone HandDetector / LeanHandDetector).
+    findHands(img) -> (hands, img) dengan koordinat frame penuh.
+    crop_detector: detector mode static image untuk crop ROI (None = detector).
+    """
+
+    def __init__(self, detector, padding=0.6, min_size=192, refresh_interval=15, align=32,
+                 crop_detector=None):
+        self.detector = detector
+        self.crop_detector = crop_detector if crop_detector is not None else detector
+        self.padding = padding                    # Padding relatif terhadap sisi terpanjang bbox
+        self.min_size = min_size                  # Sisi ROI minimal (px)
+        self.refresh_interval = refresh_interval  # Frame penuh tiap N frame untuk menemukan tangan baru
+        self.align = align                        # Ukuran ROI dibulatkan agar buffer jarang dialokasi ulang
+        self.last_bbox = None
+        self.last_shape = None
+        self.frames_since_full = 0
+
+        # Statistik
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.fallbacks = 0
+        self.roi_time = 0.0
+        self.full_time = 0.0
+        self.roi_area_sum = 0.0
+
+    def _roi(self, shape):
+        """Region persegi di sekitar bbox terakhir: (x0, y0, x1, y1)"""
+        h, w = shape[:2]
+        x, y, bw, bh = self.last_bbox
+        side = max(bw, bh) * (1 + 2 * self.padding)
+        side = max(self.min_size, int(math.ceil(side / self.align)) * self.align)
+        if side >= w or side >= h:
+            return None
+
+        cx, cy = x + bw // 2, y + bh // 2
+        x0 = min(max(0, cx - side // 2), w - side)
+        y0 = min(max(0, cy - side // 2), h - side)
+        return x0, y0, x0 + side, y0 + side
+
+    def _update_bbox(self, hands):
+        """Simpan gabungan bbox semua tangan untuk ROI frame berikutnya"""
+        if not hands:
+            self.last_bbox = None
+            return
+        boxes = [hand['bbox'] for hand in hands]
+        x0 = min(b[0] for b in boxes)
+        y0 = min(b[1] for b in boxes)
+        x1 = max(b[0] + b[2] for b in boxes)
+        y1 = max(b[1] + b[3] for b in boxes)
+        self.last_bbox = (x0, y0, x1 - x0, y1 - y0)
+
+    def _full_frame(self, img, draw, flipType):
+        t0 = time.perf_counter()
+        hands, img = self.detector.findHands(img, draw=draw, flipType=flipType)
+        self.full_time += time.perf_counter() - t0
+        self.full_frames += 1
+        self.frames_since_full = 0
+        return hands, img
+
+    def findHands(self, img, draw=True, flipType=True):
+        # bbox dari frame dengan ukuran lain tidak berlaku lagi
+        if img.shape[:2] != self.last_shape:
+            self.last_shape = img.shape[:2]
+            self.last_bbox = None
+
+        roi = None
+        if self.last_bbox is not None and self.frames_since_full < self.refresh_interval:
+            roi = self._roi(img.shape)
+
+        if roi is None:
+            hands, img = self._full_frame(img, draw, flipType)
+            self._update_bbox(hands)
+            return hands, img
+
+        x0, y0, x1, y1 = roi
+        # Slicing = view, sehingga gambar dari detector ikut tergambar di frame penuh
+        crop = img[y0:y1, x0:x1]
+        t0 = time.perf_counter()
+        hands, _ = self.crop_detector.findHands(crop, draw=draw, flipType=flipType)
+        self.roi_time += time.perf_counter() - t0
+        self.roi_frames += 1
+        self.frames_since_full += 1
+        self.roi_area_sum += (x1 - x0) * (y1 - y0) / float(img.shape[0] * img.shape[1])
+
+        if not hands:
+            # Tangan keluar dari ROI: ulangi di frame penuh
+            self.fallbacks += 1
+            hands, img = self._full_frame(img, draw, flipType)
+            self._update_bbox(hands)
+            return hands, img
+
+        # Geser koordinat hasil deteksi ROI ke koordinat frame penuh
+        for hand in hands:
+            transform_hand(hand, dx=x0, dy=y0)
+        self._update_bbox(hands)
+        return hands, img
+
+    def get_stats(self):
+        total = self.roi_frames + self.full_frames - self.fallbacks
+        return {
+            'mode': 'roi',
+            'frames': total,
+            'roi_frames': self.roi_frames,
+            'full_frames': self.full_frames,
+            'fallbacks': self.fallbacks,
+            'roi_ratio': (self.roi_frames - self.fallbacks) / total if total else 0.0,
+            'avg_roi_area_percent': (self.roi_area_sum / self.roi_frames * 100) if self.roi_frames else 0.0,
+            'avg_roi_ms': (self.roi_time / self.roi_frames * 1000) if self.roi_frames else 0.0,
+            'avg_full_ms': (self.full_time / self.full_frames * 1000) if self.full_frames else 0.0
+        }
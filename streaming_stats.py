@@ -0,0 +1,200 @@
+"""
+Modul Statistik Streaming (Memori Tetap)
+Inti statistik untuk semua tracker pengujian: mean & variance (Welford),
+estimasi kuantil streaming (algoritma P²), min/max, dan reservoir sample
+opsional untuk plotting. Setiap update O(1) dan memori konstan, sehingga
+sesi pengujian panjang tidak membuat memori terus bertambah.
+"""
+
+import math
+import random
+
+
+class P2Quantile:
+    """
+    Estimator kuantil streaming P² (Jain & Chlamtac, 1985).
+    Hanya menyimpan 5 marker, berapapun jumlah sampelnya.
+    """
+
+    def __init__(self, percent):
+        self.p = percent / 100.0
+        self.count = 0
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * self.p, 1 + 4 * self.p, 3 + 2 * self.p, 5]
+        self.increments = [0, self.p / 2, self.p, (1 + self.p) / 2, 1]
+
+    def add(self, x):
+        self.count += 1
+        if self.count <= 5:
+            self.heights.append(x)
+            self.heights.sort()
+            return
+
+        q = self.heights
+        n = self.positions
+
+        # Cari sel k tempat x berada, perbarui marker ekstrem
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while k < 3 and x >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Sesuaikan tinggi marker tengah
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not q[i - 1] < candidate < q[i + 1]:
+                    candidate = self._linear(i, step)
+                q[i] = candidate
+                n[i] += step
+
+    def _parabolic(self, i, d):
+        q, n = self.heights, self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+    def _linear(self, i, d):
+        q, n = self.heights, self.positions
+        return q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+
+    def value(self):
+        if self.count == 0:
+            return 0.0
+        if self.count <= 5:
+            # Sampel masih sedikit: kuantil langsung dari data terurut
+            index = min(self.count - 1, max(0, int(round(self.p * (self.count - 1)))))
+            return self.heights[index]
+        return self.heights[2]
+
+
+class Reservoir:
+    """Reservoir sampling (Algorithm R): sampel acak seragam berukuran tetap"""
+
+    def __init__(self, size, seed=None):
+        self.size = size
+        self.items = []
+        self.seen = 0
+        self.rng = random.Random(seed)
+
+    def add(self, item):
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+        else:
+            j = self.rng.randrange(self.seen)
+            if j < self.size:
+                self.items[j] = item
+
+    def merge(self, other):
+        """
+        Gabungkan reservoir lain (weighted union): hasilnya sampel seragam dari
+        gabungan kedua aliran. Jumlah item dari tiap sisi diundi hipergeometrik
+        sesuai jumlah item yang pernah dilihat (seen) masing-masing.
+        """
+        if other.seen == 0:
+            return
+        size = min(self.size, len(self.items) + len(other.items))
+        remaining_self, remaining_other = self.seen, other.seen
+        take_self = 0
+        for _ in range(size):
+            if self.rng.randrange(remaining_self + remaining_other) < remaining_self:
+                take_self += 1
+                remaining_self -= 1
+            else:
+                remaining_other -= 1
+        take_other = size - take_self
+        self.items = (self.rng.sample(self.items, take_self) +
+                      self.rng.sample(other.items, take_other))
+        self.seen += other.seen
+
+
+class RunningStats:
+    """
+    Statistik streaming: count, mean, variance/std (Welford), min, max,
+    kuantil P² (opsional), dan reservoir sample (opsional).
+    """
+
+    def __init__(self, quantiles=(), reservoir_size=0):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.quantiles = {percent: P2Quantile(percent) for percent in quantiles}
+        self.reservoir = Reservoir(reservoir_size) if reservoir_size else None
+
+    def add(self, x):
+        self.count += 1
+        self.total += x
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+        if self.min is None or x < self.min:
+            self.min = x
+        if self.max is None or x > self.max:
+            self.max = x
+
+        for estimator in self.quantiles.values():
+            estimator.add(x)
+        if self.reservoir is not None:
+            self.reservoir.add(x)
+
+    def merge(self, other):
+        """Gabungkan count/mean/variance/min/max (rumus paralel Chan) dan reservoir"""
+        if other.count == 0:
+            return
+        if self.reservoir is not None and other.reservoir is not None:
+            self.reservoir.merge(other.reservoir)
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.total += other.total
+        if self.min is None or other.min < self.min:
+            self.min = other.min
+        if self.max is None or other.max > self.max:
+            self.max = other.max
+
+    def variance(self):
+        """Variance populasi (sama seperti rumus jitter di script pengujian)"""
+        return self.m2 / self.count if self.count else 0.0
+
+    def std(self):
+        return math.sqrt(self.variance())
+
+    def quantile(self, percent):
+        return self.quantiles[percent].value() if percent in self.quantiles else 0.0
+
+    def sample(self):
+        """Reservoir sample untuk plotting (list kosong jika tidak diaktifkan)"""
+        return list(self.reservoir.items) if self.reservoir is not None else []
+
+    def get_stats(self):
+        stats = {
+            'count': self.count,
+            'average': self.mean,
+            'std': self.std(),
+            'min': self.min if self.min is not None else 0,
+            'max': self.max if self.max is not None else 0
+        }
+        for percent, estimator in self.quantiles.items():
+            stats[f"p{percent:g}".replace('.', '_')] = estimator.value()
+        return stats
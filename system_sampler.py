@@ -0,0 +1,121 @@
+"""
+Modul Sampler Metrik Sistem (Background)
+Mengambil sampel CPU, RSS, dan memory di thread terpisah dengan periode
+yang bisa diatur, sehingga main loop cukup membaca sampel terakhir tanpa
+pernah menunggu psutil.
+"""
+
+import threading
+import time
+
+import psutil
+
+
+class SystemMetricsSampler:
+    """
+    Sampler psutil di thread sendiri.
+    latest() mengembalikan sampel terakhir (dict) tanpa blocking.
+    """
+
+    def __init__(self, period=1.0, per_thread=True):
+        self.period = period
+        self.per_thread = per_thread
+        self.process = psutil.Process()
+        self.thread = None
+        self.stop_event = threading.Event()
+
+        self.latest_sample = None
+        self.samples_taken = 0
+        self.last_sample_time = None
+
+        # Akumulasi waktu CPU per thread (detik) untuk laporan akhir
+        self.prev_thread_times = {}
+        self.thread_cpu_seconds = {}
+        self.start_time = None
+
+    def start(self):
+        """Mulai thread sampler"""
+        if self.thread is not None:
+            return self
+        # Panggilan pertama cpu_percent(None) hanya menetapkan titik awal pengukuran
+        psutil.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None, percpu=True)
+        self.process.cpu_percent(interval=None)
+        self.prev_thread_times = self._read_thread_times()
+        self.start_time = time.time()
+        self.last_sample_time = self.start_time
+
+        self.thread = threading.Thread(target=self._run, name="SystemMetricsSampler", daemon=True)
+        self.thread.start()
+        return self
+
+    def _run(self):
+        while not self.stop_event.wait(self.period):
+            self.sample()
+
+    def _read_thread_times(self):
+        """Waktu CPU (user + system) per thread, dengan nama thread Python jika ada"""
+        if not self.per_thread:
+            return {}
+        try:
+            os_threads = self.process.threads()
+        except psutil.Error:
+            self.per_thread = False
+            return {}
+
+        names = {t.native_id: t.name for t in threading.enumerate()
+                 if getattr(t, 'native_id', None) is not None}
+        times = {}
+        for t in os_threads:
+            name = names.get(t.id, f"native-{t.id}")
+            times[name] = times.get(name, 0.0) + t.user_time + t.system_time
+        return times
+
+    def sample(self):
+        """Ambil satu sampel (dipanggil oleh thread sampler)"""
+        now = time.time()
+        elapsed = now - self.last_sample_time if self.last_sample_time else self.period
+        self.last_sample_time = now
+
+        thread_times = self._read_thread_times()
+        per_thread = {}
+        for name, cpu_time in thread_times.items():
+            delta = max(0.0, cpu_time - self.prev_thread_times.get(name, 0.0))
+            self.thread_cpu_seconds[name] = self.thread_cpu_seconds.get(name, 0.0) + delta
+            per_thread[name] = (delta / elapsed * 100) if elapsed > 0 else 0.0
+        self.prev_thread_times = thread_times
+
+        memory_info = self.process.memory_info()
+        sample = {
+            'time': now,
+            'cpu_percent': psutil.cpu_percent(interval=None),
+            'cpu_per_core': psutil.cpu_percent(interval=None, percpu=True),
+            'process_cpu_percent': self.process.cpu_percent(interval=None),
+            'cpu_per_thread': per_thread,
+            'memory_mb': memory_info.rss / 1024 / 1024,
+            'memory_percent': psutil.virtual_memory().percent
+        }
+
+        # Ganti referensi sekaligus: pembaca selalu melihat sampel yang utuh
+        self.latest_sample = sample
+        self.samples_taken += 1
+        return sample
+
+    def latest(self):
+        """Sampel terakhir (None jika belum ada), tidak pernah blocking"""
+        return self.latest_sample
+
+    def get_thread_breakdown(self):
+        """Rata-rata CPU% per thread sejak sampler dimulai"""
+        duration = time.time() - self.start_time if self.start_time else 0.0
+        if duration <= 0:
+            return {}
+        breakdown = {name: seconds / duration * 100
+                     for name, seconds in self.thread_cpu_seconds.items()}
+        return dict(sorted(breakdown.items(), key=lambda item: item[1], reverse=True))
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=self.period + 1.0)
+            self.thread = None
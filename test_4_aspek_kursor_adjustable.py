@@ -1,8 +1,13 @@
-from cvzone.HandTrackingModule import HandDetector
+from mediapipe_detector import create_hand_detector
 import cv2
 import math
-from pynput.mouse import Button, Controller
-import screeninfo
+from mouse_backend import get_screen_size
+from frame_source import camera_options, open_frame_source, parse_source_args
+from cursor_filter import create_cursor_filter, next_filter_name
+from hand_transform import find_hands
+from preview import Preview
+from cursor_metrics import FilterComparison
+from streaming_stats import RunningStats, Reservoir
 import time
 from datetime import datetime
 import json
@@ -23,11 +28,25 @@ print(f"Edge Detection Range     : < {EDGE_HIT_THRESHOLD} px dari edge")
 print("="*80 + "\n")
 
 # Inisialisasi
-mouse = Controller()
-screen = screeninfo.get_monitors()[0]
-screen_width, screen_height = screen.width, screen.height
-cap = cv2.VideoCapture(0)
-detector = HandDetector(detectionCon=0.3, maxHands=2)
+# --source 0 (kamera) | video.mp4 | rekaman.jsonl, --pace realtime|fast
+source_args = parse_source_args()
+# Resolusi layar: dari monitor untuk pynput, --screen-size untuk null/recorder
+screen_width, screen_height = get_screen_size(source_args.mouse, source_args.screen_size)
+cap = open_frame_source(source_args.source, pace=source_args.pace, loop=source_args.loop,
+                        camera=camera_options(source_args))
+# Rekaman landmark (.jsonl) tidak butuh detector: hasil deteksi diputar ulang dari file
+detector = None
+if cap.needs_detector:
+    detector = create_hand_detector(source_args.detector, detectionCon=0.3, maxHands=2,
+                                    roi=source_args.roi, motion_gate=source_args.motion_gate,
+                                    idle_timeout=source_args.idle_timeout,
+                                    inference_size=source_args.inference_size,
+                                    mirror=source_args.mirror_landmarks, predict=source_args.predict,
+                                    predict_horizon_ms=source_args.predict_horizon)
+detector = cap.wrap_detector(detector, record_path=source_args.record_landmarks)
+
+# Filter posisi kursor (--cursor-filter none|ema|deadzone|one-euro)
+cursor_filter = create_cursor_filter(source_args.cursor_filter)
 
 # Testing modes
 testing_mode = None
@@ -37,11 +56,27 @@ current_target_index = 0
 # Data collectors
 class CursorTestingData:
     def __init__(self):
-        self.precision_data = []
-        self.smoothness_data = []
-        self.edge_data = []
-        self.rapid_data = []
-        self.frame_times = []
+        # Statistik streaming (memori tetap), tidak menyimpan semua sampel
+        self.precision_deviation = RunningStats()
+        self.precision_latency = RunningStats()
+        self.precision_hits = 0
+        
+        self.smoothness_steps = RunningStats()  # Jarak antar posisi berurutan (untuk jitter)
+        self.smoothness_latency = RunningStats()
+        self.smoothness_positions = Reservoir(500)  # Sampel posisi untuk plotting
+        self.last_smoothness_pos = None
+        self.filter_comparison = FilterComparison()  # Semua filter kursor pada input mentah yang sama
+        
+        self.edge_deviation = RunningStats()
+        self.edge_latency = RunningStats()
+        self.edge_hits = 0
+        
+        self.rapid_distance = RunningStats()
+        self.rapid_time = RunningStats()
+        self.rapid_speed = RunningStats()
+        self.rapid_successful = 0
+        
+        self.frame_times = RunningStats()
         
     def add_precision(self, target_pos, cursor_pos, time_ms):
         """Precision Pointing - Target kecil di layar"""
@@ -49,21 +84,20 @@ class CursorTestingData:
                               target_pos[1] - cursor_pos[1])
         hit = deviation < PRECISION_HIT_THRESHOLD
         
-        self.precision_data.append({
-            'target': target_pos,
-            'cursor': cursor_pos,
-            'deviation': deviation,
-            'latency_ms': time_ms,
-            'hit': hit
-        })
+        self.precision_deviation.add(deviation)
+        self.precision_latency.add(time_ms)
+        if hit:
+            self.precision_hits += 1
         return hit, deviation
     
     def add_smoothness(self, cursor_pos, time_ms):
         """Cursor Smoothness - Gerakan halus"""
-        self.smoothness_data.append({
-            'position': cursor_pos,
-            'time': time_ms
-        })
+        if self.last_smoothness_pos is not None:
+            prev = self.last_smoothness_pos
+            self.smoothness_steps.add(math.hypot(cursor_pos[0] - prev[0], cursor_pos[1] - prev[1]))
+        self.last_smoothness_pos = cursor_pos
+        self.smoothness_latency.add(time_ms)
+        self.smoothness_positions.add(cursor_pos)
     
     def add_edge(self, edge_point, cursor_pos, time_ms):
         """Edge Detection - Batas layar"""
@@ -76,13 +110,10 @@ class CursorTestingData:
         deviation = math.hypot(edge_point[0] - cursor_pos[0], 
                               edge_point[1] - cursor_pos[1])
         
-        self.edge_data.append({
-            'target_edge': edge_point,
-            'cursor': cursor_pos,
-            'deviation': deviation,
-            'latency_ms': time_ms,
-            'at_edge': at_edge
-        })
+        self.edge_deviation.add(deviation)
+        self.edge_latency.add(time_ms)
+        if at_edge:
+            self.edge_hits += 1
         return at_edge, deviation
     
     def add_rapid(self, start_pos, end_pos, time_ms):
@@ -91,47 +122,32 @@ class CursorTestingData:
                              end_pos[1] - start_pos[1])
         speed = (distance / time_ms * 1000) if time_ms > 0 else 0
         
-        self.rapid_data.append({
-            'start': start_pos,
-            'end': end_pos,
-            'distance': distance,
-            'time_ms': time_ms,
-            'speed_px_per_s': speed
-        })
+        self.rapid_distance.add(distance)
+        self.rapid_time.add(time_ms)
+        self.rapid_speed.add(speed)
+        if distance > RAPID_DISTANCE_THRESHOLD and time_ms < RAPID_TIME_THRESHOLD:
+            self.rapid_successful += 1
         return distance, speed
     
-    def calculate_jitter(self, data_list):
-        """Calculate jitter from position data"""
-        if len(data_list) < 3:
+    def calculate_jitter(self):
+        """Jitter = standar deviasi jarak antar posisi berurutan"""
+        if self.smoothness_steps.count < 2:
             return 0.0
-        
-        distances = []
-        for i in range(1, len(data_list)):
-            prev = data_list[i-1]['position']
-            curr = data_list[i]['position']
-            dist = math.hypot(curr[0] - prev[0], curr[1] - prev[1])
-            distances.append(dist)
-        
-        if not distances:
-            return 0.0
-        
-        mean_dist = sum(distances) / len(distances)
-        variance = sum((d - mean_dist) ** 2 for d in distances) / len(distances)
-        jitter = math.sqrt(variance)
-        return jitter
+        return self.smoothness_steps.std()
     
     def get_precision_stats(self):
         """Statistics for Precision Pointing"""
-        if not self.precision_data:
+        count = self.precision_deviation.count
+        if count == 0:
             return None
         
-        hits = sum(1 for d in self.precision_data if d['hit'])
-        accuracy = (hits / len(self.precision_data)) * 100
-        avg_deviation = sum(d['deviation'] for d in self.precision_data) / len(self.precision_data)
-        avg_latency = sum(d['latency_ms'] for d in self.precision_data) / len(self.precision_data)
+        hits = self.precision_hits
+        accuracy = (hits / count) * 100
+        avg_deviation = self.precision_deviation.mean
+        avg_latency = self.precision_latency.mean
         
         return {
-            'count': len(self.precision_data),
+            'count': count,
             'accuracy': accuracy,
             'avg_deviation': avg_deviation,
             'avg_latency': avg_latency,
@@ -140,20 +156,17 @@ class CursorTestingData:
     
     def get_smoothness_stats(self):
         """Statistics for Cursor Smoothness"""
-        if len(self.smoothness_data) < 3:
+        count = self.smoothness_latency.count
+        if count < 3:
             return None
         
-        jitter = self.calculate_jitter(self.smoothness_data)
+        jitter = self.calculate_jitter()
         smoothness_score = max(0, 100 - jitter * 2)
         
-        times = [d['time'] for d in self.smoothness_data]
-        if len(times) > 1:
-            avg_latency = sum(times) / len(times)
-        else:
-            avg_latency = times[0] if times else 0
+        avg_latency = self.smoothness_latency.mean
         
         return {
-            'count': len(self.smoothness_data),
+            'count': count,
             'jitter': jitter,
             'smoothness_score': smoothness_score,
             'avg_latency': avg_latency
@@ -161,16 +174,17 @@ class CursorTestingData:
     
     def get_edge_stats(self):
         """Statistics for Edge Detection"""
-        if not self.edge_data:
+        count = self.edge_deviation.count
+        if count == 0:
             return None
         
-        edge_hits = sum(1 for d in self.edge_data if d['at_edge'])
-        accuracy = (edge_hits / len(self.edge_data)) * 100
-        avg_deviation = sum(d['deviation'] for d in self.edge_data) / len(self.edge_data)
-        avg_latency = sum(d['latency_ms'] for d in self.edge_data) / len(self.edge_data)
+        edge_hits = self.edge_hits
+        accuracy = (edge_hits / count) * 100
+        avg_deviation = self.edge_deviation.mean
+        avg_latency = self.edge_latency.mean
         
         return {
-            'count': len(self.edge_data),
+            'count': count,
             'accuracy': accuracy,
             'avg_deviation': avg_deviation,
             'avg_latency': avg_latency,
@@ -179,21 +193,20 @@ class CursorTestingData:
     
     def get_rapid_stats(self):
         """Statistics for Rapid Movement - MENGGUNAKAN THRESHOLD YANG DIKONFIGURASI"""
-        if not self.rapid_data:
+        count = self.rapid_distance.count
+        if count == 0:
             return None
         
-        avg_distance = sum(d['distance'] for d in self.rapid_data) / len(self.rapid_data)
-        avg_time = sum(d['time_ms'] for d in self.rapid_data) / len(self.rapid_data)
-        avg_speed = sum(d['speed_px_per_s'] for d in self.rapid_data) / len(self.rapid_data)
+        avg_distance = self.rapid_distance.mean
+        avg_time = self.rapid_time.mean
+        avg_speed = self.rapid_speed.mean
         
-        # Accuracy based on CONFIGURABLE thresholds
-        successful = sum(1 for d in self.rapid_data 
-                        if d['distance'] > RAPID_DISTANCE_THRESHOLD and 
-                           d['time_ms'] < RAPID_TIME_THRESHOLD)
-        accuracy = (successful / len(self.rapid_data)) * 100 if self.rapid_data else 0
+        # Gerakan sukses dihitung saat data ditambahkan (threshold yang dikonfigurasi)
+        successful = self.rapid_successful
+        accuracy = (successful / count) * 100
         
         return {
-            'count': len(self.rapid_data),
+            'count': count,
             'accuracy': accuracy,
             'avg_distance': avg_distance,
             'avg_time_ms': avg_time,
@@ -258,7 +271,12 @@ class CursorTestingData:
                 f.write(f"Jumlah Tes         : {smoothness['count']}x gerakan\n")
                 f.write(f"Smoothness Score   : {smoothness['smoothness_score']:.2f}/100\n")
                 f.write(f"Latency Rata-rata  : {smoothness['avg_latency']:.2f} ms\n")
-                f.write(f"Jitter             : {smoothness['jitter']:.2f} px\n\n")
+                f.write(f"Jitter             : {smoothness['jitter']:.2f} px\n")
+                f.write(f"Filter Kursor      : {cursor_filter.name}\n\n")
+                f.write("Perbandingan Filter (input mentah yang sama):\n")
+                for line in self.filter_comparison.format_table(active=cursor_filter.name):
+                    f.write("  " + line + "\n")
+                f.write("\n")
                 
                 # Kategori
                 if smoothness['smoothness_score'] >= 90:
@@ -419,8 +437,10 @@ def generate_targets(mode, img_shape):
 
 # Main loop variables
 window_name = "Cursor Testing - 4 Aspek (Adjustable Threshold)"
-cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-cv2.setWindowProperty(window_name, cv2.WND_PROP_TOPMOST, 1) #kamernya selalu didepan
+# Window preview (--headless: tanpa window dan tanpa gambar, tombol dari stdin)
+preview = Preview(window_name, headless=source_args.headless, control_port=source_args.control_port,
+                  render_fps=source_args.preview_fps, key_hz=source_args.key_hz,
+                  topmost=True) #kamernya selalu didepan
 
 rapid_start_pos = None
 rapid_start_time = None
@@ -437,10 +457,45 @@ print("\nKONTROL:")
 print("  P - Record hit/point")
 print("  R - Reset current mode")
 print("  S - Show statistics")
+print("  K - Ganti filter kursor (none/ema/deadzone/one-euro)")
 print("  Q - Quit & save report")
 print("\n" + "="*80 + "\n")
 
 frame_count = 0
+cursor_pos = None
+
+# Teks mode
+mode_text = {
+    'precision': 'MODE 1: Precision Pointing',
+    'smoothness': 'MODE 2: Cursor Smoothness',
+    'edge': 'MODE 3: Edge Detection',
+    'rapid': f'MODE 4: Rapid Movement (<{RAPID_TIME_THRESHOLD}ms)',
+    None: 'Tekan 1/2/3/4 untuk pilih mode'
+}
+
+# Target + teks mode (layer statis, lihat StaticLayer di preview.py)
+test_layer = preview.static_layer()
+
+
+def draw_test_layer(overlay):
+    """Gambar target pengujian dan teks mode/progres target"""
+    if testing_mode and test_targets:
+        for i, target in enumerate(test_targets):
+            if len(target) == 3:
+                x, y, radius = target
+                color = (0, 255, 0) if i == current_target_index else (150, 150, 150)
+                overlay.circle((x, y), radius, color, 2)
+                overlay.circle((x, y), 3, color, -1)
+                overlay.putText(str(i+1), (x-10, y-radius-10), 
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+    
+    overlay.putText(mode_text[testing_mode], (10, 30), 
+               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+    
+    if testing_mode and test_targets:
+        overlay.putText(f"Target: {current_target_index+1}/{len(test_targets)} | Tekan P untuk record", 
+                   (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
+
 
 while True:
     frame_start = time.time()
@@ -448,21 +503,19 @@ while True:
     if not success:
         break
     
-    img = cv2.flip(img, 1)
-    hands, img = detector.findHands(img, draw=True, flipType=False)
+    # Mirror frame penuh, atau (--mirror-landmarks) hanya landmark lalu flip preview
+    if not source_args.mirror_landmarks:
+        img = cv2.flip(img, 1)
+    hands, img = find_hands(detector, img, draw=preview.enabled, flipType=False, timestamp=cap.last_timestamp)
+    if source_args.mirror_landmarks and preview.enabled:
+        img = cv2.flip(img, 1)
+    overlay = preview.overlay(img)
     
     frame_time_ms = (time.time() - frame_start) * 1000
     
-    # Draw targets
-    if testing_mode and test_targets:
-        for i, target in enumerate(test_targets):
-            if len(target) == 3:
-                x, y, radius = target
-                color = (0, 255, 0) if i == current_target_index else (150, 150, 150)
-                cv2.circle(img, (x, y), radius, color, 2)
-                cv2.circle(img, (x, y), 3, color, -1)
-                cv2.putText(img, str(i+1), (x-10, y-radius-10), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+    # Target dan teks mode: layer statis, digambar ulang hanya saat mode/target berubah
+    test_layer.update((testing_mode, current_target_index, tuple(test_targets)), img.shape, draw_test_layer)
+    overlay.blend(test_layer)
     
     # Process hand tracking
     if len(hands) == 1:
@@ -470,34 +523,26 @@ while True:
         lmList = hand["lmList"]
         if lmList:
             x3, y3 = lmList[12][0], lmList[12][1]
-            cv2.circle(img, (x3, y3), 8, (255, 0, 255), cv2.FILLED)
+            # --predict: kursor dari posisi prediksi (landmark terukur tetap di lmList)
+            if hand.get('lmPredicted') is not None:
+                x3, y3 = int(hand['lmPredicted'][12, 0]), int(hand['lmPredicted'][12, 1])
+            cursor_x, cursor_y = cursor_filter.filter(x3, y3, time.time())
+            cursor_pos = (int(cursor_x), int(cursor_y))
+
+            # Draw cursor indicator (posisi setelah filter)
+            overlay.circle(cursor_pos, 8, (255, 0, 255), cv2.FILLED)
             
             if testing_mode == 'smoothness':
-                test_data.add_smoothness((x3, y3), frame_time_ms)
+                test_data.add_smoothness(cursor_pos, frame_time_ms)
+                test_data.filter_comparison.add(x3, y3, time.time())
                 frame_count += 1
                 if frame_count >= 100:
                     print(f"✓ 100 gerakan tercatat untuk smoothness")
                     frame_count = 0
     
-    # Display mode info
-    mode_text = {
-        'precision': 'MODE 1: Precision Pointing',
-        'smoothness': 'MODE 2: Cursor Smoothness',
-        'edge': 'MODE 3: Edge Detection',
-        'rapid': f'MODE 4: Rapid Movement (<{RAPID_TIME_THRESHOLD}ms)',
-        None: 'Tekan 1/2/3/4 untuk pilih mode'
-    }
-    
-    cv2.putText(img, mode_text[testing_mode], (10, 30), 
-               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-    
-    if testing_mode and test_targets:
-        cv2.putText(img, f"Target: {current_target_index+1}/{len(test_targets)} | Tekan P untuk record", 
-                   (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
-    
-    cv2.imshow(window_name, img)
+    preview.show(img, overlay)
     
-    key = cv2.waitKey(1) & 0xFF
+    key = preview.wait_key()
     
     # Mode selection
     if key == ord('1'):
@@ -528,9 +573,7 @@ while True:
     # Record point
     elif key == ord('p') or key == ord('P'):
         if len(hands) == 1 and testing_mode and test_targets:
-            hand = hands[0]
-            lmList = hand["lmList"]
-            x3, y3 = lmList[12][0], lmList[12][1]
+            x3, y3 = cursor_pos
             
             target = test_targets[current_target_index]
             target_pos = (target[0], target[1])
@@ -597,6 +640,9 @@ while True:
         smoothness = test_data.get_smoothness_stats()
         if smoothness:
             print(f"\n2. Smoothness: {smoothness['count']} tests, Score {smoothness['smoothness_score']:.2f}/100, {smoothness['avg_latency']:.2f}ms")
+            print(f"   Filter aktif: {cursor_filter.name}")
+            for line in test_data.filter_comparison.format_table(active=cursor_filter.name):
+                print("   " + line)
         
         edge = test_data.get_edge_stats()
         if edge:
@@ -608,6 +654,10 @@ while True:
         
         print("="*80 + "\n")
     
+    elif key == ord('k') or key == ord('K'):
+        cursor_filter = create_cursor_filter(next_filter_name(cursor_filter.name))
+        print(f"✓ Filter kursor: {cursor_filter.name}")
+    
     elif key == ord('q') or key == ord('Q'):
         break
 
@@ -615,7 +665,7 @@ print("\n✓ Menyimpan laporan...")
 test_data.save_report('laporan_pengujian_kontrol_kursor_lengkap.txt')
 
 cap.release()
-cv2.destroyAllWindows()
+preview.close()
 
 print("\n" + "="*80)
 print("PENGUJIAN SELESAI!")
@@ -0,0 +1,189 @@
+"""
+Modul Capture Kamera Berbasis Thread
+Membaca frame kamera di thread terpisah dan menyimpannya di ring buffer kecil,
+sehingga main loop selalu mendapat frame TERBARU tanpa menunggu I/O kamera
+"""
+
+import threading
+import time
+from collections import deque
+
+import cv2
+
+
+class ThreadedCapture:
+    """
+    Pengganti cv2.VideoCapture yang membaca kamera di thread sendiri.
+
+    read() tetap kompatibel dengan cv2.VideoCapture.read() -> (success, img),
+    tetapi selalu mengembalikan frame terbaru. Frame lama yang belum sempat
+    diproses dibuang dan dihitung sebagai frame_dropped.
+    """
+
+    def __init__(self, src=0, buffer_size=2, read_timeout=2.0):
+        self.cap = cv2.VideoCapture(src)
+        self.buffer = deque(maxlen=max(1, buffer_size))  # (seq, timestamp, frame)
+        self.read_timeout = read_timeout
+
+        # cap_lock melindungi akses ke cv2.VideoCapture (read/set/get)
+        self.cap_lock = threading.Lock()
+        self.frame_ready = threading.Condition()
+        self.thread = None
+        self.running = False
+        self.stopped = False
+
+        # Nomor urut frame terakhir yang ditangkap dan yang sudah dibaca
+        self.seq = 0
+        self.last_read_seq = 0
+
+        # Hanya 1 dari N frame yang di-decode (mode hemat daya), sisanya cukup grab()
+        self.retrieve_interval = 1
+        self.grab_count = 0
+
+        # Counter untuk laporan
+        self.frames_captured = 0
+        self.frames_consumed = 0
+        self.frames_dropped = 0   # frame yang tidak pernah diambil consumer
+        self.overruns = 0         # ring buffer penuh saat frame baru masuk
+        self.read_failures = 0
+
+    def start(self):
+        """Mulai thread capture (otomatis dipanggil saat read() pertama)"""
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self._update, name="ThreadedCapture", daemon=True)
+            self.thread.start()
+        return self
+
+    def _update(self):
+        """Loop thread capture: baca kamera terus-menerus"""
+        while self.running:
+            with self.cap_lock:
+                self.grab_count += 1
+                if self.retrieve_interval > 1 and self.grab_count % self.retrieve_interval:
+                    # grab() menjaga buffer driver tetap segar tanpa biaya decode
+                    if self.cap.grab():
+                        continue
+                    success, frame = False, None
+                else:
+                    success, frame = self.cap.read()
+            timestamp = time.time()
+
+            with self.frame_ready:
+                if not success:
+                    self.read_failures += 1
+                    self.stopped = True
+                    self.frame_ready.notify_all()
+                    break
+
+                if len(self.buffer) == self.buffer.maxlen:
+                    self.overruns += 1
+                self.seq += 1
+                self.frames_captured += 1
+                self.buffer.append((self.seq, timestamp, frame))
+                self.frame_ready.notify_all()
+
+    def read_latest(self, timeout=None):
+        """
+        Ambil frame terbaru beserta timestamp capture-nya.
+        Menunggu sampai ada frame yang lebih baru dari pembacaan sebelumnya.
+        Return: (success, img, timestamp)
+        """
+        if self.thread is None:
+            self.start()
+        if timeout is None:
+            timeout = self.read_timeout
+
+        with self.frame_ready:
+            has_new = self.frame_ready.wait_for(
+                lambda: self.seq > self.last_read_seq or self.stopped, timeout)
+            if not has_new or self.seq == self.last_read_seq:
+                return False, None, None
+
+            seq, timestamp, frame = self.buffer[-1]
+            # Semua frame di antara pembacaan terakhir dan frame terbaru dibuang
+            self.frames_dropped += seq - self.last_read_seq - 1
+            self.frames_consumed += 1
+            self.last_read_seq = seq
+
+        return True, frame, timestamp
+
+    def read(self):
+        """Kompatibel dengan cv2.VideoCapture.read()"""
+        success, frame, _ = self.read_latest()
+        return success, frame
+
+    def set_retrieve_interval(self, interval):
+        """Decode hanya 1 dari setiap `interval` frame kamera (1 = semua frame)"""
+        with self.cap_lock:
+            self.retrieve_interval = max(1, int(interval))
+            self.grab_count = 0
+
+    def configure(self, size=None, fps=None, fourcc=None):
+        """
+        Atur mode kamera sebelum capture dimulai.
+        size=(w, h), fps, fourcc='MJPG'/'YUYV'. Return: mode yang benar-benar dipakai driver.
+        """
+        with self.cap_lock:
+            # FOURCC diatur lebih dulu: beberapa driver hanya menerima resolusi tinggi di MJPG
+            if fourcc:
+                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+            if size:
+                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, size[0])
+                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, size[1])
+            if fps:
+                self.cap.set(cv2.CAP_PROP_FPS, fps)
+            return self._current_mode()
+
+    def _current_mode(self):
+        code = int(self.cap.get(cv2.CAP_PROP_FOURCC))
+        return {
+            'width': int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': self.cap.get(cv2.CAP_PROP_FPS),
+            'fourcc': ''.join(chr((code >> 8 * i) & 0xFF) for i in range(4)).strip('\x00') if code > 0 else ''
+        }
+
+    def measure_fps(self, frames=20, warmup=5):
+        """Ukur FPS nyata kamera (hanya sebelum thread capture berjalan)"""
+        with self.cap_lock:
+            for _ in range(warmup):
+                if not self.cap.read()[0]:
+                    return 0.0
+            t0 = time.perf_counter()
+            for _ in range(frames):
+                if not self.cap.read()[0]:
+                    return 0.0
+            return frames / (time.perf_counter() - t0)
+
+    def set(self, prop_id, value):
+        with self.cap_lock:
+            return self.cap.set(prop_id, value)
+
+    def get(self, prop_id):
+        with self.cap_lock:
+            return self.cap.get(prop_id)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def get_stats(self):
+        """Counter capture untuk laporan performa"""
+        with self.frame_ready:
+            return {
+                'frames_captured': self.frames_captured,
+                'frames_consumed': self.frames_consumed,
+                'frames_dropped': self.frames_dropped,
+                'overruns': self.overruns,
+                'read_failures': self.read_failures,
+                'buffer_size': self.buffer.maxlen
+            }
+
+    def release(self):
+        """Hentikan thread dan lepaskan kamera"""
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        with self.cap_lock:
+            self.cap.release()
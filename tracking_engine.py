@@ -0,0 +1,388 @@
+"""
+Modul Tracking Engine
+Satu loop tracking untuk semua skrip virtual mouse. Setiap frame melewati
+tahap yang sama:
+  source (capture + mirror) -> detector -> features -> gestures ->
+  filter kursor -> actuator (mouse) -> renderer (preview + tombol)
+Perbedaan antar skrip (landmark kursor, cooldown gesture, gesture keluar,
+klik kanan) hanya berupa konfigurasi. Metrik pengujian dipasang sebagai sink:
+  frame_sinks   : sink(frame) setiap frame selesai diproses
+  gesture_sinks : sink(nama, frame) setiap event gesture
+  draw_sinks    : sink(frame, overlay) untuk teks/indikator di preview
+Latency tiap tahap (capture/detect/gesture/actuation/render) dicatat ke
+StageLatencyRecorder, sehingga hot path yang sama dibenchmark dari skrip mana pun
+(--profile-stages mencetak tabelnya saat selesai).
+"""
+
+import threading
+import time
+
+import cv2
+
+from async_mouse import wrap_mouse
+from cursor_filter import create_cursor_filter
+from frame_source import camera_options, open_frame_source
+from gesture_rules import GestureEvaluator
+from hand_features import THUMB_TIP, INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP, get_hand_features
+from hand_transform import find_hands
+from latency_histogram import StageLatencyRecorder
+from mediapipe_detector import create_hand_detector
+from mouse_backend import Button, create_mouse, get_screen_size
+from pipeline import Pipeline
+from preview import Preview
+
+
+BOTH_HANDS_RAISED_DURATION = 3.0  # Detik kedua tangan terangkat untuk keluar program
+
+
+class TrackingEngine:
+    """
+    Konfigurasi:
+      max_hands           : 2 jika gesture keluar (kedua tangan terangkat) dipakai
+      cursor_landmark     : landmark penggerak kursor (INDEX_TIP / MIDDLE_TIP)
+      exit_gesture        : kedua tangan terangkat BOTH_HANDS_RAISED_DURATION detik = keluar
+      gesture_cooldown    : None = cooldown per gesture dari GESTURE_RULES,
+                            angka = jeda bersama antar event gesture (detik)
+      move_event_interval : event 'move_cursor' ke sink setiap N detik (None = tidak ada)
+      right_click         : jempol + jari manis = klik kanan
+      stage_latency       : StageLatencyRecorder tujuan (default: milik engine)
+    Kontrol gesture hanya jika tepat satu tangan terdeteksi.
+    """
+
+    def __init__(self, source_args, window_name, max_hands=2, cursor_landmark=MIDDLE_TIP,
+                 exit_gesture=True, gesture_cooldown=None, move_event_interval=None,
+                 right_click=False, topmost=True, stage_latency=None):
+        self.args = source_args
+        self.cursor_landmark = cursor_landmark
+        self.exit_gesture = exit_gesture
+        self.gesture_cooldown = gesture_cooldown
+        self.move_event_interval = move_event_interval
+        self.right_click = right_click
+
+        # Resolusi layar: dari monitor untuk pynput, --screen-size untuk null/recorder
+        self.screen_width, self.screen_height = get_screen_size(source_args.mouse, source_args.screen_size)
+
+        # Source: --source 0 (kamera) | video.mp4 | rekaman.jsonl, --pace realtime|fast
+        self.cap = open_frame_source(source_args.source, pace=source_args.pace, loop=source_args.loop,
+                                     camera=camera_options(source_args))
+
+        # Detector (tidak dibuat untuk rekaman landmark: hasil deteksi diputar ulang dari file)
+        detector = None
+        if self.cap.needs_detector:
+            detector = create_hand_detector(source_args.detector, detectionCon=0.3, maxHands=max_hands,
+                                            roi=source_args.roi, motion_gate=source_args.motion_gate,
+                                            idle_timeout=source_args.idle_timeout,
+                                            inference_size=source_args.inference_size,
+                                            mirror=source_args.mirror_landmarks, predict=source_args.predict,
+                                            predict_horizon_ms=source_args.predict_horizon)
+        self.detector = self.cap.wrap_detector(detector, record_path=source_args.record_landmarks)
+
+        # Gestures (tabel dikompilasi sekali) dan filter kursor (--cursor-filter)
+        self.gesture_evaluator = GestureEvaluator()
+        self.cursor_filter = create_cursor_filter(source_args.cursor_filter)
+
+        # Metrik latency per tahap
+        self.stage_latency = stage_latency if stage_latency is not None else StageLatencyRecorder()
+
+        # Actuator: backend --mouse pynput|null|recorder, aktuasi di thread terpisah
+        # (--sync-mouse: langsung di loop), latency setiap panggilan ke tahap 'actuation'
+        self.mouse = wrap_mouse(create_mouse(source_args.mouse, source_args.mouse_events), self.stage_latency,
+                                async_mode=not source_args.sync_mouse, min_move=source_args.min_move_px,
+                                interpolate_hz=source_args.interpolate_hz)
+        self.mouse_closed = False
+
+        # Renderer (--headless: tanpa window dan tanpa gambar, tombol dari stdin)
+        self.preview = Preview(window_name, headless=source_args.headless,
+                               control_port=source_args.control_port,
+                               render_fps=source_args.preview_fps, key_hz=source_args.key_hz,
+                               topmost=topmost)
+
+        # Status kontrol
+        self.scroll_active = True
+        self.gestures_enabled = True  # False = scroll dan klik dimatikan
+        self.both_hands_raised_start_time = None
+        self.last_event_time = time.time()
+        self.running = False
+
+        # Sink metrik dan tombol
+        self.frame_sinks = []
+        self.gesture_sinks = []
+        self.draw_sinks = []
+        self.key_bindings = {}
+        self.bind_key('q', self.stop)
+        # Mode pipeline: key handler (main thread) tidak berjalan bersamaan dengan
+        # tahap kontrol (thread kontrol), karena keduanya mengubah status yang sama
+        self.control_lock = threading.Lock()
+
+    # ============= KONFIGURASI =============
+    def bind_key(self, keys, handler):
+        """
+        handler(frame) dipanggil saat salah satu karakter di keys ditekan.
+        Handler memegang control_lock, jadi boleh mengubah scroll_active,
+        gestures_enabled, cursor_filter, atau memanggil set_stage_latency.
+        """
+        for key in keys:
+            self.key_bindings[ord(key)] = handler
+
+    def set_stage_latency(self, recorder):
+        """Ganti recorder latency (mis. setelah statistik direset)"""
+        self.stage_latency = recorder
+        self.mouse.recorder = recorder
+
+    def stop(self, frame=None):
+        self.running = False
+
+    # ============= TAHAP =============
+    def _capture(self):
+        """Source: frame terbaru (None jika sumber habis)"""
+        t_start = time.time()
+        success, img = self.cap.read()
+        if not success:
+            return None
+        t_captured = time.time()
+        self.stage_latency.record('capture', (t_captured - t_start) * 1000)
+        return {'img': img, 't_start': t_start, 't_captured': t_captured, 'exit': False}
+
+    def _detect(self, frame):
+        """Detector: mirror frame penuh, atau (--mirror-landmarks) hanya landmark lalu flip preview"""
+        img = frame['img']
+        if not self.args.mirror_landmarks:
+            img = cv2.flip(img, 1)
+        # Timestamp capture frame ini (bukan status sumber: thread capture sudah membaca frame berikutnya)
+        hands, img = find_hands(self.detector, img, draw=self.preview.enabled, timestamp=frame['t_captured'])
+        if self.args.mirror_landmarks and self.preview.enabled:
+            img = cv2.flip(img, 1)
+        frame['img'] = img
+        frame['hands'] = hands
+        frame['t_detected'] = time.time()
+        self.stage_latency.record('detect', (frame['t_detected'] - frame['t_captured']) * 1000)
+        return frame
+
+    def _control(self, frame):
+        """Features -> gestures -> filter -> actuator untuk satu frame"""
+        with self.control_lock:
+            return self._control_frame(frame)
+
+    def _control_frame(self, frame):
+        now = frame['t_detected']
+        hands = frame['hands']
+        frame['overlay'] = self.preview.overlay(frame['img'])
+        frame['cursor_pos'] = None
+
+        # Status gesture hanya berlaku untuk satu tangan yang sama: tanpa tangan
+        # atau dengan dua tangan, edge/hysteresis dimulai ulang
+        single_hand = len(hands) == 1 and hands[0]['lmList']
+        if not single_hand:
+            self.gesture_evaluator.reset()
+            # Kursor berhenti: gerak kecil terakhir yang masih ditahan tetap dikirim
+            self.mouse.flush()
+
+        # Sekali diminta keluar, frame berikutnya (mode pipeline) ikut membawa tanda keluar
+        if not self.running or (self.exit_gesture and self._check_exit(frame, now)):
+            frame['exit'] = True
+            return frame
+
+        if single_hand:
+            self._control_hand(frame, hands[0], now)
+
+        frame['t_controlled'] = time.time()
+        # Latency klasifikasi gesture (tanpa waktu aktuasi mouse)
+        gesture_ms = (frame['t_controlled'] - now) * 1000 - self.mouse.take_frame_ms()
+        self.stage_latency.record('gesture', max(0.0, gesture_ms))
+        return frame
+
+    def _check_exit(self, frame, now):
+        """Gesture keluar: kedua tangan terangkat (semua ujung jari di atas pergelangan)"""
+        hands = frame['hands']
+        raised = len(hands) == 2 and all(
+            self.gesture_evaluator.matches(get_hand_features(hand), 'hand_raised') for hand in hands)
+        if not raised:
+            self.both_hands_raised_start_time = None
+            return False
+
+        if self.both_hands_raised_start_time is None:
+            self.both_hands_raised_start_time = now
+            print(f"🙌 Kedua tangan terangkat! Tahan selama {BOTH_HANDS_RAISED_DURATION:.0f} detik untuk keluar...")
+
+        # Countdown di tengah layar (warna merah, besar)
+        duration = now - self.both_hands_raised_start_time
+        countdown = max(0, BOTH_HANDS_RAISED_DURATION - duration)
+        img = frame['img']
+        frame['overlay'].putText(f"KELUAR DALAM: {countdown:.1f}s", (img.shape[1]//2 - 150, img.shape[0]//2),
+                                 cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 255), 3)
+        if duration < BOTH_HANDS_RAISED_DURATION:
+            return False
+
+        print("👋 Keluar program...")
+        return True
+
+    def _triggered(self, gestures, name, now):
+        """Gesture baru mulai aktif dan lolos cooldown (sekali per gesture, juga untuk aturan 'level')"""
+        if self.gesture_cooldown is None:
+            # Trigger dan cooldown per gesture dari tabel GESTURE_RULES; aturan 'level'
+            # (scroll) aktif setiap frame, tetapi event hanya di frame pertama
+            if self.gesture_evaluator.is_edge(name):
+                return gestures.fired(name)
+            return gestures.started(name) and gestures.fired(name)
+        if gestures.started(name) and now - self.last_event_time > self.gesture_cooldown:
+            self.last_event_time = now
+            return True
+        return False
+
+    def _emit(self, name, frame):
+        for sink in self.gesture_sinks:
+            sink(name, frame)
+
+    def _control_hand(self, frame, hand, now):
+        overlay = frame['overlay']
+        img = frame['img']
+
+        # Features: semua fitur landmark dihitung sekali (vectorized) per frame
+        features = get_hand_features(hand)
+        thumb = features.point(THUMB_TIP)
+        index = features.point(INDEX_TIP)
+        ring = features.point(RING_TIP)
+        pinky = features.point(PINKY_TIP)
+        cursor = features.point(self.cursor_landmark)
+        # --predict: kursor dari posisi prediksi, gesture tetap dari landmark terukur
+        predicted = hand.get('lmPredicted')
+        if predicted is not None:
+            cursor = (int(predicted[self.cursor_landmark, 0]), int(predicted[self.cursor_landmark, 1]))
+
+        # Gestures: semua aturan dievaluasi sekaligus dari tabel
+        gestures = self.gesture_evaluator.evaluate(features, now)
+        frame['features'] = features
+        frame['gestures'] = gestures
+
+        # Visualisasi landmark (kursor hijau)
+        overlay.circle(thumb, 5, (255, 0, 255), cv2.FILLED)
+        overlay.circle(index, 5, (255, 0, 255), cv2.FILLED)
+        overlay.circle(pinky, 5, (255, 0, 255), cv2.FILLED)
+        overlay.line(thumb, index, (255, 0, 255), 3)
+        overlay.line(thumb, pinky, (255, 0, 255), 3)
+        if self.right_click:
+            overlay.circle(ring, 5, (0, 255, 0), cv2.FILLED)
+            overlay.line(thumb, ring, (0, 255, 0), 3)
+        overlay.circle(cursor, 8, (0, 255, 0), cv2.FILLED)
+
+        # Filter kursor -> koordinat layar -> actuator
+        cursor_x, cursor_y = self.cursor_filter.filter(cursor[0], cursor[1], time.time())
+        self.mouse.position = (int(cursor_x * self.screen_width / img.shape[1]),
+                               int(cursor_y * self.screen_height / img.shape[0]))
+        frame['cursor_raw'] = cursor
+        frame['cursor_pos'] = (int(cursor_x), int(cursor_y))
+
+        # Event gerak kursor berkala (untuk sink pengujian)
+        if self.move_event_interval is not None and now - self.last_event_time > self.move_event_interval:
+            self.last_event_time = now
+            self._emit('move_cursor', frame)
+
+        # Kepal: toggle scroll
+        if self._triggered(gestures, 'toggle_scroll', now):
+            self.scroll_active = not self.scroll_active
+            self._emit('toggle_scroll', frame)
+
+        # Scroll setiap frame selama aktif, event hanya saat mulai
+        if self.scroll_active and self.gestures_enabled:
+            if gestures.active('scroll_up'):
+                self.mouse.scroll(0, 1)
+                overlay.circle(index, 10, (0, 255, 0), cv2.FILLED)
+                if self._triggered(gestures, 'scroll_up', now):
+                    self._emit('scroll_up', frame)
+            elif gestures.active('scroll_down'):
+                self.mouse.scroll(0, -1)
+                overlay.circle(index, 10, (0, 0, 255), cv2.FILLED)
+                if self._triggered(gestures, 'scroll_down', now):
+                    self._emit('scroll_down', frame)
+            else:
+                overlay.circle(index, 10, (255, 0, 255), cv2.FILLED)
+
+        # Klik kiri: jempol + kelingking
+        if self.gestures_enabled and self._triggered(gestures, 'click', now):
+            self.mouse.click(Button.left)
+            overlay.circle(pinky, 15, (0, 255, 0), cv2.FILLED)
+            self._emit('click', frame)
+
+        # Klik kanan: jempol + jari manis
+        if self.right_click and self.gestures_enabled and self._triggered(gestures, 'right_click', now):
+            self.mouse.click(Button.right)
+            overlay.circle(ring, 15, (0, 255, 255), cv2.FILLED)
+            self._emit('right_click', frame)
+
+    def _finish(self, frame):
+        """Sink metrik, renderer, dan tombol. Return False jika loop harus berhenti"""
+        if frame['exit']:
+            self.running = False
+            return False
+        for sink in self.frame_sinks:
+            sink(frame)
+
+        t0 = time.time()
+        overlay = frame['overlay']
+        for sink in self.draw_sinks:
+            sink(frame, overlay)
+        self.preview.show(frame['img'], overlay)
+        key = self.preview.wait_key()
+        self.stage_latency.record('render', (time.time() - t0) * 1000)
+
+        handler = self.key_bindings.get(key)
+        if handler is not None:
+            with self.control_lock:
+                handler(frame)
+        return self.running
+
+    # ============= LOOP =============
+    def run(self, pipelined=False):
+        """
+        Jalankan sampai sumber habis, tombol Q, atau gesture keluar.
+        pipelined: capture | deteksi | kontrol di thread sendiri (pipeline.Pipeline),
+        sink + renderer + tombol tetap di thread pemanggil.
+        """
+        self.running = True
+        if pipelined:
+            self._run_pipelined()
+        else:
+            while self.running:
+                frame = self._capture()
+                if frame is None or not self._finish(self._control(self._detect(frame))):
+                    break
+        self.running = False
+        if self.args.profile_stages:
+            self.print_latency()
+        return self
+
+    def _run_pipelined(self):
+        # Kamera live: frame terbaru menang; file --pace fast: antrian terbatas, tidak ada frame dibuang
+        pipeline = Pipeline(profile=self.args.profile_stages, lossless=self.cap.lossless)
+        pipeline.add_source('capture', self._capture)
+        pipeline.add_stage('deteksi', self._detect)
+        pipeline.add_stage('kontrol', self._control)
+        pipeline.set_consumer_name('tampilan')
+        pipeline.start()
+        while self.running:
+            ok, frame = pipeline.get()
+            if not ok or not self._finish(frame):
+                break
+        self.running = False
+        pipeline.stop()
+        if self.args.profile_stages:
+            pipeline.print_occupancy()
+
+    def print_latency(self):
+        print("\n" + "-"*80)
+        print("LATENCY PER TAHAP (TRACKING ENGINE)")
+        print("-"*80)
+        for line in self.stage_latency.format_table():
+            print("  " + line)
+
+    # ============= SELESAI =============
+    def close_mouse(self):
+        """Selesaikan antrian aktuasi (sekali), sebelum statistik aktuasi dibaca"""
+        if not self.mouse_closed:
+            self.mouse.close()
+            self.mouse_closed = True
+
+    def close(self):
+        self.close_mouse()
+        self.cap.release()
+        self.preview.close()
@@ -1,64 +1,16 @@
-from cvzone.HandTrackingModule import HandDetector
 import cv2
-import math
-from pynput.mouse import Button, Controller
-import screeninfo
+from frame_source import parse_source_args
+from hand_features import MIDDLE_TIP
+from latency_histogram import LatencyHistogram, StageLatencyRecorder
+from tracking_engine import TrackingEngine
 import time
 from datetime import datetime
 import json
 
-# Inisialisasi mouse controller
-mouse = Controller()
-
-# Mendapatkan informasi resolusi layar
-screen = screeninfo.get_monitors()[0]
-screen_width, screen_height = screen.width, screen.height
-
-# Inisialisasi kamera
-cap = cv2.VideoCapture(0)
-
-# Inisialisasi hand detector (maxHands=2 untuk deteksi kedua tangan terangkat)
-detector = HandDetector(detectionCon=0.3, maxHands=2)
-
-# Variabel untuk menyimpan status scroll aktif/nonaktif
-scroll_active = True
-
-# Variabel untuk mengaktifkan/menonaktifkan SEMUA gesture
-all_gestures_active = True
-
-# Variabel untuk deteksi kedua tangan terangkat (keluar program)
-both_hands_raised_start_time = None
-BOTH_HANDS_RAISED_DURATION = 3.0  # 3 detik untuk konfirmasi keluar
-
-# ============= FUNGSI DETEKSI KEDUA TANGAN TERANGKAT =============
-def is_hand_raised(hand_landmarks):
-    """
-    Mendeteksi apakah tangan terangkat (semua ujung jari di atas pergelangan)
-    """
-    wrist_y = hand_landmarks[0][1]
-    
-    # Landmark ujung jari: jempol, telunjuk, tengah, manis, kelingking
-    fingertip_landmarks = [4, 8, 12, 16, 20]
-    
-    # Cek apakah semua ujung jari di atas pergelangan (koordinat y lebih kecil)
-    for tip_idx in fingertip_landmarks:
-        if hand_landmarks[tip_idx][1] >= wrist_y: 
-            return False
-    
-    return True
-
-def check_both_hands_raised(hands):
-    """
-    Mendeteksi apakah kedua tangan terangkat
-    """
-    if len(hands) != 2:
-        return False
-    
-    # Cek kedua tangan
-    hand1_raised = is_hand_raised(hands[0]["lmList"])
-    hand2_raised = is_hand_raised(hands[1]["lmList"])
-    
-    return hand1_raised and hand2_raised
+# Source, detector, filter kursor, mouse, dan window preview dari tracking engine
+# --source 0 (kamera) | video.mp4 | rekaman.jsonl, --pace realtime|fast
+# (--headless: tanpa window dan tanpa gambar, tombol dari stdin)
+source_args = parse_source_args()
 
 # ============= SISTEM TRACKING PENGUJIAN DENGAN RESPONSE TIME =============
 class GestureTracker:
@@ -69,35 +21,35 @@ class GestureTracker:
                 'true_positive': 0, 
                 'false_positive': 0, 
                 'false_negative': 0,
-                'response_times': []  # List untuk menyimpan response time dalam ms
+                'response_times': LatencyHistogram()  # Histogram response time dalam ms
             },
             'scroll_down': {
                 'detected': 0, 
                 'true_positive': 0, 
                 'false_positive': 0, 
                 'false_negative': 0,
-                'response_times': []
+                'response_times': LatencyHistogram()
             },
             'click': {
                 'detected': 0, 
                 'true_positive': 0, 
                 'false_positive': 0, 
                 'false_negative': 0,
-                'response_times': []
+                'response_times': LatencyHistogram()
             },
             'toggle_scroll': {
                 'detected': 0, 
                 'true_positive': 0, 
                 'false_positive': 0, 
                 'false_negative': 0,
-                'response_times': []
+                'response_times': LatencyHistogram()
             },
             'move_cursor': {
                 'detected': 0, 
                 'true_positive': 0, 
                 'false_positive': 0, 
                 'false_negative': 0,
-                'response_times': []
+                'response_times': LatencyHistogram()
             }
         }
         self.current_gesture = None
@@ -105,12 +57,13 @@ class GestureTracker:
         self.gesture_start_time = None  # Waktu saat gesture mulai dideteksi
         self.waiting_for_confirmation = False
         self.start_time = time.time()
-        self.frame_processing_times = []  # Track waktu proses per frame
+        self.frame_processing_times = LatencyHistogram(reservoir_size=500)  # Track waktu proses per frame
+        self.stage_latency = StageLatencyRecorder()  # Histogram latency per tahap
         
     def gesture_detected(self, gesture_type, processing_time_ms):
         """Mencatat gesture yang terdeteksi dengan response time"""
         self.stats[gesture_type]['detected'] += 1
-        self.stats[gesture_type]['response_times'].append(processing_time_ms)
+        self.stats[gesture_type]['response_times'].record(processing_time_ms)
         self.current_gesture = gesture_type
         self.gesture_detected_time = time.time()
         self.waiting_for_confirmation = True
@@ -136,7 +89,7 @@ class GestureTracker:
     
     def add_frame_processing_time(self, processing_time_ms):
         """Menyimpan waktu proses per frame"""
-        self.frame_processing_times.append(processing_time_ms)
+        self.frame_processing_times.record(processing_time_ms)
         
     def calculate_accuracy(self, gesture_type):
         """Menghitung akurasi per gesture"""
@@ -153,22 +106,8 @@ class GestureTracker:
         return accuracy
     
     def calculate_response_time_stats(self, gesture_type):
-        """Menghitung statistik response time per gesture"""
-        times = self.stats[gesture_type]['response_times']
-        if not times:
-            return {
-                'avg': 0.0,
-                'min': 0.0,
-                'max': 0.0,
-                'count': 0
-            }
-        
-        return {
-            'avg': sum(times) / len(times),
-            'min': min(times),
-            'max': max(times),
-            'count': len(times)
-        }
+        """Menghitung statistik response time per gesture (avg, min, max, p50-p99.9)"""
+        return self.stats[gesture_type]['response_times'].get_stats()
     
     def calculate_overall_accuracy(self):
         """Menghitung akurasi keseluruhan"""
@@ -185,20 +124,17 @@ class GestureTracker:
     
     def calculate_overall_response_time(self):
         """Menghitung rata-rata response time keseluruhan"""
-        all_times = []
-        for stats in self.stats.values():
-            all_times.extend(stats['response_times'])
+        total = sum(s['response_times'].total for s in self.stats.values())
+        count = sum(s['response_times'].count for s in self.stats.values())
         
-        if not all_times:
+        if count == 0:
             return 0.0
         
-        return sum(all_times) / len(all_times)
+        return total / count
     
     def calculate_avg_frame_processing_time(self):
         """Menghitung rata-rata waktu proses per frame"""
-        if not self.frame_processing_times:
-            return 0.0
-        return sum(self.frame_processing_times) / len(self.frame_processing_times)
+        return self.frame_processing_times.mean()
     
     def display_stats(self):
         """Menampilkan statistik di terminal"""
@@ -220,6 +156,7 @@ class GestureTracker:
             print(f"    - Rata-rata       : {rt_stats['avg']:.2f} ms")
             print(f"    - Min             : {rt_stats['min']:.2f} ms")
             print(f"    - Max             : {rt_stats['max']:.2f} ms")
+            print(f"    - p95 / p99       : {rt_stats['p95']:.2f} / {rt_stats['p99']:.2f} ms")
             
         overall_accuracy = self.calculate_overall_accuracy()
         overall_rt = self.calculate_overall_response_time()
@@ -231,6 +168,10 @@ class GestureTracker:
         print(f"RESPONSE TIME RATA-RATA    : {overall_rt:.2f} ms")
         print(f"FRAME PROCESSING TIME      : {avg_frame_time:.2f} ms")
         print(f"Durasi Pengujian           : {duration:.2f} detik ({duration/60:.2f} menit)")
+        
+        print("\nLATENCY PER TAHAP:")
+        for line in self.stage_latency.format_table():
+            print("  " + line)
         print("="*80 + "\n")
     
     def save_report(self, filename='laporan_pengujian.json'):
@@ -241,6 +182,9 @@ class GestureTracker:
             'akurasi_keseluruhan': self.calculate_overall_accuracy(),
             'response_time_rata_rata_ms': self.calculate_overall_response_time(),
             'frame_processing_time_ms': self.calculate_avg_frame_processing_time(),
+            'frame_processing_time_percentil_ms': self.frame_processing_times.get_stats(),
+            'frame_processing_time_sample_ms': self.frame_processing_times.sample(),  # Reservoir untuk plotting
+            'latency_per_tahap_ms': self.stage_latency.get_report(),
             'detail_gesture': {}
         }
         
@@ -254,8 +198,13 @@ class GestureTracker:
                 'akurasi': self.calculate_accuracy(gesture),
                 'response_time': {
                     'rata_rata_ms': rt_stats['avg'],
+                    'std_ms': rt_stats['std'],
                     'min_ms': rt_stats['min'],
                     'max_ms': rt_stats['max'],
+                    'p50_ms': rt_stats['p50'],
+                    'p95_ms': rt_stats['p95'],
+                    'p99_ms': rt_stats['p99'],
+                    'p99_9_ms': rt_stats['p99_9'],
                     'jumlah_sample': rt_stats['count']
                 }
             }
@@ -291,8 +240,11 @@ class GestureTracker:
                 f.write(f"  Tingkat Akurasi     : {accuracy:.2f}%\n")
                 f.write(f"  Response Time:\n")
                 f.write(f"    - Rata-rata       : {rt_stats['avg']:.2f} ms\n")
+                f.write(f"    - Std Deviasi     : {rt_stats['std']:.2f} ms\n")
                 f.write(f"    - Minimum         : {rt_stats['min']:.2f} ms\n")
                 f.write(f"    - Maximum         : {rt_stats['max']:.2f} ms\n")
+                f.write(f"    - p50 / p95       : {rt_stats['p50']:.2f} / {rt_stats['p95']:.2f} ms\n")
+                f.write(f"    - p99 / p99.9     : {rt_stats['p99']:.2f} / {rt_stats['p99_9']:.2f} ms\n")
                 f.write(f"    - Jumlah Sample   : {rt_stats['count']}\n")
                 f.write("\n")
             
@@ -316,6 +268,13 @@ class GestureTracker:
             f.write(f"FRAME PROCESSING TIME   : {avg_frame_time:.2f} ms\n")
             f.write("="*80 + "\n\n")
             
+            # Latency per tahap (tail latency = kursor tersendat)
+            f.write("LATENCY PER TAHAP:\n")
+            f.write("-"*80 + "\n")
+            for line in self.stage_latency.format_table():
+                f.write(line + "\n")
+            f.write("\n")
+            
             # Analisis
             f.write("ANALISIS:\n")
             f.write("-"*80 + "\n")
@@ -367,19 +326,14 @@ class GestureTracker:
 # Inisialisasi tracker
 tracker = GestureTracker()
 
-# Variabel untuk cooldown antar gesture
-last_gesture_time = time.time()
-gesture_cooldown = 0.5  # 0.5 detik
-
-# Variabel untuk tracking state
-previous_scroll_state = None
-previous_click_state = False
-previous_fist_state = False
-
-# Window name
+# Kursor mengikuti jari tengah, kedua tangan terangkat (3 detik) = keluar,
+# jeda 0.5 detik antar gesture, move_cursor dicatat setiap detik.
+# Latency setiap tahap (termasuk setiap panggilan mouse -> 'actuation') dicatat ke tracker
 window_name = "Virtual Mouse dengan Testing & Response Time"
-cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-cv2.setWindowProperty(window_name, cv2.WND_PROP_TOPMOST, 1) #kamernya selalu didepan wkwk
+engine = TrackingEngine(source_args, window_name, max_hands=2, cursor_landmark=MIDDLE_TIP,
+                        gesture_cooldown=0.5, move_event_interval=1.0,
+                        topmost=True,  # kamernya selalu didepan wkwk
+                        stage_latency=tracker.stage_latency)
 
 print("\n" + "="*80)
 print("SISTEM VIRTUAL MOUSE - Mode Testing dengan Response Time".center(80))
@@ -397,229 +351,102 @@ print("\nGESTURE EXIT:")
 print("  Angkat KEDUA tangan dengan jari terbuka, tahan 3 detik")
 print("\n" + "="*80 + "\n")
 
-# Main loop
-while True:
-    # Catat waktu mulai proses frame
-    frame_start_time = time.time()
-    
-    success, img = cap.read()
-    if not success:
-        break
-    
-    img = cv2.flip(img, 1)
-    hands, img = detector.findHands(img, draw=True, flipType=False)
-    
-    current_time = time.time()
-    
-    # Cek apakah kedua tangan terangkat (untuk exit)
-    if hands and check_both_hands_raised(hands):
-        if both_hands_raised_start_time is None:
-            both_hands_raised_start_time = current_time
-            print("\n⏳ Kedua tangan terdeteksi terangkat! Tahan 3 detik untuk keluar...")
-        
-        elapsed = current_time - both_hands_raised_start_time
-        remaining = BOTH_HANDS_RAISED_DURATION - elapsed
-        
-        if remaining > 0:
-            # Tampilkan countdown
-            cv2.putText(img, f"Keluar dalam {remaining:.1f} detik...", 
-                       (img.shape[1]//2 - 150, img.shape[0]//2), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 255), 3)
-        else:
-            # Exit setelah 3 detik
-            print("\n✓ Exit gesture confirmed! Menyimpan laporan...")
-            tracker.display_stats()
-            tracker.save_report('laporan_pengujian.json')
-            tracker.save_report_text('laporan_pengujian.txt')
-            print("\n✓ Laporan pengujian berhasil disimpan!")
-            break
-    else:
-        # Reset timer jika kedua tangan tidak terangkat
-        both_hands_raised_start_time = None
-    
-    # Proses gesture hanya jika ada TEPAT 1 tangan (untuk kontrol)
-    if len(hands) == 1:
-        hand = hands[0]
-        lmList = hand["lmList"]
-        if lmList:
-            # Koordinat jempol, telunjuk, jari tengah, dan kelingking
-            x1, y1 = lmList[4][0], lmList[4][1]   # Jempol
-            x2, y2 = lmList[8][0], lmList[8][1]   # Telunjuk (untuk scroll)
-            x3, y3 = lmList[12][0], lmList[12][1] # Jari tengah (untuk kursor)
-            x5, y5 = lmList[20][0], lmList[20][1] # Jari kelingking (untuk klik)
+# ============= SINK PENGUJIAN =============
+GESTURE_MESSAGES = {
+    'scroll_up': "\n⬆️  SCROLL UP",
+    'scroll_down': "\n⬇️  SCROLL DOWN",
+    'click': "\n👆 KLIK"
+}
 
-            # Menghitung panjang antara jempol dan telunjuk untuk scroll
-            length = math.hypot(x2 - x1, y2 - y1)
+def on_gesture(name, frame):
+    # Response time: dari awal frame (sebelum capture) sampai aksi gesture dijalankan
+    frame_time_ms = (time.time() - frame['t_start']) * 1000
+    if name == 'toggle_scroll':
+        print(f"\n🤛 TOGGLE SCROLL: {'AKTIF' if engine.scroll_active else 'NONAKTIF'} (RT: {frame_time_ms:.2f}ms)")
+    elif name in GESTURE_MESSAGES:
+        print(f"{GESTURE_MESSAGES[name]} (RT: {frame_time_ms:.2f}ms)")
+    tracker.gesture_detected(name, frame_time_ms)
 
-            # Menghitung jarak antara jari kelingking dan jempol untuk klik
-            distance_thumb_pinky = math.hypot(x5 - x1, y5 - y1)
+def on_frame(frame):
+    # Hitung dan simpan frame processing time
+    frame['processing_ms'] = (frame['t_controlled'] - frame['t_start']) * 1000
+    tracker.add_frame_processing_time(frame['processing_ms'])
 
-            # Menggambar titik dan garis
-            cv2.circle(img, (x1, y1), 5, (255, 0, 255), cv2.FILLED)  # Jempol
-            cv2.circle(img, (x2, y2), 5, (255, 0, 255), cv2.FILLED)  # Telunjuk
-            cv2.circle(img, (x3, y3), 8, (0, 255, 0), cv2.FILLED)    # Jari tengah (HIJAU - kursor)
-            cv2.circle(img, (x5, y5), 5, (255, 0, 255), cv2.FILLED)  # Kelingking
-            cv2.line(img, (x1, y1), (x2, y2), (255, 0, 255), 3)
-            cv2.line(img, (x1, y1), (x5, y5), (255, 0, 255), 3)
+def draw_info(frame, overlay):
+    # Tampilkan info di frame
+    img = frame['img']
+    gesture_status = "AKTIF ✓" if engine.gestures_enabled else "NONAKTIF ✗"
+    avg_rt = tracker.calculate_overall_response_time()
+    info_text = f"Hands: {len(frame['hands'])} | Gestures: {gesture_status} | Scroll: {'ON' if engine.scroll_active else 'OFF'}"
+    perf_text = f"Akurasi: {tracker.calculate_overall_accuracy():.1f}% | Avg RT: {avg_rt:.1f}ms | FPS: {1000/frame['processing_ms']:.1f}"
 
-            # Konversi posisi JARI TENGAH ke koordinat layar
-            screen_x = int(x3 * screen_width / img.shape[1])
-            screen_y = int(y3 * screen_height / img.shape[0])
+    overlay.putText(info_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0) if engine.gestures_enabled else (0, 0, 255), 2)
+    overlay.putText(perf_text, (10, 55), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 2)
 
-            # Menggerakkan mouse ke posisi JARI TENGAH
-            mouse.position = (screen_x, screen_y)
-            
-            # Hitung response time untuk move cursor (setiap detik)
-            if current_time - last_gesture_time > 1.0:
-                frame_time_ms = (time.time() - frame_start_time) * 1000
-                tracker.gesture_detected('move_cursor', frame_time_ms)
-                last_gesture_time = current_time
+    # Tambahkan hint tombol dan gesture keluar
+    overlay.putText("[T]=Scroll | [W]=ON/OFF | Angkat 2 Tangan=Keluar", (10, img.shape[0] - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
 
-            # Mengecek apakah tangan menggenggam
-            is_fist = all(math.hypot(lmList[i][0] - lmList[0][0], lmList[i][1] - lmList[0][1]) < 40 for i in [4, 8, 12, 16, 20])
+    if tracker.waiting_for_confirmation:
+        overlay.putText("Konfirmasi: Y=Benar N=Salah", (10, 80),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
 
-            if is_fist and not previous_fist_state:
-                if current_time - last_gesture_time > gesture_cooldown:
-                    # Ketika tangan menggenggam, toggle status scroll (aktif/nonaktif)
-                    scroll_active = not scroll_active
-                    frame_time_ms = (time.time() - frame_start_time) * 1000
-                    print(f"\n🤛 TOGGLE SCROLL: {'AKTIF' if scroll_active else 'NONAKTIF'} (RT: {frame_time_ms:.2f}ms)")
-                    tracker.gesture_detected('toggle_scroll', frame_time_ms)
-                    last_gesture_time = current_time
-            
-            previous_fist_state = is_fist
+# ============= TOMBOL =============
+def key_false_negative(frame):
+    print("\nPilih gesture yang gagal terdeteksi:")
+    print("1. Scroll Up")
+    print("2. Scroll Down")
+    print("3. Klik")
+    print("4. Toggle Scroll")
+    print("5. Move Cursor")
+    gesture_choice = engine.preview.input("Pilihan (1-5): ")
 
-            # Scroll aktif jika status scroll_active True DAN all_gestures_active True
-            current_scroll_state = None
-            if scroll_active and all_gestures_active:
-                if length < 50:
-                    mouse.scroll(0, 1)  # Scroll ke atas
-                    cv2.circle(img, (x2, y2), 10, (0, 255, 0), cv2.FILLED)
-                    current_scroll_state = 'up'
-                    
-                    if previous_scroll_state != 'up':
-                        if current_time - last_gesture_time > gesture_cooldown:
-                            frame_time_ms = (time.time() - frame_start_time) * 1000
-                            print(f"\n⬆️  SCROLL UP (RT: {frame_time_ms:.2f}ms)")
-                            tracker.gesture_detected('scroll_up', frame_time_ms)
-                            last_gesture_time = current_time
-                            
-                elif length > 150:
-                    mouse.scroll(0, -1)  # Scroll ke bawah
-                    cv2.circle(img, (x2, y2), 10, (0, 0, 255), cv2.FILLED)
-                    current_scroll_state = 'down'
-                    
-                    if previous_scroll_state != 'down':
-                        if current_time - last_gesture_time > gesture_cooldown:
-                            frame_time_ms = (time.time() - frame_start_time) * 1000
-                            print(f"\n⬇️  SCROLL DOWN (RT: {frame_time_ms:.2f}ms)")
-                            tracker.gesture_detected('scroll_down', frame_time_ms)
-                            last_gesture_time = current_time
-                else:
-                    cv2.circle(img, (x2, y2), 10, (255, 0, 255), cv2.FILLED)
-                    current_scroll_state = None
-                    
-            previous_scroll_state = current_scroll_state
+    gesture_map = {
+        '1': 'scroll_up',
+        '2': 'scroll_down',
+        '3': 'click',
+        '4': 'toggle_scroll',
+        '5': 'move_cursor'
+    }
 
-            # Kondisi untuk klik (hanya jika all_gestures_active True)
-            current_click_state = distance_thumb_pinky < 30
-            if current_click_state and not previous_click_state and all_gestures_active:
-                if current_time - last_gesture_time > gesture_cooldown:
-                    mouse.click(Button.left)  # Klik kiri
-                    cv2.circle(img, (x5, y5), 15, (0, 255, 0), cv2.FILLED)
-                    frame_time_ms = (time.time() - frame_start_time) * 1000
-                    print(f"\n👆 KLIK (RT: {frame_time_ms:.2f}ms)")
-                    tracker.gesture_detected('click', frame_time_ms)
-                    last_gesture_time = current_time
-                    
-            previous_click_state = current_click_state
-    
-    # Hitung dan simpan frame processing time
-    frame_end_time = time.time()
-    frame_processing_time_ms = (frame_end_time - frame_start_time) * 1000
-    tracker.add_frame_processing_time(frame_processing_time_ms)
+    if gesture_choice in gesture_map:
+        tracker.add_false_negative(gesture_map[gesture_choice])
 
-    # Tampilkan info di frame
-    gesture_status = "AKTIF ✓" if all_gestures_active else "NONAKTIF ✗"
-    hands_count = len(hands) if hands else 0
-    avg_rt = tracker.calculate_overall_response_time()
-    info_text = f"Hands: {hands_count} | Gestures: {gesture_status} | Scroll: {'ON' if scroll_active else 'OFF'}"
-    perf_text = f"Akurasi: {tracker.calculate_overall_accuracy():.1f}% | Avg RT: {avg_rt:.1f}ms | FPS: {1000/frame_processing_time_ms:.1f}"
-    
-    cv2.putText(img, info_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0) if all_gestures_active else (0, 0, 255), 2)
-    cv2.putText(img, perf_text, (10, 55), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 2)
-    
-    # Tambahkan hint tombol dan gesture keluar
-    cv2.putText(img, "[T]=Scroll | [W]=ON/OFF | Angkat 2 Tangan=Keluar", (10, img.shape[0] - 10), 
-               cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
-    
-    if tracker.waiting_for_confirmation:
-        cv2.putText(img, "Konfirmasi: Y=Benar N=Salah", (10, 80), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+def key_reset(frame):
+    global tracker
+    confirm = engine.preview.input("\nYakin ingin reset statistik? (y/n): ")
+    if confirm.lower() == 'y':
+        tracker = GestureTracker()
+        engine.set_stage_latency(tracker.stage_latency)
+        print("✓ Statistik direset")
 
-    # Menampilkan frame
-    cv2.imshow(window_name, img)
-    
-    key = cv2.waitKey(1) & 0xFF
-    
-    # Konfirmasi True Positive
-    if key == ord('y') or key == ord('Y'):
-        tracker.confirm_true_positive()
-        
-    # Konfirmasi False Positive
-    elif key == ord('n') or key == ord('N'):
-        tracker.confirm_false_positive()
-        
-    # Tambah False Negative
-    elif key == ord('f') or key == ord('F'):
-        print("\nPilih gesture yang gagal terdeteksi:")
-        print("1. Scroll Up")
-        print("2. Scroll Down")
-        print("3. Klik")
-        print("4. Toggle Scroll")
-        print("5. Move Cursor")
-        gesture_choice = input("Pilihan (1-5): ")
-        
-        gesture_map = {
-            '1': 'scroll_up',
-            '2': 'scroll_down',
-            '3': 'click',
-            '4': 'toggle_scroll',
-            '5': 'move_cursor'
-        }
-        
-        if gesture_choice in gesture_map:
-            tracker.add_false_negative(gesture_map[gesture_choice])
-    
-    # Tampilkan statistik
-    elif key == ord('s') or key == ord('S'):
-        tracker.display_stats()
-    
-    # Reset statistik
-    elif key == ord('r') or key == ord('R'):
-        confirm = input("\nYakin ingin reset statistik? (y/n): ")
-        if confirm.lower() == 'y':
-            tracker = GestureTracker()
-            print("✓ Statistik direset")
-    
+def key_toggle_scroll(frame):
     # Toggle Scroll dengan keyboard
-    elif key == ord('t') or key == ord('T'):
-        scroll_active = not scroll_active
-        print(f"\n🔄 TOGGLE SCROLL (Keyboard): {'AKTIF ✓' if scroll_active else 'NONAKTIF ✗'}")
-    
+    engine.scroll_active = not engine.scroll_active
+    print(f"\n🔄 TOGGLE SCROLL (Keyboard): {'AKTIF ✓' if engine.scroll_active else 'NONAKTIF ✗'}")
+
+def key_toggle_gestures(frame):
     # Toggle SEMUA Gesture (Scroll + Klik) dengan keyboard
-    elif key == ord('w') or key == ord('W'):
-        all_gestures_active = not all_gestures_active
-        status = "AKTIF ✓" if all_gestures_active else "NONAKTIF ✗"
-        print(f"\n🎮 SEMUA FITUR (Scroll + Klik): {status}")
-        if not all_gestures_active:
-            print("   ⚠️  Scroll Up, Scroll Down, dan Klik DINONAKTIFKAN")
-        else:
-            print("   ✓ Semua fitur DIAKTIFKAN kembali")
-    
-    # Keluar
-    elif key == ord('q') or key == ord('Q'):
-        break
+    engine.gestures_enabled = not engine.gestures_enabled
+    status = "AKTIF ✓" if engine.gestures_enabled else "NONAKTIF ✗"
+    print(f"\n🎮 SEMUA FITUR (Scroll + Klik): {status}")
+    if not engine.gestures_enabled:
+        print("   ⚠️  Scroll Up, Scroll Down, dan Klik DINONAKTIFKAN")
+    else:
+        print("   ✓ Semua fitur DIAKTIFKAN kembali")
+
+engine.gesture_sinks.append(on_gesture)
+engine.frame_sinks.append(on_frame)
+engine.draw_sinks.append(draw_info)
+engine.bind_key('yY', lambda frame: tracker.confirm_true_positive())
+engine.bind_key('nN', lambda frame: tracker.confirm_false_positive())
+engine.bind_key('fF', key_false_negative)
+engine.bind_key('sS', lambda frame: tracker.display_stats())
+engine.bind_key('rR', key_reset)
+engine.bind_key('tT', key_toggle_scroll)
+engine.bind_key('wW', key_toggle_gestures)
+engine.bind_key('qQ', engine.stop)
+engine.run()
 
 # Tampilkan statistik akhir
 print("\n\n")
@@ -634,5 +461,4 @@ print("  - laporan_pengujian.json (format data)")
 print("  - laporan_pengujian.txt (untuk skripsi)")
 
 # Melepaskan sumber daya
-cap.release()
-cv2.destroyAllWindows()
+engine.close()
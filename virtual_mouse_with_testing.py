@@ -1,64 +1,21 @@
-from cvzone.HandTrackingModule import HandDetector
 import cv2
-import math
-from pynput.mouse import Button, Controller
-import screeninfo
+from frame_source import parse_source_args
+from hand_features import MIDDLE_TIP
+from tracking_engine import TrackingEngine
 import time
 from datetime import datetime
 import json
 
-# Inisialisasi mouse controller
-mouse = Controller()
+# Source, detector, filter kursor, mouse, dan window preview dari tracking engine
+# --source 0 (kamera) | video.mp4 | rekaman.jsonl, --pace realtime|fast
+# (--headless: tanpa window dan tanpa gambar, tombol dari stdin)
+source_args = parse_source_args()
 
-# Mendapatkan informasi resolusi layar
-screen = screeninfo.get_monitors()[0]
-screen_width, screen_height = screen.width, screen.height
-
-# Inisialisasi kamera
-cap = cv2.VideoCapture(0)
-
-# Inisialisasi hand detector (maxHands=2 untuk deteksi kedua tangan terangkat)
-detector = HandDetector(detectionCon=0.3, maxHands=2)
-
-# Variabel untuk menyimpan status scroll aktif/nonaktif
-scroll_active = True
-
-# Variabel untuk mengaktifkan/menonaktifkan SEMUA gesture
-all_gestures_active = True
-
-# Variabel untuk deteksi kedua tangan terangkat (keluar program)
-both_hands_raised_start_time = None
-BOTH_HANDS_RAISED_DURATION = 3.0  # 3 detik untuk konfirmasi keluar
-
-# ============= FUNGSI DETEKSI KEDUA TANGAN TERANGKAT =============
-def is_hand_raised(hand_landmarks):
-    """
-    Mendeteksi apakah tangan terangkat (semua ujung jari di atas pergelangan)
-    """
-    wrist_y = hand_landmarks[0][1]
-    
-    # Landmark ujung jari: jempol, telunjuk, tengah, manis, kelingking
-    fingertip_landmarks = [4, 8, 12, 16, 20]
-    
-    # Cek apakah semua ujung jari di atas pergelangan (koordinat y lebih kecil)
-    for tip_idx in fingertip_landmarks:
-        if hand_landmarks[tip_idx][1] >= wrist_y: 
-            return False
-    
-    return True
-
-def check_both_hands_raised(hands):
-    """
-    Mendeteksi apakah kedua tangan terangkat
-    """
-    if len(hands) != 2:
-        return False
-    
-    # Cek kedua tangan
-    hand1_raised = is_hand_raised(hands[0]["lmList"])
-    hand2_raised = is_hand_raised(hands[1]["lmList"])
-    
-    return hand1_raised and hand2_raised
+# Kursor mengikuti jari tengah, kedua tangan terangkat (3 detik) = keluar,
+# jeda 0.5 detik antar gesture, move_cursor dicatat setiap detik
+window_name = "Virtual Mouse - Testing Mode"
+engine = TrackingEngine(source_args, window_name, max_hands=2, cursor_landmark=MIDDLE_TIP,
+                        gesture_cooldown=0.5, move_event_interval=1.0, topmost=True)
 
 # ============= SISTEM TRACKING PENGUJIAN =============
 class GestureTracker:
@@ -240,15 +197,6 @@ class GestureTracker:
 # Inisialisasi tracker
 tracker = GestureTracker()
 
-# Variabel untuk mencegah deteksi berulang
-last_gesture_time = time.time()
-gesture_cooldown = 0.5  # 0.5 detik cooldown
-
-# Variabel untuk tracking gesture sebelumnya
-previous_scroll_state = None
-previous_click_state = False
-previous_fist_state = False
-
 print("\n" + "="*80)
 print("SISTEM PENGUJIAN VIRTUAL MOUSE - HAND TRACKING".center(80))
 print("="*80)
@@ -275,221 +223,89 @@ print("  [R] = Reset Statistik")
 print("  [Q] = Keluar & Simpan Laporan")
 print("="*80 + "\n")
 
-# Buat window dengan property always on top
-window_name = "Virtual Mouse - Testing Mode"
-cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-cv2.setWindowProperty(window_name, cv2.WND_PROP_TOPMOST, 1)
-
-while True:
-    success, img = cap.read()
-    if not success:
-        break
-
-    # Flip gambar secara horizontal
-    img = cv2.flip(img, 1)
-
-    # Deteksi tangan
-    hands, img = detector.findHands(img)
-
-    current_time = time.time()
-    
-    # Cek apakah kedua tangan terangkat untuk keluar program
-    if check_both_hands_raised(hands):
-        if both_hands_raised_start_time is None:
-            both_hands_raised_start_time = current_time
-            print("🙌 Kedua tangan terangkat! Tahan selama 3 detik untuk keluar...")
-        
-        # Hitung durasi kedua tangan terangkat
-        duration = current_time - both_hands_raised_start_time
-        
-        # Tampilkan countdown di layar (warna merah, besar)
-        countdown = max(0, BOTH_HANDS_RAISED_DURATION - duration)
-        cv2.putText(img, f"KELUAR DALAM: {countdown:.1f}s", (img.shape[1]//2 - 150, img.shape[0]//2), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 255), 3)
-        
-        # Jika sudah 3 detik, keluar dari program
-        if duration >= BOTH_HANDS_RAISED_DURATION:
-            print("👋 Keluar program... Menyimpan data...")
-            # Tampilkan statistik terakhir sebelum keluar
-            tracker.display_stats()
-            # Simpan laporan
-            tracker.save_report('laporan_pengujian.json')
-            tracker.save_report_text('laporan_pengujian.txt')
-            print("\n✓ Laporan pengujian berhasil disimpan!")
-            break
-    else:
-        # Reset timer jika kedua tangan tidak terangkat
-        both_hands_raised_start_time = None
-    
-    # Proses gesture hanya jika ada TEPAT 1 tangan (untuk kontrol)
-    if len(hands) == 1:
-        hand = hands[0]
-        lmList = hand["lmList"]
-        if lmList:
-            # Koordinat jempol, telunjuk, jari tengah, dan kelingking
-            x1, y1 = lmList[4][0], lmList[4][1]   # Jempol
-            x2, y2 = lmList[8][0], lmList[8][1]   # Telunjuk (untuk scroll)
-            x3, y3 = lmList[12][0], lmList[12][1] # Jari tengah (untuk kursor)
-            x5, y5 = lmList[20][0], lmList[20][1] # Jari kelingking (untuk klik)
-
-            # Menghitung panjang antara jempol dan telunjuk untuk scroll
-            length = math.hypot(x2 - x1, y2 - y1)
-
-            # Menghitung jarak antara jari kelingking dan jempol untuk klik
-            distance_thumb_pinky = math.hypot(x5 - x1, y5 - y1)
-
-            # Menggambar titik dan garis
-            cv2.circle(img, (x1, y1), 5, (255, 0, 255), cv2.FILLED)  # Jempol
-            cv2.circle(img, (x2, y2), 5, (255, 0, 255), cv2.FILLED)  # Telunjuk
-            cv2.circle(img, (x3, y3), 8, (0, 255, 0), cv2.FILLED)    # Jari tengah (HIJAU - kursor)
-            cv2.circle(img, (x5, y5), 5, (255, 0, 255), cv2.FILLED)  # Kelingking
-            cv2.line(img, (x1, y1), (x2, y2), (255, 0, 255), 3)
-            cv2.line(img, (x1, y1), (x5, y5), (255, 0, 255), 3)
-
-            # Konversi posisi JARI TENGAH ke koordinat layar
-            screen_x = int(x3 * screen_width / img.shape[1])
-            screen_y = int(y3 * screen_height / img.shape[0])
-
-            # Menggerakkan mouse ke posisi JARI TENGAH
-            mouse.position = (screen_x, screen_y)
-            
-            # Track move cursor (setiap detik)
-            if current_time - last_gesture_time > 1.0:
-                tracker.gesture_detected('move_cursor')
-                last_gesture_time = current_time
-
-            # Mengecek apakah tangan menggenggam
-            is_fist = all(math.hypot(lmList[i][0] - lmList[0][0], lmList[i][1] - lmList[0][1]) < 40 for i in [4, 8, 12, 16, 20])
-
-            if is_fist and not previous_fist_state:
-                if current_time - last_gesture_time > gesture_cooldown:
-                    # Ketika tangan menggenggam, toggle status scroll (aktif/nonaktif)
-                    scroll_active = not scroll_active
-                    print(f"\n🤛 TOGGLE SCROLL: {'AKTIF' if scroll_active else 'NONAKTIF'}")
-                    tracker.gesture_detected('toggle_scroll')
-                    last_gesture_time = current_time
-            
-            previous_fist_state = is_fist
-
-            # Scroll aktif jika status scroll_active True DAN all_gestures_active True
-            current_scroll_state = None
-            if scroll_active and all_gestures_active:
-                if length < 50:
-                    mouse.scroll(0, 1)  # Scroll ke atas
-                    cv2.circle(img, (x2, y2), 10, (0, 255, 0), cv2.FILLED)
-                    current_scroll_state = 'up'
-                    
-                    if previous_scroll_state != 'up':
-                        if current_time - last_gesture_time > gesture_cooldown:
-                            print("\n⬆️  SCROLL UP")
-                            tracker.gesture_detected('scroll_up')
-                            last_gesture_time = current_time
-                            
-                elif length > 150:
-                    mouse.scroll(0, -1)  # Scroll ke bawah
-                    cv2.circle(img, (x2, y2), 10, (0, 0, 255), cv2.FILLED)
-                    current_scroll_state = 'down'
-                    
-                    if previous_scroll_state != 'down':
-                        if current_time - last_gesture_time > gesture_cooldown:
-                            print("\n⬇️  SCROLL DOWN")
-                            tracker.gesture_detected('scroll_down')
-                            last_gesture_time = current_time
-                else:
-                    cv2.circle(img, (x2, y2), 10, (255, 0, 255), cv2.FILLED)
-                    current_scroll_state = None
-                    
-            previous_scroll_state = current_scroll_state
-
-            # Kondisi untuk klik (hanya jika all_gestures_active True)
-            current_click_state = distance_thumb_pinky < 30
-            if current_click_state and not previous_click_state and all_gestures_active:
-                if current_time - last_gesture_time > gesture_cooldown:
-                    mouse.click(Button.left)  # Klik kiri
-                    cv2.circle(img, (x5, y5), 15, (0, 255, 0), cv2.FILLED)
-                    print("\n👆 KLIK")
-                    tracker.gesture_detected('click')
-                    last_gesture_time = current_time
-                    
-            previous_click_state = current_click_state
-
+# ============= SINK PENGUJIAN =============
+GESTURE_MESSAGES = {
+    'scroll_up': "\n⬆️  SCROLL UP",
+    'scroll_down': "\n⬇️  SCROLL DOWN",
+    'click': "\n👆 KLIK"
+}
+
+def on_gesture(name, frame):
+    if name == 'toggle_scroll':
+        print(f"\n🤛 TOGGLE SCROLL: {'AKTIF' if engine.scroll_active else 'NONAKTIF'}")
+    elif name in GESTURE_MESSAGES:
+        print(GESTURE_MESSAGES[name])
+    tracker.gesture_detected(name)
+
+def draw_info(frame, overlay):
     # Tampilkan info di frame
-    gesture_status = "AKTIF ✓" if all_gestures_active else "NONAKTIF ✗"
-    hands_count = len(hands) if hands else 0
-    info_text = f"Hands: {hands_count} | Gestures: {gesture_status} | Scroll: {'ON' if scroll_active else 'OFF'} | Akurasi: {tracker.calculate_overall_accuracy():.1f}%"
-    cv2.putText(img, info_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0) if all_gestures_active else (0, 0, 255), 2)
-    
+    img = frame['img']
+    gesture_status = "AKTIF ✓" if engine.gestures_enabled else "NONAKTIF ✗"
+    info_text = f"Hands: {len(frame['hands'])} | Gestures: {gesture_status} | Scroll: {'ON' if engine.scroll_active else 'OFF'} | Akurasi: {tracker.calculate_overall_accuracy():.1f}%"
+    overlay.putText(info_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0) if engine.gestures_enabled else (0, 0, 255), 2)
+
     # Tambahkan hint tombol dan gesture keluar
-    cv2.putText(img, "[T]=Scroll | [W]=ON/OFF | Angkat 2 Tangan=Keluar", (10, img.shape[0] - 10), 
-               cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
-    
-    if tracker.waiting_for_confirmation:
-        cv2.putText(img, "Konfirmasi: Y=Benar N=Salah", (10, 60), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+    overlay.putText("[T]=Scroll | [W]=ON/OFF | Angkat 2 Tangan=Keluar", (10, img.shape[0] - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
 
-    # Menampilkan frame
-    cv2.imshow(window_name, img)
-    
-    key = cv2.waitKey(1) & 0xFF
-    
-    # Konfirmasi True Positive
-    if key == ord('y') or key == ord('Y'):
-        tracker.confirm_true_positive()
-        
-    # Konfirmasi False Positive
-    elif key == ord('n') or key == ord('N'):
-        tracker.confirm_false_positive()
-        
-    # Tambah False Negative
-    elif key == ord('f') or key == ord('F'):
-        print("\nPilih gesture yang gagal terdeteksi:")
-        print("1. Scroll Up")
-        print("2. Scroll Down")
-        print("3. Klik")
-        print("4. Toggle Scroll")
-        print("5. Move Cursor")
-        gesture_choice = input("Pilihan (1-5): ")
-        
-        gesture_map = {
-            '1': 'scroll_up',
-            '2': 'scroll_down',
-            '3': 'click',
-            '4': 'toggle_scroll',
-            '5': 'move_cursor'
-        }
-        
-        if gesture_choice in gesture_map:
-            tracker.add_false_negative(gesture_map[gesture_choice])
-    
-    # Tampilkan statistik
-    elif key == ord('s') or key == ord('S'):
-        tracker.display_stats()
-    
-    # Reset statistik
-    elif key == ord('r') or key == ord('R'):
-        confirm = input("\nYakin ingin reset statistik? (y/n): ")
-        if confirm.lower() == 'y':
-            tracker = GestureTracker()
-            print("✓ Statistik direset")
-    
+    if tracker.waiting_for_confirmation:
+        overlay.putText("Konfirmasi: Y=Benar N=Salah", (10, 60),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+
+# ============= TOMBOL =============
+def key_false_negative(frame):
+    print("\nPilih gesture yang gagal terdeteksi:")
+    print("1. Scroll Up")
+    print("2. Scroll Down")
+    print("3. Klik")
+    print("4. Toggle Scroll")
+    print("5. Move Cursor")
+    gesture_choice = engine.preview.input("Pilihan (1-5): ")
+
+    gesture_map = {
+        '1': 'scroll_up',
+        '2': 'scroll_down',
+        '3': 'click',
+        '4': 'toggle_scroll',
+        '5': 'move_cursor'
+    }
+
+    if gesture_choice in gesture_map:
+        tracker.add_false_negative(gesture_map[gesture_choice])
+
+def key_reset(frame):
+    global tracker
+    confirm = engine.preview.input("\nYakin ingin reset statistik? (y/n): ")
+    if confirm.lower() == 'y':
+        tracker = GestureTracker()
+        print("✓ Statistik direset")
+
+def key_toggle_scroll(frame):
     # Toggle Scroll dengan keyboard
-    elif key == ord('t') or key == ord('T'):
-        scroll_active = not scroll_active
-        print(f"\n🔄 TOGGLE SCROLL (Keyboard): {'AKTIF ✓' if scroll_active else 'NONAKTIF ✗'}")
-    
+    engine.scroll_active = not engine.scroll_active
+    print(f"\n🔄 TOGGLE SCROLL (Keyboard): {'AKTIF ✓' if engine.scroll_active else 'NONAKTIF ✗'}")
+
+def key_toggle_gestures(frame):
     # Toggle SEMUA Gesture (Scroll + Klik) dengan keyboard
-    elif key == ord('w') or key == ord('W'):
-        all_gestures_active = not all_gestures_active
-        status = "AKTIF ✓" if all_gestures_active else "NONAKTIF ✗"
-        print(f"\n🎮 SEMUA FITUR (Scroll + Klik): {status}")
-        if not all_gestures_active:
-            print("   ⚠️  Scroll Up, Scroll Down, dan Klik DINONAKTIFKAN")
-        else:
-            print("   ✓ Semua fitur DIAKTIFKAN kembali")
-    
-    # Keluar
-    elif key == ord('q') or key == ord('Q'):
-        break
+    engine.gestures_enabled = not engine.gestures_enabled
+    status = "AKTIF ✓" if engine.gestures_enabled else "NONAKTIF ✗"
+    print(f"\n🎮 SEMUA FITUR (Scroll + Klik): {status}")
+    if not engine.gestures_enabled:
+        print("   ⚠️  Scroll Up, Scroll Down, dan Klik DINONAKTIFKAN")
+    else:
+        print("   ✓ Semua fitur DIAKTIFKAN kembali")
+
+engine.gesture_sinks.append(on_gesture)
+engine.draw_sinks.append(draw_info)
+engine.bind_key('yY', lambda frame: tracker.confirm_true_positive())
+engine.bind_key('nN', lambda frame: tracker.confirm_false_positive())
+engine.bind_key('fF', key_false_negative)
+engine.bind_key('sS', lambda frame: tracker.display_stats())
+engine.bind_key('rR', key_reset)
+engine.bind_key('tT', key_toggle_scroll)
+engine.bind_key('wW', key_toggle_gestures)
+engine.bind_key('qQ', engine.stop)
+engine.run()
 
 # Tampilkan statistik akhir
 print("\n\n")
@@ -504,5 +320,4 @@ print("  - laporan_pengujian.json (format data)")
 print("  - laporan_pengujian.txt (untuk skripsi)")
 
 # Melepaskan sumber daya
-cap.release()
-cv2.destroyAllWindows()
+engine.close()